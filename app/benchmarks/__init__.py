@@ -3,7 +3,10 @@ Public interface for the Benchmarks domain module.
 """
 
 from .routes import router
+from .public import BenchmarksPublic, get_benchmarks_public
 
 __all__ = [
-    "router"
+    "router",
+    "BenchmarksPublic",
+    "get_benchmarks_public",
 ]
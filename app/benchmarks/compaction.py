@@ -0,0 +1,100 @@
+"""
+Compaction job: deletes superseded benchmark submissions past their retention.
+
+    python -m app.benchmarks.compaction
+    python -m app.benchmarks.compaction --rejected-days 30 --pending-days 14 --batch-size 5000
+
+- rejected submissions older than --rejected-days and pending ones older than
+  --pending-days (never reviewed) are deleted once a later submission of the same
+  machine exists, so every machine keeps its latest submission whatever its status
+- approved benchmarks are never touched: they back the leaderboards and the
+  latest-approved projection
+- deletes run in batches of --batch-size, each in its own short transaction
+  (FOR UPDATE SKIP LOCKED), so the job can run alongside the API and be interrupted
+  at any point
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from .repository import BenchmarksRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompactionSummary:
+    rejected_deleted: int = 0
+    pending_deleted: int = 0
+    elapsed_s: float = 0.0
+
+
+class CompactionJob:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        repo: Optional[BenchmarksRepository] = None,
+        rejected_days: int = settings.BENCHMARK_REJECTED_RETENTION_DAYS,
+        pending_days: int = settings.BENCHMARK_PENDING_RETENTION_DAYS,
+        batch_size: int = 1000,
+    ):
+        self.session_factory = session_factory
+        self.repo = repo or BenchmarksRepository()
+        self.rejected_days = rejected_days
+        self.pending_days = pending_days
+        self.batch_size = batch_size
+
+    def run(self, now: Optional[datetime] = None) -> CompactionSummary:
+        now = now or datetime.now(timezone.utc)
+        summary = CompactionSummary()
+        started = time.perf_counter()
+
+        db = self.session_factory()
+        try:
+            summary.rejected_deleted = self._compact(db, "rejected", now - timedelta(days=self.rejected_days))
+            summary.pending_deleted = self._compact(db, "pending", now - timedelta(days=self.pending_days))
+        finally:
+            db.close()
+
+        summary.elapsed_s = round(time.perf_counter() - started, 3)
+        return summary
+
+    def _compact(self, db: Session, status: str, before: datetime) -> int:
+        total = 0
+        while True:
+            deleted = self.repo.delete_superseded(db, status, before, self.batch_size)
+            total += deleted
+            if deleted:
+                logger.info("Benchmark compaction: %d %s deleted", deleted, status)
+            if deleted < self.batch_size:
+                return total
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Delete superseded rejected / pending benchmark submissions.")
+    parser.add_argument("--rejected-days", type=int, default=settings.BENCHMARK_REJECTED_RETENTION_DAYS)
+    parser.add_argument("--pending-days", type=int, default=settings.BENCHMARK_PENDING_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = _parse_args()
+    job = CompactionJob(
+        rejected_days=args.rejected_days,
+        pending_days=args.pending_days,
+        batch_size=args.batch_size,
+    )
+    print(json.dumps(asdict(job.run()), indent=2))
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional
 
 from sqlalchemy import (
     CheckConstraint,
@@ -13,8 +13,9 @@ from sqlalchemy import (
     Numeric,
     Text,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -53,6 +54,10 @@ class Benchmark(Base):
         nullable=True,
     )
 
+    # automated plausibility check at submission (1.0 = nothing suspicious) and its findings
+    plausibility_score: Mapped[Optional[Decimal]] = mapped_column(Numeric(4, 3), nullable=True)
+    plausibility_flags: Mapped[Optional[list[dict[str, Any]]]] = mapped_column(JSONB, nullable=True)
+
     machine: Mapped["Machine"] = relationship("Machine", back_populates="benchmarks")
 
     verified_by_admin: Mapped[Optional["User"]] = relationship(
@@ -66,7 +71,74 @@ class Benchmark(Base):
             "admin_verification_status IN ('pending', 'approved', 'rejected')",
             name="chk_benchmark_status",
         ),
-        Index("idx_benchmarks_hardware_id", "hardware_id"),
+        # a machine's history, newest first (keyset pages, time buckets, compaction)
+        Index("idx_benchmarks_hardware_collected", "hardware_id", collected_at, "benchmark_id"),
         Index("idx_benchmarks_collected_at", "collected_at"),
         Index("idx_benchmarks_status", "admin_verification_status"),
+        # admin review queue, oldest pending first (keyset pagination)
+        Index(
+            "idx_benchmarks_pending_queue",
+            collected_at,
+            "benchmark_id",
+            postgresql_where=text("admin_verification_status = 'pending'"),
+        ),
+        # latest approved benchmark of a machine (projection rebuilds)
+        Index(
+            "idx_benchmarks_approved_latest",
+            "hardware_id",
+            collected_at.desc(),
+            postgresql_where=text("admin_verification_status = 'approved'"),
+        ),
+    )
+
+
+# Projection: the latest approved benchmark of each machine (by collected_at), one row
+# per machine so listings, search and rankings can join it directly
+class MachineLatestBenchmark(Base):
+    __tablename__ = "machine_latest_benchmarks"
+
+    hardware_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("machines.hardware_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    benchmark_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("benchmarks.benchmark_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    collected_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    gpu_throughput_fp16: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 4), nullable=True)
+    gpu_throughput_fp32: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 4), nullable=True)
+    cpu_score: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 4), nullable=True)
+    disk_read_mb_s: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 4), nullable=True)
+    disk_write_mb_s: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 4), nullable=True)
+    network_bandwidth_gbps: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 4), nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+# Precomputed leaderboard rows: the best approved value per (metric, cohort, machine)
+# cohort is the machine's GPU model ("unknown" when not set) or "*" for the whole marketplace
+class BenchmarkRanking(Base):
+    __tablename__ = "benchmark_rankings"
+
+    metric: Mapped[str] = mapped_column(Text, primary_key=True)
+    cohort: Mapped[str] = mapped_column(Text, primary_key=True)
+    hardware_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("machines.hardware_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    benchmark_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("benchmarks.benchmark_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    value: Mapped[Decimal] = mapped_column(Numeric(18, 4), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_benchmark_rankings_leaderboard", "metric", "cohort", value.desc()),
     )
\ No newline at end of file
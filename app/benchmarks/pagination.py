@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+# Keyset cursors over (collected_at, benchmark_id), opaque to clients; used by the
+# machine history list (newest first) and the admin review queue (oldest first)
+
+
+def encode_cursor(collected_at: datetime, benchmark_id: UUID) -> str:
+    raw = f"{collected_at.isoformat()}|{benchmark_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        collected_at, benchmark_id = raw.split("|")
+        return datetime.fromisoformat(collected_at), UUID(benchmark_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor.")
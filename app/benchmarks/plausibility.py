@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+import numpy as np
+
+from app.config import settings
+
+from .ranking import RANKED_METRICS
+
+# Plausibility scoring of benchmark submissions
+# - reference distributions hold one value per machine (its latest approved benchmark),
+#   grouped by the machine's gpu_model for GPU metrics, cpu_model for cpu_score and
+#   marketplace-wide ("*") for disk / network; groups smaller than `min_samples` fall
+#   back to "*"
+# - the whole reference set is loaded in one query and reduced to per-group median,
+#   MAD, mean and std arrays once per refresh; scoring a submission is a few vector
+#   operations over the six metrics
+# - robust z = 0.6745 * (x - median) / MAD (plain z-score when the MAD is 0); metrics
+#   beyond the threshold lower the score, the further out the more
+# - telemetry: a benchmark run loads the machine, so its samples around collected_at
+#   should show it; no samples or an idle machine lower the score as well
+# - score 1.0 = nothing suspicious, 0.0 = implausible; it informs the admin review and
+#   never rejects a submission on its own
+
+ALL = "*"
+UNKNOWN = "unknown"
+REFERENCE_KEYS = {
+    "gpu_throughput_fp16": "gpu_model",
+    "gpu_throughput_fp32": "gpu_model",
+    "cpu_score": "cpu_model",
+    "disk_read_mb_s": None,
+    "disk_write_mb_s": None,
+    "network_bandwidth_gbps": None,
+}
+# telemetry column that a benchmark of the metric should drive up
+LOAD_COLUMNS = {
+    "gpu_throughput_fp16": "gpu_util",
+    "gpu_throughput_fp32": "gpu_util",
+    "cpu_score": "cpu_util",
+}
+SAMPLE_COLUMNS = ("gpu_util", "cpu_util")
+IDLE_UTIL = 20.0
+NO_TELEMETRY_PENALTY = 0.2
+IDLE_PENALTY = 0.5
+_MAD_SCALE = 0.6745
+
+
+def _as_float(value: Any) -> float:
+    return math.nan if value is None else float(value)
+
+
+# per-group statistics of one metric, as parallel arrays indexed through `index`
+@dataclass(frozen=True)
+class MetricReference:
+    index: dict[str, int]
+    count: np.ndarray
+    median: np.ndarray
+    mad: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+
+    @classmethod
+    def build(cls, keys: np.ndarray, values: np.ndarray) -> "MetricReference":
+        present = ~np.isnan(values)
+        keys, values = keys[present], values[present]
+        if not len(values):
+            empty = np.empty(0)
+            return cls(index={}, count=empty, median=empty, mad=empty, mean=empty, std=empty)
+        # every value also belongs to the marketplace-wide group
+        keys = np.concatenate([keys, np.full(len(values), ALL, dtype=object)])
+        values = np.concatenate([values, values])
+
+        groups, inverse = np.unique(keys.astype(str), return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.cumsum(np.bincount(inverse, minlength=len(groups)))[:-1]
+        chunks = np.split(values[order], bounds)
+
+        median = np.array([np.median(c) for c in chunks])
+        return cls(
+            index={str(g): i for i, g in enumerate(groups)},
+            count=np.array([len(c) for c in chunks]),
+            median=median,
+            mad=np.array([np.median(np.abs(c - m)) for c, m in zip(chunks, median)]),
+            mean=np.array([c.mean() for c in chunks]),
+            std=np.array([c.std(ddof=1) if len(c) > 1 else 0.0 for c in chunks]),
+        )
+
+    def lookup(self, key: str, min_samples: int) -> tuple[str, int]:
+        i = self.index.get(key)
+        if i is not None and self.count[i] >= min_samples:
+            return key, i
+        i = self.index.get(ALL)
+        if i is not None and self.count[i] >= min_samples:
+            return ALL, i
+        return key, -1
+
+
+class ReferenceSet:
+    def __init__(self, rows: Iterable[Sequence[Any]] = ()):
+        # rows: (gpu_model, cpu_model, *RANKED_METRICS values)
+        rows = list(rows)
+        models = {
+            "gpu_model": np.array([r[0] or UNKNOWN for r in rows], dtype=object),
+            "cpu_model": np.array([r[1] or UNKNOWN for r in rows], dtype=object),
+            None: np.full(len(rows), ALL, dtype=object),
+        }
+        values = np.array([[_as_float(v) for v in r[2:]] for r in rows], dtype=float).reshape(
+            len(rows), len(RANKED_METRICS)
+        )
+        self.metrics = {
+            metric: MetricReference.build(models[REFERENCE_KEYS[metric]], values[:, column])
+            for column, metric in enumerate(RANKED_METRICS)
+        }
+
+    # robust and plain z-scores of a submission, one entry per submitted metric
+    def compare(
+        self,
+        benchmark: Any,
+        gpu_model: Optional[str],
+        cpu_model: Optional[str],
+        min_samples: int,
+    ) -> list[dict[str, Any]]:
+        own = {"gpu_model": gpu_model or UNKNOWN, "cpu_model": cpu_model or UNKNOWN, None: ALL}
+        metrics, cohorts, stats = [], [], []
+        for metric in RANKED_METRICS:
+            value = getattr(benchmark, metric)
+            if value is None:
+                continue
+            reference = self.metrics[metric]
+            cohort, i = reference.lookup(own[REFERENCE_KEYS[metric]], min_samples)
+            if i < 0:
+                continue
+            metrics.append(metric)
+            cohorts.append(cohort)
+            stats.append((
+                float(value), reference.count[i], reference.median[i],
+                reference.mad[i], reference.mean[i], reference.std[i],
+            ))
+        if not stats:
+            return []
+
+        x, count, median, mad, mean, std = np.array(stats, dtype=float).T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = np.where(std > 0, (x - mean) / std, 0.0)
+            robust_z = np.where(mad > 0, _MAD_SCALE * (x - median) / mad, z)
+        return [
+            {
+                "metric": metrics[k],
+                "value": x[k],
+                "cohort": cohorts[k],
+                "cohort_size": int(count[k]),
+                "median": median[k],
+                "robust_z": round(float(robust_z[k]), 2),
+                "z_score": round(float(z[k]), 2),
+            }
+            for k in range(len(metrics))
+        ]
+
+
+# Per-process reference snapshot, rebuilt from `loader` after `ttl` seconds; one thread
+# rebuilds while the others keep scoring against the previous snapshot
+class ReferenceCache:
+    def __init__(self, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._snapshot: Optional[tuple[float, ReferenceSet]] = None
+        self._refresh = threading.Lock()
+
+    def get(self, loader: Callable[[], Iterable[Sequence[Any]]]) -> ReferenceSet:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] > self.clock():
+            return snapshot[1]
+        if not self._refresh.acquire(blocking=snapshot is None):
+            return snapshot[1]
+        try:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot[0] <= self.clock():
+                snapshot = (self.clock() + self.ttl, ReferenceSet(loader()))
+                self._snapshot = snapshot
+            return snapshot[1]
+        finally:
+            self._refresh.release()
+
+    def clear(self) -> None:
+        self._snapshot = None
+
+
+# {column: float array} of SAMPLE_COLUMNS from metric row tuples ordered as `columns`
+def sample_arrays(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> dict[str, np.ndarray]:
+    return {
+        column: np.array([_as_float(row[columns.index(column)]) for row in rows], dtype=float)
+        for column in SAMPLE_COLUMNS
+    }
+
+
+# checks the machine's telemetry around the benchmark run
+# samples: {column: array of SAMPLE_COLUMNS values, NaN when missing}
+def telemetry_flags(benchmark: Any, samples: dict[str, np.ndarray]) -> list[dict[str, Any]]:
+    loaded = {LOAD_COLUMNS[m] for m in LOAD_COLUMNS if getattr(benchmark, m) is not None}
+    if not loaded:
+        return []
+    if not any(len(v) for v in samples.values()):
+        return [{"check": "telemetry", "reason": "no_samples", "penalty": NO_TELEMETRY_PENALTY}]
+
+    flags = []
+    for column in sorted(loaded):
+        values = samples.get(column)
+        if values is None or np.isnan(values).all():
+            continue
+        peak = float(np.nanmax(values))
+        if peak < IDLE_UTIL:
+            flags.append({
+                "check": "telemetry",
+                "reason": f"{column}_idle",
+                "peak": round(peak, 2),
+                "penalty": IDLE_PENALTY,
+            })
+    return flags
+
+
+def score(
+    benchmark: Any,
+    gpu_model: Optional[str],
+    cpu_model: Optional[str],
+    reference: ReferenceSet,
+    samples: dict[str, np.ndarray],
+    threshold: float,
+    min_samples: int,
+) -> tuple[float, list[dict[str, Any]]]:
+    comparisons = reference.compare(benchmark, gpu_model, cpu_model, min_samples)
+    distance = np.array([abs(c["robust_z"]) for c in comparisons], dtype=float)
+    # 0 inside the threshold, 1 at twice the threshold and beyond
+    penalties = np.clip((distance - threshold) / threshold, 0.0, 1.0)
+
+    flags = [
+        {"check": "reference", **c, "value": float(c["value"]), "median": float(c["median"]),
+         "penalty": round(float(p), 3)}
+        for c, p in zip(comparisons, penalties)
+        if p > 0
+    ]
+    flags += telemetry_flags(benchmark, samples)
+
+    all_penalties = np.array([f["penalty"] for f in flags], dtype=float)
+    return round(float(np.prod(1.0 - all_penalties)), 3), flags
+
+
+reference_cache = ReferenceCache(ttl=settings.BENCHMARK_PLAUSIBILITY_REFRESH_SECONDS)
@@ -1,29 +1,29 @@
-from typing import List
+
+from __future__ import annotations
+
+from typing import Iterable, Protocol
 from uuid import UUID
-from typing_extensions import Protocol
 
 from fastapi import Depends
 
+from .models import MachineLatestBenchmark
 from .service import BenchmarkService, get_benchmark_service
-from .models import Benchmark
-
 
-# Public read-only interface for benchmark access
-# Acts as an abstraction over the underlying service layer
+# Public facade for benchmark figures used by other modules (listings, search)
 class BenchmarksPublic(Protocol):
-    def get_benchmarks_for_machine(self, hardware_id: UUID) -> List[Benchmark]:
+    def get_latest_approved(self, hardware_ids: Iterable[UUID]) -> dict[UUID, MachineLatestBenchmark]:
         pass
 
-# Default BenchmarkPublic implementation, delegates all operations to BenchmarkService
-class BenchmarksPublicImpl(BenchmarksPublic):
+
+# Default implementation of BenchmarksPublic
+class BenchmarksPublicImpl:
     def __init__(self, service: BenchmarkService):
         self.service = service
 
-    def get_benchmarks_for_machine(self, hardware_id: UUID) -> List[Benchmark]:
-        return self.service.list_machine_benchmarks(hardware_id)
+    def get_latest_approved(self, hardware_ids: Iterable[UUID]) -> dict[UUID, MachineLatestBenchmark]:
+        return self.service.get_latest_approved(list(hardware_ids))
+
 
-# Dependency provider wiring the public interface to its implementation
-def get_benchmarks_public(
-    service: BenchmarkService = Depends(get_benchmark_service),
-) -> BenchmarksPublic:
+# Dependency provider wiring the public facade to the service layer
+def get_benchmarks_public(service: BenchmarkService = Depends(get_benchmark_service)) -> BenchmarksPublic:
     return BenchmarksPublicImpl(service)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal
+from typing import Callable, Iterable, Optional
+from uuid import UUID
+
+from app.config import settings
+
+# ranked benchmark metrics, higher is better for all of them
+RANKED_METRICS = (
+    "gpu_throughput_fp16",
+    "gpu_throughput_fp32",
+    "cpu_score",
+    "disk_read_mb_s",
+    "disk_write_mb_s",
+    "network_bandwidth_gbps",
+)
+ALL_MODELS = "*"
+UNKNOWN_MODEL = "unknown"
+
+
+def cohorts_for(gpu_model: Optional[str]) -> tuple[str, str]:
+    return (gpu_model or UNKNOWN_MODEL, ALL_MODELS)
+
+
+# Sorted leaderboard of one (metric, cohort)
+# - entries are kept in ascending (value, hardware_id) order, so top-K is a slice from
+#   the end and rank/percentile are two bisections
+# - rank: 1 + machines with a strictly higher value (ties share a rank)
+# - percentile: share of the cohort below the machine, ties counted half
+class CohortRanking:
+    def __init__(self, entries: Iterable[tuple[UUID, Decimal, UUID]] = ()):
+        # hardware_id -> (value, benchmark_id)
+        self._best: dict[UUID, tuple[Decimal, UUID]] = {}
+        self._keys: list[tuple[Decimal, UUID]] = []
+        for hardware_id, value, benchmark_id in entries:
+            self._best[hardware_id] = (value, benchmark_id)
+        self._keys = sorted((value, hardware_id) for hardware_id, (value, _) in self._best.items())
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def upsert(self, hardware_id: UUID, value: Decimal, benchmark_id: UUID) -> None:
+        with self._lock:
+            self._remove(hardware_id)
+            self._best[hardware_id] = (value, benchmark_id)
+            insort(self._keys, (value, hardware_id))
+
+    def remove(self, hardware_id: UUID) -> None:
+        with self._lock:
+            self._remove(hardware_id)
+
+    def _remove(self, hardware_id: UUID) -> None:
+        current = self._best.pop(hardware_id, None)
+        if current is None:
+            return
+        index = bisect_left(self._keys, (current[0], hardware_id))
+        del self._keys[index]
+
+    def position(self, hardware_id: UUID) -> Optional[dict]:
+        with self._lock:
+            current = self._best.get(hardware_id)
+            if current is None:
+                return None
+            value, benchmark_id = current
+            return self._entry(hardware_id, value, benchmark_id)
+
+    def top(self, k: int) -> list[dict]:
+        with self._lock:
+            return [
+                self._entry(hardware_id, value, self._best[hardware_id][1])
+                for value, hardware_id in reversed(self._keys[-k:] if k > 0 else [])
+            ]
+
+    def _entry(self, hardware_id: UUID, value: Decimal, benchmark_id: UUID) -> dict:
+        size = len(self._keys)
+        below = bisect_left(self._keys, value, key=lambda k: k[0])
+        not_above = bisect_right(self._keys, value, key=lambda k: k[0])
+        return {
+            "hardware_id": hardware_id,
+            "benchmark_id": benchmark_id,
+            "value": value,
+            "rank": size - not_above + 1,
+            "percentile": round(100 * (below + 0.5 * (not_above - below)) / size, 2),
+            "cohort_size": size,
+        }
+
+
+# Per-process snapshots of the benchmark_rankings table, one CohortRanking per
+# (metric, cohort), loaded on first use and reloaded after `ttl` seconds; writes made
+# by this process are applied to loaded snapshots immediately
+class RankingCache:
+    def __init__(self, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._snapshots: dict[tuple[str, str], tuple[float, CohortRanking]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        metric: str,
+        cohort: str,
+        loader: Callable[[str, str], Iterable[tuple[UUID, Decimal, UUID]]],
+    ) -> CohortRanking:
+        key = (metric, cohort)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot[0] > self.clock():
+                return snapshot[1]
+
+        ranking = CohortRanking(loader(metric, cohort))
+        with self._lock:
+            self._snapshots[key] = (self.clock() + self.ttl, ranking)
+        return ranking
+
+    def apply(self, metric: str, cohort: str, hardware_id: UUID, best: Optional[tuple[Decimal, UUID]]) -> None:
+        with self._lock:
+            snapshot = self._snapshots.get((metric, cohort))
+            if snapshot is None:
+                return
+            if best is None:
+                snapshot[1].remove(hardware_id)
+            else:
+                snapshot[1].upsert(hardware_id, *best)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+
+
+ranking_cache = RankingCache(ttl=settings.BENCHMARK_RANKING_CACHE_SECONDS)
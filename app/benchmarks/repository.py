@@ -1,12 +1,30 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, desc
+from sqlalchemy import Numeric, cast, delete, exists, func, literal, select, desc, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, aggregate_order_by, array_agg, insert
+from sqlalchemy.orm import aliased
 from sqlalchemy.orm import Session
 
-from .models import Benchmark
+from app.machines.models import Machine
+from .models import Benchmark, BenchmarkRanking, MachineLatestBenchmark
+from .ranking import RANKED_METRICS
+
+# columns copied from benchmarks into machine_latest_benchmarks
+PROJECTED_COLUMNS = (
+    "benchmark_id",
+    "collected_at",
+    "gpu_throughput_fp16",
+    "gpu_throughput_fp32",
+    "cpu_score",
+    "disk_read_mb_s",
+    "disk_write_mb_s",
+    "network_bandwidth_gbps",
+)
 
 
 class BenchmarksRepository:
@@ -19,13 +37,81 @@ class BenchmarksRepository:
     def get(self, db: Session, benchmark_id: UUID) -> Optional[Benchmark]:
         return db.get(Benchmark, benchmark_id)
 
-    def list_for_machine(self, db: Session, hardware_id: UUID) -> List[Benchmark]:
+    # one page of a machine's benchmarks, newest first, strictly before the
+    # (collected_at, id) cursor
+    def list_for_machine(
+        self,
+        db: Session,
+        hardware_id: UUID,
+        before: Optional[tuple[datetime, UUID]] = None,
+        limit: int = 100,
+    ) -> List[Benchmark]:
+        stmt = select(Benchmark).where(Benchmark.hardware_id == hardware_id)
+        if before is not None:
+            stmt = stmt.where(tuple_(Benchmark.collected_at, Benchmark.benchmark_id) < tuple_(*before))
+        stmt = stmt.order_by(desc(Benchmark.collected_at), desc(Benchmark.benchmark_id)).limit(limit)
+        return list(db.scalars(stmt).all())
+
+    # one row per UTC bucket (day / week / month) with the best, latest or median value
+    # of every metric among the machine's benchmarks in that bucket
+    def history_buckets(
+        self,
+        db: Session,
+        hardware_id: UUID,
+        bucket: str,
+        aggregate: str,
+        status: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> list[dict[str, Any]]:
+        def reduce(column):
+            if aggregate == "best":
+                return func.max(column)
+            if aggregate == "latest":
+                ordered = array_agg(aggregate_order_by(column, desc(Benchmark.collected_at)))
+                return ordered.filter(column.is_not(None))[1]
+            return cast(func.percentile_cont(0.5).within_group(column), Numeric(18, 4))
+
+        bucket_start = func.date_trunc(bucket, func.timezone("UTC", Benchmark.collected_at))
         stmt = (
-            select(Benchmark)
+            select(
+                bucket_start.label("bucket_start"),
+                func.count().label("count"),
+                *(reduce(getattr(Benchmark, metric)).label(metric) for metric in RANKED_METRICS),
+            )
             .where(Benchmark.hardware_id == hardware_id)
-            .order_by(desc(Benchmark.collected_at))
+            .group_by(bucket_start)
+            .order_by(bucket_start)
         )
-        return list(db.scalars(stmt).all())
+        if status is not None:
+            stmt = stmt.where(Benchmark.admin_verification_status == status)
+        if start is not None:
+            stmt = stmt.where(Benchmark.collected_at >= start)
+        if end is not None:
+            stmt = stmt.where(Benchmark.collected_at < end)
+        return [row._asdict() for row in db.execute(stmt)]
+
+    # compaction: deletes up to `limit` benchmarks in `status` collected before `before`
+    # that are superseded by a later submission of the same machine (the latest one of
+    # every machine is kept whatever its status); returns the number deleted
+    def delete_superseded(self, db: Session, status: str, before: datetime, limit: int) -> int:
+        newer = aliased(Benchmark)
+        victims = (
+            select(Benchmark.benchmark_id)
+            .where(
+                Benchmark.admin_verification_status == status,
+                Benchmark.collected_at < before,
+                exists().where(
+                    newer.hardware_id == Benchmark.hardware_id,
+                    newer.collected_at > Benchmark.collected_at,
+                ),
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = db.execute(delete(Benchmark).where(Benchmark.benchmark_id.in_(victims.scalar_subquery())))
+        db.commit()
+        return result.rowcount
 
     def list_latest_approved_for_machine(
         self, db: Session, hardware_id: UUID, limit: int = 1
@@ -41,6 +127,143 @@ class BenchmarksRepository:
         )
         return list(db.scalars(stmt).all())
 
+    def list_approved_for_machine(self, db: Session, hardware_id: UUID) -> List[Benchmark]:
+        stmt = select(Benchmark).where(
+            Benchmark.hardware_id == hardware_id,
+            Benchmark.admin_verification_status == "approved",
+        )
+        return list(db.scalars(stmt).all())
+
+    # (hardware_id, value, benchmark_id) of one leaderboard, served by idx_benchmark_rankings_leaderboard
+    def load_cohort(self, db: Session, metric: str, cohort: str) -> list[tuple[UUID, Decimal, UUID]]:
+        stmt = select(BenchmarkRanking.hardware_id, BenchmarkRanking.value, BenchmarkRanking.benchmark_id).where(
+            BenchmarkRanking.metric == metric,
+            BenchmarkRanking.cohort == cohort,
+        )
+        return [tuple(row) for row in db.execute(stmt)]
+
+    # keeps the higher value per (metric, cohort, machine); returns the rows that changed
+    def raise_rankings(self, db: Session, rows: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+        if not rows:
+            return []
+        stmt = insert(BenchmarkRanking).values(list(rows))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BenchmarkRanking.metric, BenchmarkRanking.cohort, BenchmarkRanking.hardware_id],
+            set_={
+                "value": stmt.excluded.value,
+                "benchmark_id": stmt.excluded.benchmark_id,
+                "updated_at": func.now(),
+            },
+            where=BenchmarkRanking.value < stmt.excluded.value,
+        ).returning(
+            BenchmarkRanking.metric,
+            BenchmarkRanking.cohort,
+            BenchmarkRanking.hardware_id,
+            BenchmarkRanking.value,
+            BenchmarkRanking.benchmark_id,
+        )
+        return [dict(row._mapping) for row in db.execute(stmt)]
+
+    # rebuilds a machine's leaderboard rows, e.g. after its best benchmark was rejected
+    def replace_rankings(self, db: Session, hardware_id: UUID, rows: Sequence[dict[str, Any]]) -> None:
+        db.execute(delete(BenchmarkRanking).where(BenchmarkRanking.hardware_id == hardware_id))
+        if rows:
+            db.execute(insert(BenchmarkRanking).values(list(rows)))
+
+    def get_latest_approved(self, db: Session, hardware_ids: Sequence[UUID]) -> list[MachineLatestBenchmark]:
+        if not hardware_ids:
+            return []
+        stmt = select(MachineLatestBenchmark).where(MachineLatestBenchmark.hardware_id.in_(list(hardware_ids)))
+        return list(db.scalars(stmt).all())
+
+    # plausibility reference set: (gpu_model, cpu_model, *RANKED_METRICS) of every
+    # machine's latest approved benchmark
+    def plausibility_reference(self, db: Session) -> list[tuple]:
+        stmt = select(
+            Machine.gpu_model,
+            Machine.cpu_model,
+            *(getattr(MachineLatestBenchmark, metric) for metric in RANKED_METRICS),
+        ).join(Machine, Machine.hardware_id == MachineLatestBenchmark.hardware_id)
+        return [tuple(row) for row in db.execute(stmt)]
+
+    # newly approved benchmarks (at most one per machine): each replaces its machine's
+    # projected row only if it was collected later
+    def advance_latest(self, db: Session, benchmarks: Sequence[Benchmark]) -> None:
+        if not benchmarks:
+            return
+        values = [
+            {"hardware_id": b.hardware_id, **{c: getattr(b, c) for c in PROJECTED_COLUMNS}}
+            for b in benchmarks
+        ]
+        stmt = insert(MachineLatestBenchmark).values(values)
+        current = MachineLatestBenchmark.__table__.c
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[MachineLatestBenchmark.hardware_id],
+                set_={**{c: stmt.excluded[c] for c in PROJECTED_COLUMNS}, "updated_at": func.now()},
+                where=tuple_(current.collected_at, current.benchmark_id)
+                < tuple_(stmt.excluded.collected_at, stmt.excluded.benchmark_id),
+            )
+        )
+
+    # recomputes a machine's projected row from its approved benchmarks (idx_benchmarks_approved_latest)
+    def rebuild_latest(self, db: Session, hardware_id: UUID) -> None:
+        db.execute(delete(MachineLatestBenchmark).where(MachineLatestBenchmark.hardware_id == hardware_id))
+        latest = (
+            select(literal(hardware_id).label("hardware_id"), *(getattr(Benchmark, c) for c in PROJECTED_COLUMNS))
+            .where(
+                Benchmark.hardware_id == hardware_id,
+                Benchmark.admin_verification_status == "approved",
+            )
+            .order_by(desc(Benchmark.collected_at), desc(Benchmark.benchmark_id))
+            .limit(1)
+        )
+        db.execute(insert(MachineLatestBenchmark).from_select(["hardware_id", *PROJECTED_COLUMNS], latest))
+
+    # one page of the review queue, oldest first, strictly after the (collected_at, id) cursor
+    def list_pending_page(
+        self, db: Session, after: Optional[tuple[datetime, UUID]], limit: int
+    ) -> List[Benchmark]:
+        stmt = select(Benchmark).where(Benchmark.admin_verification_status == "pending")
+        if after is not None:
+            stmt = stmt.where(tuple_(Benchmark.collected_at, Benchmark.benchmark_id) > tuple_(*after))
+        stmt = stmt.order_by(Benchmark.collected_at, Benchmark.benchmark_id).limit(limit)
+        return list(db.scalars(stmt).all())
+
+    # (metric, cohort) -> (mean, stddev, machines) of the ranked values in the given cohorts
+    def cohort_stats(self, db: Session, cohorts: Sequence[str]) -> dict[tuple[str, str], tuple[Decimal, Decimal, int]]:
+        if not cohorts:
+            return {}
+        stmt = (
+            select(
+                BenchmarkRanking.metric,
+                BenchmarkRanking.cohort,
+                func.avg(BenchmarkRanking.value),
+                func.stddev_samp(BenchmarkRanking.value),
+                func.count(),
+            )
+            .where(BenchmarkRanking.cohort.in_(list(cohorts)))
+            .group_by(BenchmarkRanking.metric, BenchmarkRanking.cohort)
+        )
+        return {(metric, cohort): (mean, stddev, count) for metric, cohort, mean, stddev, count in db.execute(stmt)}
+
+    # decides many pending benchmarks in one UPDATE ... WHERE benchmark_id = ANY(:ids);
+    # rows that are no longer pending are left alone; returns the updated benchmarks
+    def bulk_set_status(
+        self, db: Session, benchmark_ids: Sequence[UUID], status: str, admin_id: UUID
+    ) -> List[Benchmark]:
+        stmt = (
+            update(Benchmark)
+            .where(
+                Benchmark.benchmark_id == func.any(literal(list(benchmark_ids), ARRAY(PG_UUID(as_uuid=True)))),
+                Benchmark.admin_verification_status == "pending",
+            )
+            .values(admin_verification_status=status, verified_by_admin_id=admin_id)
+            .returning(Benchmark)
+            .execution_options(synchronize_session=False)
+        )
+        return list(db.scalars(stmt).all())
+
     def update(self, db: Session, obj: Benchmark) -> Benchmark:
         db.commit()
         db.refresh(obj)
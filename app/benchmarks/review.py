@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Optional
+
+from .ranking import RANKED_METRICS, cohorts_for
+
+# Helpers for the admin verification queue
+
+
+# z-scores of a submission against its GPU model's distribution
+# stats: (metric, cohort) -> (mean, stddev, count) over the per-machine best approved
+# values in benchmark_rankings; cohorts with fewer than `min_samples` machines or no
+# spread are not judged
+def outlier_flags(
+    benchmark: Any,
+    gpu_model: Optional[str],
+    stats: dict[tuple[str, str], tuple[Decimal, Decimal, int]],
+    z_threshold: float,
+    min_samples: int,
+) -> list[dict[str, Any]]:
+    cohort = cohorts_for(gpu_model)[0]
+    flags = []
+    for metric in RANKED_METRICS:
+        value = getattr(benchmark, metric)
+        distribution = stats.get((metric, cohort))
+        if value is None or distribution is None:
+            continue
+        mean, stddev, count = distribution
+        if count < min_samples or not stddev:
+            continue
+        z_score = float((value - mean) / stddev)
+        if abs(z_score) >= z_threshold:
+            flags.append({
+                "metric": metric,
+                "value": value,
+                "z_score": round(z_score, 2),
+                "cohort": cohort,
+                "cohort_mean": mean,
+                "cohort_size": count,
+            })
+    return flags
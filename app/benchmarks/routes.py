@@ -1,12 +1,29 @@
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.auth import get_current_user
+from app.auth.public import ensure_admin
 from app.users import User
 
+from .pagination import decode_cursor
 from .service import BenchmarkService, get_benchmark_service
-from .schemas import BenchmarkCreate, BenchmarkRead
+from .schemas import (
+    BenchmarkCreate,
+    BenchmarkHistory,
+    BenchmarkPage,
+    BenchmarkRead,
+    BenchmarkVerify,
+    BulkVerify,
+    BulkVerifyResult,
+    LatestBenchmarkRead,
+    Leaderboard,
+    MachineRanking,
+    ReviewQueuePage,
+)
 
 router = APIRouter()
 
@@ -37,14 +54,129 @@ def create_machine_benchmark(
 
 @router.get(
     "/machines/{hardware_id}",
-    response_model=list[BenchmarkRead],
+    response_model=BenchmarkPage,
 )
 def get_machine_benchmarks(
     hardware_id: UUID,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=500),
+    service: BenchmarkService = Depends(get_benchmark_service),
+    user: User = Depends(get_current_user),
+):
+    # a malformed cursor is the client's error, not a missing machine
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    try:
+        return service.list_machine_benchmarks(hardware_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+# performance over time: one row per bucket with the best, latest or median value
+@router.get(
+    "/machines/{hardware_id}/history",
+    response_model=BenchmarkHistory,
+)
+def get_machine_benchmark_history(
+    hardware_id: UUID,
+    bucket: Literal["day", "week", "month"] = "week",
+    aggregate: Literal["best", "latest", "median"] = "best",
+    verification_status: Optional[Literal["pending", "approved", "rejected"]] = Query(
+        "approved", alias="status", description="only benchmarks in this verification status"
+    ),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    user: User = Depends(get_current_user),
     service: BenchmarkService = Depends(get_benchmark_service),
+):
+    try:
+        return service.get_machine_history(hardware_id, bucket, aggregate, verification_status, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+# current performance figures of a machine (None until a benchmark is approved)
+@router.get(
+    "/machines/{hardware_id}/latest",
+    response_model=LatestBenchmarkRead | None,
+)
+def get_latest_machine_benchmark(
+    hardware_id: UUID,
+    user: User = Depends(get_current_user),
+    service: BenchmarkService = Depends(get_benchmark_service),
+):
+    return service.get_latest_approved([hardware_id]).get(hardware_id)
+
+
+@router.get("/leaderboard", response_model=Leaderboard)
+def get_leaderboard(
+    metric: str = Query(..., description="e.g. gpu_throughput_fp16, cpu_score, disk_read_mb_s"),
+    gpu_model: Optional[str] = Query(None, description="Rank within one GPU model (default: all machines)"),
+    limit: int = Query(10, ge=1, le=100),
+    user: User = Depends(get_current_user),
+    service: BenchmarkService = Depends(get_benchmark_service),
+):
+    try:
+        return service.get_leaderboard(metric, gpu_model, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get(
+    "/machines/{hardware_id}/ranking",
+    response_model=list[MachineRanking],
+)
+def get_machine_ranking(
+    hardware_id: UUID,
     user: User = Depends(get_current_user),
+    service: BenchmarkService = Depends(get_benchmark_service),
+):
+    try:
+        return service.get_machine_ranking(hardware_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post(
+    "/{benchmark_id}/verify",
+    response_model=BenchmarkRead,
+)
+def verify_benchmark(
+    benchmark_id: UUID,
+    payload: BenchmarkVerify,
+    admin: User = Depends(ensure_admin),
+    service: BenchmarkService = Depends(get_benchmark_service),
+):
+    try:
+        return service.verify_benchmark(benchmark_id, admin.customer_id, payload.status)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+# Admin review queue: pending submissions oldest first, with outlier flags
+@router.get("/admin/queue", response_model=ReviewQueuePage)
+def get_review_queue(
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    admin: User = Depends(ensure_admin),
+    service: BenchmarkService = Depends(get_benchmark_service),
+):
+    try:
+        return service.list_review_queue(cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/admin/queue/decisions", response_model=BulkVerifyResult)
+def bulk_verify_benchmarks(
+    payload: BulkVerify,
+    admin: User = Depends(ensure_admin),
+    service: BenchmarkService = Depends(get_benchmark_service),
 ):
     try:
-        return service.list_machine_benchmarks(hardware_id)
+        return service.bulk_verify(payload.benchmark_ids, admin.customer_id, payload.status)
     except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -43,4 +43,109 @@ class BenchmarkRead(BaseModel):
     admin_verification_status: str
     verified_by_admin_id: Optional[UUID]
 
+    # automated plausibility check at submission (1.0 = nothing suspicious)
+    plausibility_score: Optional[Decimal] = None
+    plausibility_flags: Optional[list[dict[str, Any]]] = None
+
     model_config = ConfigDict(from_attributes=True)
+
+
+# a machine's benchmarks, newest first
+class BenchmarkPage(BaseModel):
+    items: list[BenchmarkRead]
+    # pass as `cursor` to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class BenchmarkHistoryBucket(BaseModel):
+    bucket_start: datetime
+    count: int
+
+    gpu_throughput_fp16: Optional[Decimal]
+    gpu_throughput_fp32: Optional[Decimal]
+    cpu_score: Optional[Decimal]
+    disk_read_mb_s: Optional[Decimal]
+    disk_write_mb_s: Optional[Decimal]
+    network_bandwidth_gbps: Optional[Decimal]
+
+
+class BenchmarkHistory(BaseModel):
+    hardware_id: UUID
+    bucket: Literal["day", "week", "month"]
+    aggregate: Literal["best", "latest", "median"]
+    buckets: list[BenchmarkHistoryBucket]
+
+
+# latest approved benchmark of a machine (machine_latest_benchmarks projection)
+class LatestBenchmarkRead(BaseModel):
+    hardware_id: UUID
+    benchmark_id: UUID
+    collected_at: datetime
+
+    gpu_throughput_fp16: Optional[Decimal]
+    gpu_throughput_fp32: Optional[Decimal]
+    cpu_score: Optional[Decimal]
+    disk_read_mb_s: Optional[Decimal]
+    disk_write_mb_s: Optional[Decimal]
+    network_bandwidth_gbps: Optional[Decimal]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BenchmarkVerify(BaseModel):
+    status: Literal["approved", "rejected"]
+
+
+# Admin review queue
+class OutlierFlag(BaseModel):
+    metric: str
+    value: Decimal
+    z_score: float
+    cohort: str
+    cohort_mean: Decimal
+    cohort_size: int
+
+
+class ReviewQueueItem(BenchmarkRead):
+    gpu_model: Optional[str] = None
+    flagged: bool
+    outliers: list[OutlierFlag]
+
+
+class ReviewQueuePage(BaseModel):
+    items: list[ReviewQueueItem]
+    # pass as `cursor` to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class BulkVerify(BaseModel):
+    benchmark_ids: list[UUID] = Field(..., min_length=1, max_length=500)
+    status: Literal["approved", "rejected"]
+
+
+class BulkVerifyResult(BaseModel):
+    status: str
+    updated: list[UUID]
+    # not pending any more (decided earlier) or unknown ids
+    skipped: list[UUID]
+
+
+# Leaderboards: best approved value per machine, ranked within a cohort (GPU model or "*")
+class RankingEntry(BaseModel):
+    hardware_id: UUID
+    benchmark_id: UUID
+    value: Decimal
+    rank: int
+    percentile: float
+    cohort_size: int
+
+
+class Leaderboard(BaseModel):
+    metric: str
+    cohort: str
+    entries: list[RankingEntry]
+
+
+class MachineRanking(RankingEntry):
+    metric: str
+    cohort: str
@@ -1,17 +1,26 @@
 from __future__ import annotations
 
-from typing import List
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, List, Optional
 from uuid import UUID
 
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
 from app.machines import MachinesPublic, get_machines_public
+from app.metrics.public import MetricsPublic, get_metrics_public
+from app.metrics.schemas import MetricsQueryParams
 
-from .models import Benchmark
+from . import plausibility
+from .models import Benchmark, MachineLatestBenchmark
+from .ranking import ALL_MODELS, RANKED_METRICS, cohorts_for, ranking_cache
+from .pagination import decode_cursor, encode_cursor
+from .review import outlier_flags
 from .repository import BenchmarksRepository
-from .schemas import BenchmarkCreate
+from .schemas import BenchmarkCreate, BenchmarkRead
 
 # Service layer for benchmark-related business logic
 class BenchmarkService:
@@ -20,10 +29,12 @@ class BenchmarkService:
         db: Session,
         repo: BenchmarksRepository,
         machines_public: MachinesPublic,
+        metrics_public: MetricsPublic,
     ):
         self.db = db
         self.repo = repo
         self.machines_public = machines_public
+        self.metrics_public = metrics_public
 
     # Creates a benchmark submission for a machines
     def create_benchmark(
@@ -49,23 +60,229 @@ class BenchmarkService:
             network_bandwidth_gbps=payload.network_bandwidth_gbps,
             collected_at=payload.collected_at,
         )
+        self._score_plausibility(obj)
         return self.repo.create(self.db, obj)
 
-    # Returns all benchmarks for a given machines
-    def list_machine_benchmarks(self, hardware_id: UUID) -> List[Benchmark]:
-        machine = self.machines_public.get_machine(hardware_id)
-        if not machine:
+    # automated plausibility check against the cached reference distributions and the
+    # machine's telemetry before collected_at; stored for the admin review
+    def _score_plausibility(self, benchmark: Benchmark) -> None:
+        machine = self.machines_public.get_machine(benchmark.hardware_id)
+        reference = plausibility.reference_cache.get(lambda: self.repo.plausibility_reference(self.db))
+
+        window = timedelta(minutes=settings.BENCHMARK_PLAUSIBILITY_WINDOW_MINUTES)
+        columns, rows = self.metrics_public.list_metric_rows_for_machine(
+            benchmark.hardware_id,
+            MetricsQueryParams(start=benchmark.collected_at - window, end=benchmark.collected_at, limit=5000),
+        )
+
+        score, flags = plausibility.score(
+            benchmark,
+            machine.gpu_model,
+            machine.cpu_model,
+            reference,
+            plausibility.sample_arrays(columns, rows),
+            threshold=settings.BENCHMARK_PLAUSIBILITY_MAD_THRESHOLD,
+            min_samples=settings.BENCHMARK_OUTLIER_MIN_SAMPLES,
+        )
+        benchmark.plausibility_score = Decimal(str(score))
+        benchmark.plausibility_flags = flags
+
+    # Returns a page of a machine's benchmarks, newest first
+    def list_machine_benchmarks(
+        self, hardware_id: UUID, cursor: Optional[str] = None, limit: int = 100
+    ) -> dict[str, Any]:
+        if not self.machines_public.machine_exists(hardware_id):
+            raise ValueError("Machine does not exist.")
+        before = decode_cursor(cursor) if cursor else None
+        page = self.repo.list_for_machine(self.db, hardware_id, before, limit)
+
+        next_cursor = None
+        if len(page) == limit:
+            next_cursor = encode_cursor(page[-1].collected_at, page[-1].benchmark_id)
+        return {"items": page, "next_cursor": next_cursor}
+
+    # a machine's benchmarks reduced to one row per day / week / month (UTC)
+    def get_machine_history(
+        self,
+        hardware_id: UUID,
+        bucket: str = "week",
+        aggregate: str = "best",
+        status: Optional[str] = "approved",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> dict[str, Any]:
+        if not self.machines_public.machine_exists(hardware_id):
             raise ValueError("Machine does not exist.")
-        return self.repo.list_for_machine(self.db, hardware_id)
+        rows = self.repo.history_buckets(self.db, hardware_id, bucket, aggregate, status, start, end)
+        for row in rows:
+            row["bucket_start"] = row["bucket_start"].replace(tzinfo=timezone.utc)
+        return {"hardware_id": hardware_id, "bucket": bucket, "aggregate": aggregate, "buckets": rows}
+
+    # Admin decision on a submitted benchmark; keeps the leaderboards and the
+    # latest-approved projection in step
+    # - approval raises the machine's best values (one upsert, only higher values win)
+    #   and advances the projection if the benchmark is the most recent one
+    # - rejecting a previously approved benchmark rebuilds the machine's rows from the
+    #   benchmarks that remain approved
+    def verify_benchmark(self, benchmark_id: UUID, admin_id: UUID, status: str) -> Benchmark:
+        if status not in ("approved", "rejected"):
+            raise ValueError("Status must be 'approved' or 'rejected'.")
+        benchmark = self.repo.get(self.db, benchmark_id)
+        if benchmark is None:
+            raise ValueError("Benchmark does not exist.")
+
+        previous = benchmark.admin_verification_status
+        benchmark.admin_verification_status = status
+        benchmark.verified_by_admin_id = admin_id
+        self.db.flush()
+
+        gpu_model = self.machines_public.get_machine(benchmark.hardware_id).gpu_model
+        if status == "approved":
+            changed = self.repo.raise_rankings(self.db, self._ranking_rows([benchmark], gpu_model))
+            self.repo.advance_latest(self.db, [benchmark])
+            updates = [
+                (r["metric"], r["cohort"], r["hardware_id"], (r["value"], r["benchmark_id"])) for r in changed
+            ]
+        elif previous == "approved":
+            approved = self.repo.list_approved_for_machine(self.db, benchmark.hardware_id)
+            rows = self._ranking_rows(approved, gpu_model)
+            self.repo.replace_rankings(self.db, benchmark.hardware_id, rows)
+            self.repo.rebuild_latest(self.db, benchmark.hardware_id)
+            best = {(r["metric"], r["cohort"]): (r["value"], r["benchmark_id"]) for r in rows}
+            updates = [
+                (metric, cohort, benchmark.hardware_id, best.get((metric, cohort)))
+                for metric in RANKED_METRICS
+                for cohort in cohorts_for(gpu_model)
+            ]
+        else:
+            updates = []
+
+        benchmark = self.repo.update(self.db, benchmark)
+        for metric, cohort, hardware_id, value in updates:
+            ranking_cache.apply(metric, cohort, hardware_id, value)
+        return benchmark
+
+    # Admin review queue: pending benchmarks oldest first, each flagged against its
+    # GPU model's distribution; three queries per page (page, machines, cohort stats)
+    def list_review_queue(self, cursor: Optional[str] = None, limit: int = 50) -> dict[str, Any]:
+        after = decode_cursor(cursor) if cursor else None
+        page = self.repo.list_pending_page(self.db, after, limit)
+
+        machines = self.machines_public.get_machines({b.hardware_id for b in page})
+        gpu_models = {h: (m.gpu_model if m is not None else None) for h, m in machines.items()}
+        stats = self.repo.cohort_stats(self.db, sorted({cohorts_for(g)[0] for g in gpu_models.values()}))
+
+        items = []
+        for benchmark in page:
+            gpu_model = gpu_models.get(benchmark.hardware_id)
+            flags = outlier_flags(
+                benchmark,
+                gpu_model,
+                stats,
+                z_threshold=settings.BENCHMARK_OUTLIER_Z_THRESHOLD,
+                min_samples=settings.BENCHMARK_OUTLIER_MIN_SAMPLES,
+            )
+            items.append({
+                **BenchmarkRead.model_validate(benchmark).model_dump(),
+                "gpu_model": gpu_model,
+                "outliers": flags,
+                "flagged": bool(flags),
+            })
+
+        next_cursor = None
+        if len(page) == limit:
+            next_cursor = encode_cursor(page[-1].collected_at, page[-1].benchmark_id)
+        return {"items": items, "next_cursor": next_cursor}
+
+    # Bulk decision on pending benchmarks: one UPDATE for the statuses, then one upsert
+    # each for the leaderboards and the latest-approved projection
+    def bulk_verify(self, benchmark_ids: List[UUID], admin_id: UUID, status: str) -> dict[str, Any]:
+        if status not in ("approved", "rejected"):
+            raise ValueError("Status must be 'approved' or 'rejected'.")
+        requested = list(dict.fromkeys(benchmark_ids))
+        updated = self.repo.bulk_set_status(self.db, requested, status, admin_id)
+
+        changed: list[dict[str, Any]] = []
+        if status == "approved" and updated:
+            by_machine: dict[UUID, list[Benchmark]] = {}
+            for benchmark in updated:
+                by_machine.setdefault(benchmark.hardware_id, []).append(benchmark)
+            machines = self.machines_public.get_machines(by_machine)
+
+            rows = []
+            for hardware_id, benchmarks in by_machine.items():
+                machine = machines.get(hardware_id)
+                rows += self._ranking_rows(benchmarks, machine.gpu_model if machine is not None else None)
+            changed = self.repo.raise_rankings(self.db, rows)
+            self.repo.advance_latest(
+                self.db,
+                [max(bs, key=lambda b: (b.collected_at, b.benchmark_id)) for bs in by_machine.values()],
+            )
+        # rejected rows were pending, so they were never ranked or projected
+        self.db.commit()
+
+        for r in changed:
+            ranking_cache.apply(r["metric"], r["cohort"], r["hardware_id"], (r["value"], r["benchmark_id"]))
+        done = {b.benchmark_id for b in updated}
+        return {
+            "status": status,
+            "updated": [b for b in requested if b in done],
+            "skipped": [b for b in requested if b not in done],
+        }
+
+    # best value per metric among `benchmarks` (all of one machine), one row per cohort
+    def _ranking_rows(self, benchmarks: List[Benchmark], gpu_model: Optional[str]) -> list[dict[str, Any]]:
+        rows = []
+        for metric in RANKED_METRICS:
+            candidates = [b for b in benchmarks if getattr(b, metric) is not None]
+            if not candidates:
+                continue
+            best = max(candidates, key=lambda b: getattr(b, metric))
+            for cohort in cohorts_for(gpu_model):
+                rows.append({
+                    "metric": metric,
+                    "cohort": cohort,
+                    "hardware_id": best.hardware_id,
+                    "benchmark_id": best.benchmark_id,
+                    "value": getattr(best, metric),
+                })
+        return rows
+
+    # current performance figures: the latest approved benchmark per machine (projection)
+    def get_latest_approved(self, hardware_ids: List[UUID]) -> dict[UUID, MachineLatestBenchmark]:
+        return {row.hardware_id: row for row in self.repo.get_latest_approved(self.db, hardware_ids)}
+
+    def _cohort(self, metric: str, cohort: str):
+        return ranking_cache.get(metric, cohort, lambda m, c: self.repo.load_cohort(self.db, m, c))
+
+    # top-K machines for a metric, within one GPU model or marketplace-wide
+    def get_leaderboard(self, metric: str, gpu_model: Optional[str] = None, limit: int = 10) -> dict[str, Any]:
+        if metric not in RANKED_METRICS:
+            raise ValueError(f"Unknown metric, expected one of: {', '.join(RANKED_METRICS)}.")
+        cohort = gpu_model or ALL_MODELS
+        return {"metric": metric, "cohort": cohort, "entries": self._cohort(metric, cohort).top(limit)}
+
+    # rank and percentile of a machine for every metric it has an approved value for
+    def get_machine_ranking(self, hardware_id: UUID) -> list[dict[str, Any]]:
+        machine = self.machines_public.get_machine(hardware_id)
+        result = []
+        for metric in RANKED_METRICS:
+            for cohort in cohorts_for(machine.gpu_model):
+                position = self._cohort(metric, cohort).position(hardware_id)
+                if position is not None:
+                    result.append({"metric": metric, "cohort": cohort, **position})
+        return result
 
 
 # Dependency provider wiring the service with its collaborators
 def get_benchmark_service(
     db: Session = Depends(get_db),
     machines_public: MachinesPublic = Depends(get_machines_public),
+    metrics_public: MetricsPublic = Depends(get_metrics_public),
 ) -> BenchmarkService:
     return BenchmarkService(
         db=db,
         repo=BenchmarksRepository(),
         machines_public=machines_public,
+        metrics_public=metrics_public,
     )
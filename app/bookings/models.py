@@ -70,4 +70,5 @@ class Booking(Base):
         Index("idx_bookings_buyer_id", "buyer_id"),
         Index("idx_bookings_status", "booking_status"),
         Index("idx_bookings_start_end", "start_timestamp", "end_timestamp"),
+        Index("idx_bookings_end_timestamp", "end_timestamp"),
     )
@@ -1,8 +1,10 @@
 
 from __future__ import annotations
 
+from typing import Any, Sequence
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
 from .models import Booking
 
@@ -35,3 +37,29 @@ class BookingsRepository:
             .order_by(Booking.start_timestamp.desc())
             .all()
         )
+
+    # bookings with invoice, payments, listing and machine in five queries in total
+    # (one SELECT ... IN per relationship), however many bookings the user has
+    def list_bookings_with_details_for_user(self, db: Session, buyer_id: UUID) -> list[Booking]:
+        return (
+            db.query(Booking)
+            .filter(Booking.buyer_id == buyer_id)
+            .options(
+                selectinload(Booking.invoice),
+                selectinload(Booking.payments),
+                selectinload(Booking.listing),
+                selectinload(Booking.machine),
+            )
+            .order_by(Booking.start_timestamp.desc())
+            .all()
+        )
+
+    def list_booking_rows_for_user(
+        self, db: Session, buyer_id: UUID, columns: Sequence[str]
+    ) -> list[tuple[Any, ...]]:
+        stmt = (
+            select(*(getattr(Booking, c) for c in columns))
+            .where(Booking.buyer_id == buyer_id)
+            .order_by(Booking.start_timestamp.desc())
+        )
+        return [tuple(row) for row in db.execute(stmt).all()]
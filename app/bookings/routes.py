@@ -2,9 +2,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.auth import get_current_user
+from app.serialization import FastJSONResponse, rows_response
 from app.users import User
 
-from .schemas import BookingRead, BookingRequest
+from .schemas import BookingDashboardItem, BookingRead, BookingRequest
 from .service import BookingsService, get_bookings_service
 
 router = APIRouter()
@@ -25,7 +26,17 @@ def request_booking(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/", response_model=list[BookingRead])
+# Dashboard listing mode: every booking of the user with its invoice, payments and
+# listing summary embedded, loaded in a fixed number of queries
+@router.get("/dashboard", response_model=list[BookingDashboardItem])
+def list_my_bookings_dashboard(
+    user: User = Depends(get_current_user),
+    service: BookingsService = Depends(get_bookings_service),
+):
+    return service.list_booking_dashboard_for_user(user.customer_id)
+
+
+@router.get("/", response_model=list[BookingRead], response_class=FastJSONResponse)
 def list_my_bookings(
     user: User = Depends(get_current_user),
     service: BookingsService = Depends(get_bookings_service),
@@ -34,6 +45,7 @@ def list_my_bookings(
     List bookings of an authenticated user.
     """
     try:
-        return service.list_bookings_for_user(user.customer_id)
+        columns, rows = service.list_booking_rows_for_user(user.customer_id)
+        return rows_response(columns, rows)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
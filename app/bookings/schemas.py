@@ -1,6 +1,8 @@
 
 from pydantic import BaseModel, ConfigDict, field_validator
 from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Optional
 from uuid import UUID
 from enum import Enum
 
@@ -43,3 +45,46 @@ class BookingRead(BaseModel):
     booking_status: str
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# Embedded view model for the bookings dashboard (GET /bookings/dashboard)
+class BookingInvoiceSummary(BaseModel):
+    invoice_number: str
+    status: str
+    amount_total: Decimal
+    currency: str
+    issued_at: Optional[datetime] = None
+    paid_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BookingPaymentSummary(BaseModel):
+    payment_id: UUID
+    payment_status: str
+    amount_total: Decimal
+    currency: str
+    timestamp: datetime
+    captured_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BookingListingSummary(BaseModel):
+    listing_id: UUID
+    price_hour: Optional[Decimal] = None
+    price_day: Optional[Decimal] = None
+    price_week: Optional[Decimal] = None
+    currency: str
+    status: str
+    gpu_model: Optional[str] = None
+    cpu_model: Optional[str] = None
+    ram_gb: Optional[int] = None
+
+
+class BookingDashboardItem(BookingRead):
+    # status of the most recent payment, "none" when no payment exists
+    payment_status: str
+    invoice: Optional[BookingInvoiceSummary] = None
+    payments: list[BookingPaymentSummary] = []
+    listing: Optional[BookingListingSummary] = None
@@ -9,9 +9,10 @@ from fastapi import Depends
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.serialization import schema_columns
 from .repository import BookingsRepository
 from .models import Booking
-from .schemas import BookingRequest, BookingAdminCreate
+from .schemas import BookingRequest, BookingAdminCreate, BookingRead
 
 from app.listings import ListingsPublic, get_listings_public
 
@@ -68,6 +69,37 @@ class BookingsService:
     def list_bookings_for_user(self, buyer_id: UUID):
         return self.repo.list_bookings_for_user(self.db, buyer_id)
 
+    # fast path for the bookings list: row tuples in BookingRead field order
+    def list_booking_rows_for_user(self, buyer_id: UUID) -> tuple[tuple[str, ...], list[tuple]]:
+        columns = schema_columns(BookingRead)
+        return columns, self.repo.list_booking_rows_for_user(self.db, buyer_id, columns)
+
+    # dashboard view: bookings with embedded invoice, payments and listing summary
+    def list_booking_dashboard_for_user(self, buyer_id: UUID) -> list[dict]:
+        bookings = self.repo.list_bookings_with_details_for_user(self.db, buyer_id)
+        return [self._dashboard_item(b) for b in bookings]
+
+    def _dashboard_item(self, booking: Booking) -> dict:
+        payments = sorted(booking.payments, key=lambda p: p.timestamp)
+        listing, machine = booking.listing, booking.machine
+        return {
+            **BookingRead.model_validate(booking).model_dump(),
+            "payment_status": payments[-1].payment_status if payments else "none",
+            "invoice": booking.invoice,
+            "payments": payments,
+            "listing": {
+                "listing_id": listing.listing_id,
+                "price_hour": listing.price_hour,
+                "price_day": listing.price_day,
+                "price_week": listing.price_week,
+                "currency": listing.currency,
+                "status": listing.status,
+                "gpu_model": machine.gpu_model if machine else None,
+                "cpu_model": machine.cpu_model if machine else None,
+                "ram_gb": machine.ram_gb if machine else None,
+            } if listing else None,
+        }
+
     # Admin visibility: list all bookings in the system
     def list_all_bookings(self):
         return self.repo.list_bookings(self.db)
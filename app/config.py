@@ -33,5 +33,80 @@ class Settings(BaseSettings):
     POSTGRES_USER: str | None = None
     POSTGRES_PASSWORD: str | None = None
 
+    # SQL profiler / N+1 detector (development and staging only)
+    # mode: "log" | "header" | "raise"; budgets map route templates to max query counts
+    QUERY_PROFILER_ENABLED: bool = False
+    QUERY_PROFILER_MODE: str = "log"
+    QUERY_PROFILER_REPEAT_THRESHOLD: int = 3
+    QUERY_PROFILER_MAX_QUERIES: int | None = None
+    QUERY_PROFILER_BUDGETS: dict[str, int] = Field(default_factory=dict)
+
+    # response compression (zstd, br and gzip, negotiated from Accept-Encoding)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    # cap on the inflated size of compressed request bodies (batch metric ingest)
+    REQUEST_DECOMPRESSION_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # processor webhooks: signing secret, allowed clock skew, and the background worker
+    # that applies recorded events in batches
+    STRIPE_WEBHOOK_SECRET: str | None = None
+    STRIPE_WEBHOOK_TOLERANCE_SECONDS: int = 300
+    PAYMENT_EVENTS_WORKER_ENABLED: bool = True
+    PAYMENT_EVENTS_BATCH_SIZE: int = 200
+    PAYMENT_EVENTS_POLL_SECONDS: float = 5.0
+
+    # invoice numbers reserved per round-trip to invoice_number_counters (per process)
+    INVOICE_NUMBER_BLOCK_SIZE: int = 100
+
+    # a payout statement month is closed (and cached) this many days after it ends
+    PAYOUT_STATEMENT_CLOSE_DAYS: int = 7
+
+    # per-process cache of machine owner/status for existence and ownership checks
+    # (0 disables); invalidations are broadcast over pg NOTIFY when enabled
+    MACHINE_CACHE_TTL_SECONDS: float = 60.0
+    MACHINE_CACHE_NEGATIVE_TTL_SECONDS: float = 5.0
+    MACHINE_CACHE_MAX_ENTRIES: int = 50_000
+    MACHINE_CACHE_INVALIDATION_ENABLED: bool = False
+
+    # provider agent heartbeats: an agent is offline after this long without one;
+    # last-seen times (agent_heartbeats) and status transitions are written in
+    # batches every flush interval, shared by all workers
+    AGENT_LIVENESS_ENABLED: bool = True
+    AGENT_HEARTBEAT_TIMEOUT_SECONDS: float = 90.0
+    AGENT_LIVENESS_FLUSH_SECONDS: float = 5.0
+
+    # live metrics stream (SSE): machines per subscription, per-client queue, keep-alive
+    # interval, and fan-out of samples to every worker over pg NOTIFY
+    METRICS_STREAM_MAX_MACHINES: int = 200
+    METRICS_STREAM_QUEUE_SIZE: int = 256
+    METRICS_STREAM_KEEPALIVE_SECONDS: float = 15.0
+    METRICS_STREAM_CROSS_WORKER: bool = False
+
+    # per-process leaderboard snapshots are reloaded from benchmark_rankings after this long
+    BENCHMARK_RANKING_CACHE_SECONDS: float = 60.0
+    # admin queue: submissions this many standard deviations from their GPU model's
+    # mean are flagged, for models with at least the minimum number of ranked machines
+    BENCHMARK_OUTLIER_Z_THRESHOLD: float = 3.0
+    BENCHMARK_OUTLIER_MIN_SAMPLES: int = 10
+    # plausibility scoring of new submissions: reference distributions are rebuilt at
+    # most this often, metrics beyond the robust z threshold (MAD based) lower the score,
+    # telemetry is checked this many minutes before collected_at
+    BENCHMARK_PLAUSIBILITY_REFRESH_SECONDS: float = 300.0
+    BENCHMARK_PLAUSIBILITY_MAD_THRESHOLD: float = 3.5
+    BENCHMARK_PLAUSIBILITY_WINDOW_MINUTES: int = 15
+    # compaction (python -m app.benchmarks.compaction): superseded rejected / pending
+    # submissions older than this many days are deleted
+    BENCHMARK_REJECTED_RETENTION_DAYS: int = 90
+    BENCHMARK_PENDING_RETENTION_DAYS: int = 30
+
+    # wipes machines after bookings end; off until a real WipeExecutor is wired in
+    # (the mock reports every wipe as successful)
+    DATA_WIPES_SCHEDULER_ENABLED: bool = False
+    DATA_WIPES_WORKERS: int = 8
+    DATA_WIPES_BATCH_SIZE: int = 200
+    DATA_WIPES_POLL_SECONDS: float = 10.0
+    # where the first run starts scanning ended bookings
+    DATA_WIPES_INITIAL_LOOKBACK_HOURS: int = 24
+
 
 settings = Settings()
\ No newline at end of file
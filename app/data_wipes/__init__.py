@@ -0,0 +1,12 @@
+"""
+Public interface for the Data Wipes domain module.
+"""
+
+from .routes import router
+from .scheduler import DataWipeScheduler, data_wipe_scheduler
+
+__all__ = [
+    "router",
+    "DataWipeScheduler",
+    "data_wipe_scheduler",
+]
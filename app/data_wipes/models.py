@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, Text, func
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+# Entity class for table data_wipes: one row per executed wipe of a machine
+class DataWipe(Base):
+    __tablename__ = "data_wipes"
+
+    wipe_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        server_default=func.gen_random_uuid(),
+    )
+
+    hardware_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("machines.hardware_id", ondelete="RESTRICT"),
+        nullable=False,
+    )
+
+    booking_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("bookings.booking_id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    wipe_method_executed: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(Text, nullable=False, server_default="success")
+    wipe_evidence_uri: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("status IN ('success', 'failed', 'partial')", name="chk_data_wipes_status"),
+        Index("idx_data_wipes_hardware_id", "hardware_id"),
+        Index("idx_data_wipes_booking_id", "booking_id"),
+        Index("idx_data_wipes_timestamp", "timestamp"),
+        Index("idx_data_wipes_status", "status"),
+    )
+
+
+# Scan position of the wipe scheduler: every booking ending at or before
+# (end_timestamp, booking_id) has been handled; the row lock also keeps a second
+# process from scheduling the same bookings
+class DataWipeWatermark(Base):
+    __tablename__ = "data_wipe_watermarks"
+
+    name: Mapped[str] = mapped_column(Text, primary_key=True)
+    end_timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    booking_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,26 @@
+import time
+from uuid import UUID
+
+from .wipe_executor import WipeExecutor, WipeResult
+
+
+# Stand-in until provider agents accept wipe commands: reports every wipe as successful
+# after `latency` seconds
+class MockWipeExecutor(WipeExecutor):
+    def __init__(self, latency: float = 0.0, method: str = "container_destroy"):
+        self.latency = latency
+        self.method = method
+
+    def wipe(self, hardware_id: UUID, booking_id: UUID) -> WipeResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return WipeResult(
+            method=self.method,
+            status="success",
+            evidence_uri=f"mock://data-wipes/{hardware_id}/{booking_id}.log",
+        )
+
+
+def get_wipe_executor() -> WipeExecutor:
+    # factory function returning the WipeExecutor interface
+    return MockWipeExecutor()
@@ -0,0 +1,23 @@
+from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Optional, Protocol
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class WipeResult:
+    # e.g. container_destroy, home_directory_purge, user_deletion
+    method: str
+    # success, failed or partial (data_wipes.status)
+    status: str
+    # logs / artifacts of the wipe in object storage
+    evidence_uri: Optional[str] = None
+
+
+# Wipes a machine after a booking, typically by instructing the provider agent
+# The DataWipeScheduler depends on this abstraction; implementations are called from
+# worker threads, must be thread-safe and must bound their own run time
+class WipeExecutor(Protocol):
+    @abstractmethod
+    def wipe(self, hardware_id: UUID, booking_id: UUID) -> WipeResult:
+        pass
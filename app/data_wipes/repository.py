@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import desc, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.bookings.models import Booking
+from .models import DataWipe, DataWipeWatermark
+
+# bookings whose buyer had access to the machine; pending and canceled ones never started
+WIPED_BOOKING_STATUSES = ("active", "completed", "disputed")
+
+
+class DataWipesRepository:
+    # creates the watermark at `initial` if missing, then locks it for the caller's
+    # transaction; None when another process holds it
+    def lock_watermark(
+        self, db: Session, name: str, initial: tuple[datetime, UUID]
+    ) -> Optional[tuple[datetime, UUID]]:
+        db.execute(
+            pg_insert(DataWipeWatermark)
+            .values(name=name, end_timestamp=initial[0], booking_id=initial[1])
+            .on_conflict_do_nothing()
+        )
+        row = db.execute(
+            select(DataWipeWatermark.end_timestamp, DataWipeWatermark.booking_id)
+            .where(DataWipeWatermark.name == name)
+            .with_for_update(skip_locked=True)
+        ).first()
+        return tuple(row) if row is not None else None
+
+    # bookings that ended after the watermark and no later than `until`, in
+    # (end_timestamp, booking_id) order; a range scan on idx_bookings_end_timestamp
+    def list_ended_bookings(
+        self, db: Session, after: tuple[datetime, UUID], until: datetime, limit: int
+    ) -> list[tuple[UUID, UUID, datetime]]:
+        stmt = (
+            select(Booking.booking_id, Booking.hardware_id, Booking.end_timestamp)
+            .where(
+                tuple_(Booking.end_timestamp, Booking.booking_id) > tuple_(*after),
+                Booking.end_timestamp <= until,
+                Booking.booking_status.in_(WIPED_BOOKING_STATUSES),
+            )
+            .order_by(Booking.end_timestamp, Booking.booking_id)
+            .limit(limit)
+        )
+        return [tuple(row) for row in db.execute(stmt)]
+
+    # one executemany INSERT for the batch's results, and the watermark moved past it,
+    # in the transaction holding the watermark lock
+    def record_results(
+        self, db: Session, rows: Sequence[dict[str, Any]], name: str, watermark: tuple[datetime, UUID]
+    ) -> None:
+        if rows:
+            db.execute(insert(DataWipe), list(rows))
+        db.execute(
+            update(DataWipeWatermark)
+            .where(DataWipeWatermark.name == name)
+            .values(end_timestamp=watermark[0], booking_id=watermark[1], updated_at=func.now())
+        )
+        db.commit()
+
+    def list_for_machine(self, db: Session, hardware_id: UUID, limit: int = 100) -> List[DataWipe]:
+        stmt = (
+            select(DataWipe)
+            .where(DataWipe.hardware_id == hardware_id)
+            .order_by(desc(DataWipe.timestamp))
+            .limit(limit)
+        )
+        return list(db.scalars(stmt).all())
+
+    def list_for_booking(self, db: Session, booking_id: UUID) -> List[DataWipe]:
+        stmt = select(DataWipe).where(DataWipe.booking_id == booking_id).order_by(desc(DataWipe.timestamp))
+        return list(db.scalars(stmt).all())
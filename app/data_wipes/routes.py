@@ -0,0 +1,42 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.auth import get_current_user
+from app.users import User
+
+from .schemas import DataWipeRead
+from .service import DataWipesService, get_data_wipes_service
+
+router = APIRouter()
+
+
+# wipe history of a machine (provider)
+@router.get("/machines/{hardware_id}", response_model=list[DataWipeRead])
+def get_machine_wipes(
+    hardware_id: UUID,
+    limit: int = Query(100, ge=1, le=1000),
+    user: User = Depends(get_current_user),
+    service: DataWipesService = Depends(get_data_wipes_service),
+):
+    try:
+        return service.list_machine_wipes(user.customer_id, hardware_id, limit)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+# wipe log of a booking (buyer or provider); empty until the booking has ended
+@router.get("/bookings/{booking_id}", response_model=list[DataWipeRead])
+def get_booking_wipes(
+    booking_id: UUID,
+    user: User = Depends(get_current_user),
+    service: DataWipesService = Depends(get_data_wipes_service),
+):
+    try:
+        return service.list_booking_wipes(user.customer_id, booking_id)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
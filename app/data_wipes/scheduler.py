@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from .ports.mock_executor import get_wipe_executor
+from .ports.wipe_executor import WipeExecutor
+from .repository import DataWipesRepository
+
+logger = logging.getLogger(__name__)
+
+WATERMARK = "bookings"
+NOT_EXECUTED = "not_executed"
+
+
+# Background thread wiping machines after their bookings end
+# - each tick locks the watermark row, reads the next bookings that ended after it
+#   (keyset scan on end_timestamp, never the whole table), wipes them on a bounded
+#   thread pool and records all results with one batched INSERT in the same
+#   transaction that advances the watermark
+# - an interrupted batch is simply repeated by the next tick (wipes are idempotent);
+#   other processes skip the tick while the watermark is locked
+# - a wipe is attempted up to `attempts` times; one that keeps failing is recorded
+#   with status failed for the operators, the scan moves on
+# - keeps draining without sleeping while full batches come back
+class DataWipeScheduler:
+    def __init__(
+        self,
+        executor: Optional[WipeExecutor] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        repo: Optional[DataWipesRepository] = None,
+        workers: int = 8,
+        batch_size: int = 200,
+        poll_interval: float = 10.0,
+        attempts: int = 3,
+        initial_lookback: timedelta = timedelta(hours=24),
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.executor = executor
+        self.session_factory = session_factory
+        self.repo = repo or DataWipesRepository()
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.attempts = attempts
+        self.initial_lookback = initial_lookback
+        self.clock = clock
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="data-wipe-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # wipes one batch of ended bookings; returns the number handled
+    def run_once(self) -> int:
+        now = self.clock()
+        db = self.session_factory()
+        try:
+            after = self.repo.lock_watermark(db, WATERMARK, (now - self.initial_lookback, uuid.UUID(int=0)))
+            if after is None:
+                return 0
+            bookings = self.repo.list_ended_bookings(db, after, now, self.batch_size)
+            if not bookings:
+                db.rollback()
+                return 0
+
+            rows = list(self._get_pool().map(self._wipe, bookings))
+            last_id, _, last_end = bookings[-1]
+            self.repo.record_results(db, rows, WATERMARK, (last_end, last_id))
+
+            failed = sum(1 for r in rows if r["status"] != "success")
+            if failed:
+                logger.warning("Data wipes: %d of %d wipes did not succeed", failed, len(rows))
+            return len(bookings)
+        finally:
+            db.close()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="data-wipe")
+        return self._pool
+
+    def _wipe(self, booking: tuple[UUID, UUID, datetime]) -> dict[str, Any]:
+        booking_id, hardware_id, _ = booking
+        executor = self.executor or get_wipe_executor()
+        row = {
+            "hardware_id": hardware_id,
+            "booking_id": booking_id,
+            "wipe_method_executed": NOT_EXECUTED,
+            "status": "failed",
+            "wipe_evidence_uri": None,
+        }
+        for attempt in range(1, self.attempts + 1):
+            try:
+                result = executor.wipe(hardware_id, booking_id)
+            except Exception:
+                logger.exception("Data wipe of %s (booking %s) failed, attempt %d", hardware_id, booking_id, attempt)
+                continue
+            row.update(
+                wipe_method_executed=result.method,
+                status=result.status,
+                wipe_evidence_uri=result.evidence_uri,
+            )
+            if result.status == "success":
+                break
+        row["timestamp"] = self.clock()
+        return row
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                handled = self.run_once()
+            except Exception:
+                logger.exception("Data wipe scheduler: batch failed")
+                handled = 0
+
+            if handled < self.batch_size:
+                self._stop.wait(self.poll_interval)
+
+
+data_wipe_scheduler = DataWipeScheduler(
+    workers=settings.DATA_WIPES_WORKERS,
+    batch_size=settings.DATA_WIPES_BATCH_SIZE,
+    poll_interval=settings.DATA_WIPES_POLL_SECONDS,
+    initial_lookback=timedelta(hours=settings.DATA_WIPES_INITIAL_LOOKBACK_HOURS),
+)
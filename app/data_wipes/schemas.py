@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+# wipe record of a machine, e.g. the proof that it was wiped after a booking
+class DataWipeRead(BaseModel):
+    wipe_id: UUID
+    hardware_id: UUID
+    booking_id: Optional[UUID]
+    timestamp: datetime
+    wipe_method_executed: str
+    status: str
+    wipe_evidence_uri: Optional[str]
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import List
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.bookings.public import BookingsPublic, get_bookings_public
+from app.database import get_db
+from app.machines import MachinesPublic, get_machines_public
+
+from .models import DataWipe
+from .repository import DataWipesRepository
+
+
+# Read side of the wipe records; wipes themselves are run by the DataWipeScheduler
+class DataWipesService:
+    def __init__(
+        self,
+        db: Session,
+        repo: DataWipesRepository,
+        machines_public: MachinesPublic,
+        bookings_public: BookingsPublic,
+    ):
+        self.db = db
+        self.repo = repo
+        self.machines_public = machines_public
+        self.bookings_public = bookings_public
+
+    # latest wipes of a machine, for its provider
+    def list_machine_wipes(self, customer_id: UUID, hardware_id: UUID, limit: int = 100) -> List[DataWipe]:
+        if not self.machines_public.customer_owns_machine(customer_id=customer_id, machine_id=hardware_id):
+            if not self.machines_public.machine_exists(hardware_id):
+                raise ValueError("Machine does not exist.")
+            raise PermissionError("User does not own machine.")
+        return self.repo.list_for_machine(self.db, hardware_id, limit)
+
+    # wipes after a booking, for its buyer and the machine's provider
+    def list_booking_wipes(self, customer_id: UUID, booking_id: UUID) -> List[DataWipe]:
+        booking = self.bookings_public.get_booking(booking_id)
+        if booking.buyer_id != customer_id and not self.machines_public.customer_owns_machine(
+            customer_id=customer_id, machine_id=booking.hardware_id
+        ):
+            raise PermissionError("Not allowed to view this booking.")
+        return self.repo.list_for_booking(self.db, booking_id)
+
+
+# Dependency provider wiring the service with its collaborators
+def get_data_wipes_service(
+    db: Session = Depends(get_db),
+    machines_public: MachinesPublic = Depends(get_machines_public),
+    bookings_public: BookingsPublic = Depends(get_bookings_public),
+) -> DataWipesService:
+    return DataWipesService(
+        db=db,
+        repo=DataWipesRepository(),
+        machines_public=machines_public,
+        bookings_public=bookings_public,
+    )
@@ -0,0 +1,12 @@
+"""
+Public interface for the Fleet domain module.
+"""
+
+from .routes import router
+from .service import FleetService, get_fleet_service
+
+__all__ = [
+    "router",
+    "FleetService",
+    "get_fleet_service",
+]
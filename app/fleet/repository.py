@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, select, true
+from sqlalchemy.orm import Session
+
+from app.bookings.models import Booking
+from app.machines.models import Machine
+from app.metrics.models import MetricSample
+
+LATEST_COLUMNS = ("recorded_at", "gpu_util", "cpu_util", "mem_used_gb", "net_rx_mb", "net_tx_mb")
+BOOKING_COLUMNS = ("booking_id", "booking_status", "start_timestamp", "end_timestamp")
+OPEN_BOOKING_STATUSES = ("pending", "active")
+
+
+class FleetRepository:
+    # one row per machine of the customer, in a single statement:
+    # - latest sample: LATERAL ... ORDER BY recorded_at DESC LIMIT 1 (idx_metric_samples_hardware_recorded)
+    # - window averages: LATERAL aggregate over the same index range
+    # - booking: LATERAL, the open booking that ends first after `now`
+    def fleet_rows(self, db: Session, customer_id: UUID, since: datetime, now: datetime) -> list[dict[str, Any]]:
+        latest = (
+            select(*(getattr(MetricSample, c).label(f"latest_{c}") for c in LATEST_COLUMNS))
+            .where(MetricSample.hardware_id == Machine.hardware_id)
+            .order_by(MetricSample.recorded_at.desc())
+            .limit(1)
+            .lateral("latest")
+        )
+        utilisation = (
+            select(
+                func.count().label("samples"),
+                func.avg(MetricSample.gpu_util).label("gpu_util_avg"),
+                func.avg(MetricSample.cpu_util).label("cpu_util_avg"),
+                func.avg(MetricSample.mem_used_gb).label("mem_used_gb_avg"),
+            )
+            .where(
+                MetricSample.hardware_id == Machine.hardware_id,
+                MetricSample.recorded_at >= since,
+                MetricSample.recorded_at <= now,
+            )
+            .lateral("utilisation")
+        )
+        booking = (
+            select(*(getattr(Booking, c).label(f"booking_{c}") for c in BOOKING_COLUMNS))
+            .where(
+                Booking.hardware_id == Machine.hardware_id,
+                Booking.booking_status.in_(OPEN_BOOKING_STATUSES),
+                Booking.end_timestamp > now,
+            )
+            .order_by(Booking.start_timestamp)
+            .limit(1)
+            .lateral("booking")
+        )
+
+        stmt = (
+            select(
+                Machine.hardware_id,
+                Machine.gpu_model,
+                Machine.cpu_model,
+                Machine.ram_gb,
+                Machine.provider_agent_status,
+                latest,
+                utilisation,
+                booking,
+            )
+            .select_from(Machine)
+            .outerjoin(latest, true())
+            .outerjoin(utilisation, true())
+            .outerjoin(booking, true())
+            .where(Machine.customer_id == customer_id)
+            .order_by(Machine.hardware_id)
+        )
+        return [dict(row._mapping) for row in db.execute(stmt)]
@@ -0,0 +1,28 @@
+"""
+Fleet overview for providers: every owned machine with its latest metric sample,
+utilisation over a window, booking state and agent status in one response.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.auth import get_current_user
+from app.users import User
+
+from .schemas import FleetSummary
+from .service import FleetService, get_fleet_service
+
+router = APIRouter()
+
+
+@router.get("/summary", response_model=FleetSummary)
+def get_fleet_summary(
+    window_minutes: int = Query(60, description="Utilisation averaging window in minutes"),
+    user: User = Depends(get_current_user),
+    service: FleetService = Depends(get_fleet_service),
+):
+    try:
+        return service.get_fleet_summary(user.customer_id, window_minutes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
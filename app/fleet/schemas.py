@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+# API contract models (DTOs) for the provider fleet overview
+class FleetLatestSample(BaseModel):
+    recorded_at: datetime
+    gpu_util: Optional[float] = None
+    cpu_util: Optional[float] = None
+    mem_used_gb: Optional[float] = None
+    net_rx_mb: Optional[float] = None
+    net_tx_mb: Optional[float] = None
+
+
+# averages over the samples recorded in the summary window
+class FleetUtilisation(BaseModel):
+    samples: int
+    gpu_util_avg: Optional[float] = None
+    cpu_util_avg: Optional[float] = None
+    mem_used_gb_avg: Optional[float] = None
+
+
+# the booking in progress, otherwise the next upcoming one
+class FleetBooking(BaseModel):
+    booking_id: UUID
+    booking_status: str
+    start_timestamp: datetime
+    end_timestamp: datetime
+
+
+class FleetMachine(BaseModel):
+    hardware_id: UUID
+    gpu_model: Optional[str] = None
+    cpu_model: Optional[str] = None
+    ram_gb: int
+    provider_agent_status: str
+    # "booked" (booking in progress), "reserved" (upcoming booking) or "idle"
+    booking_state: str
+    booking: Optional[FleetBooking] = None
+    latest: Optional[FleetLatestSample] = None
+    utilisation: FleetUtilisation
+
+
+class FleetSummary(BaseModel):
+    customer_id: UUID
+    window_start: datetime
+    window_end: datetime
+    machine_count: int
+    online_count: int
+    booked_count: int
+    machines: list[FleetMachine]
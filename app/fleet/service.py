@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from .repository import BOOKING_COLUMNS, LATEST_COLUMNS, FleetRepository
+
+MAX_WINDOW_MINUTES = 7 * 24 * 60
+
+
+class FleetService:
+    def __init__(
+        self,
+        db: Session,
+        repo: FleetRepository,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.db = db
+        self.repo = repo
+        self.clock = clock
+
+    # fleet overview of every machine the customer owns, one query regardless of fleet size
+    def get_fleet_summary(self, customer_id: UUID, window_minutes: int = 60) -> dict[str, Any]:
+        if not 1 <= window_minutes <= MAX_WINDOW_MINUTES:
+            raise ValueError(f"window_minutes must be between 1 and {MAX_WINDOW_MINUTES}.")
+
+        now = self.clock()
+        since = now - timedelta(minutes=window_minutes)
+        machines = [self._machine(row, now) for row in self.repo.fleet_rows(self.db, customer_id, since, now)]
+        return {
+            "customer_id": customer_id,
+            "window_start": since,
+            "window_end": now,
+            "machine_count": len(machines),
+            "online_count": sum(1 for m in machines if m["provider_agent_status"] == "online"),
+            "booked_count": sum(1 for m in machines if m["booking_state"] == "booked"),
+            "machines": machines,
+        }
+
+    def _machine(self, row: dict[str, Any], now: datetime) -> dict[str, Any]:
+        booking = self._nested(row, "booking_", BOOKING_COLUMNS, "booking_id")
+        if booking is None:
+            state = "idle"
+        elif booking["start_timestamp"] <= now:
+            state = "booked"
+        else:
+            state = "reserved"
+
+        return {
+            "hardware_id": row["hardware_id"],
+            "gpu_model": row["gpu_model"],
+            "cpu_model": row["cpu_model"],
+            "ram_gb": row["ram_gb"],
+            "provider_agent_status": row["provider_agent_status"],
+            "booking_state": state,
+            "booking": booking,
+            "latest": self._nested(row, "latest_", LATEST_COLUMNS, "recorded_at"),
+            "utilisation": {
+                "samples": row["samples"],
+                "gpu_util_avg": row["gpu_util_avg"],
+                "cpu_util_avg": row["cpu_util_avg"],
+                "mem_used_gb_avg": row["mem_used_gb_avg"],
+            },
+        }
+
+    # prefixed lateral columns -> nested dict, None when the outer join found nothing
+    @staticmethod
+    def _nested(row: dict[str, Any], prefix: str, columns, key: str) -> Optional[dict[str, Any]]:
+        if row[prefix + key] is None:
+            return None
+        return {c: row[prefix + c] for c in columns}
+
+
+# Dependency provider for FleetService
+def get_fleet_service(db: Session = Depends(get_db)) -> FleetService:
+    return FleetService(db=db, repo=FleetRepository())
@@ -5,7 +5,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, Numeric, Text, func
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, ForeignKey, Index, Integer, Numeric, Text, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, CHAR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -63,4 +63,23 @@ class Invoice(Base):
         Index("idx_invoices_provider_id", "provider_id"),
         Index("idx_invoices_created_at", "created_at"),
         Index("idx_invoices_status", "status"),
+        # payout statements: a provider's invoices without touching the heap
+        Index(
+            "idx_invoices_provider_booking",
+            "provider_id",
+            "booking_id",
+            postgresql_include=["amount_total", "currency", "status"],
+        ),
+    )
+
+
+# Per-year invoice number counter; next_value is the first number not yet handed out
+# (see app/invoices/numbering.py)
+class InvoiceNumberCounter(Base):
+    __tablename__ = "invoice_number_counters"
+
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    next_value: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="1")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
     )
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+
+from .models import InvoiceNumberCounter
+
+
+# INV-2025-0000000001: ten digits, so allocated numbers never collide with the
+# legacy timestamp-derived nine-digit numbers (INV-2025-123456789)
+def format_invoice_number(year: int, value: int) -> str:
+    return f"INV-{year}-{value:010d}"
+
+
+# Hands out invoice numbers from per-year blocks reserved in invoice_number_counters
+# - one UPDATE ... RETURNING per block of `block_size` numbers instead of per invoice
+# - reservations commit on their own connection, independent of the caller's transaction
+# - gap tolerant: numbers left in a block when the process exits are never reused
+# - thread-safe; each process (worker) holds its own blocks
+class InvoiceNumberAllocator:
+    def __init__(self, engine: Engine, block_size: int = 100):
+        if block_size < 1:
+            raise ValueError("block_size must be positive.")
+        self.engine = engine
+        self.block_size = block_size
+        self._lock = Lock()
+        # year -> [next value, end of block (exclusive)]
+        self._blocks: dict[int, list[int]] = {}
+
+    def next_number(self, year: Optional[int] = None) -> str:
+        year = year or datetime.now(timezone.utc).year
+        with self._lock:
+            block = self._blocks.get(year)
+            if block is None or block[0] >= block[1]:
+                block = self._blocks[year] = self._reserve_block(year)
+            value = block[0]
+            block[0] += 1
+        return format_invoice_number(year, value)
+
+    def _reserve_block(self, year: int) -> list[int]:
+        counters = InvoiceNumberCounter.__table__
+        stmt = (
+            insert(counters)
+            .values(year=year, next_value=1 + self.block_size)
+            .on_conflict_do_update(
+                index_elements=[counters.c.year],
+                set_={"next_value": counters.c.next_value + self.block_size, "updated_at": func.now()},
+            )
+            .returning(counters.c.next_value)
+        )
+        with self.engine.begin() as conn:
+            end = conn.execute(stmt).scalar_one()
+        return [end - self.block_size, end]
+
+
+_allocator: Optional[InvoiceNumberAllocator] = None
+_allocator_lock = Lock()
+
+
+# process-wide allocator shared by all requests
+def get_invoice_number_allocator() -> InvoiceNumberAllocator:
+    global _allocator
+    if _allocator is None:
+        with _allocator_lock:
+            if _allocator is None:
+                from app.config import settings
+                from app.database import engine
+
+                _allocator = InvoiceNumberAllocator(engine, block_size=settings.INVOICE_NUMBER_BLOCK_SIZE)
+    return _allocator
@@ -1,5 +1,7 @@
 
+from datetime import datetime
 from uuid import UUID
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from .models import Invoice
 
@@ -25,3 +27,15 @@ class InvoicesRepository:
     def get_by_invoice_number(self, db: Session, invoice_number: str) -> Invoice | None:
         return db.query(Invoice).filter(Invoice.invoice_number == invoice_number).first()
 
+    # batch variant of mark-paid; does not commit, the caller owns the transaction
+    def mark_paid_by_numbers(self, db: Session, invoice_numbers: list[str], paid_at: datetime) -> int:
+        if not invoice_numbers:
+            return 0
+        result = db.execute(
+            update(Invoice)
+            .where(Invoice.invoice_number.in_(invoice_numbers), Invoice.status != "paid")
+            .values(status="paid", paid_at=paid_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
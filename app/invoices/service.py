@@ -8,14 +8,16 @@ from fastapi import Depends
 
 from app.database import get_db
 from .repository import InvoicesRepository
+from .numbering import InvoiceNumberAllocator, get_invoice_number_allocator
 from .models import Invoice
 from .schemas import InvoiceCreate
 
 
 class InvoicesService:
-    def __init__(self, db: Session, repo: InvoicesRepository):
+    def __init__(self, db: Session, repo: InvoicesRepository, allocator: InvoiceNumberAllocator | None = None):
         self.db = db
         self.repo = repo
+        self.allocator = allocator or get_invoice_number_allocator()
 
     def create_invoice(self, payload: InvoiceCreate) -> Invoice:
         # prevent duplicates per booking
@@ -38,6 +40,9 @@ class InvoicesService:
         )
         return self.repo.create(self.db, inv)
 
+    def get_for_booking(self, booking_id: UUID) -> Invoice | None:
+        return self.repo.get_by_booking(self.db, booking_id)
+
     def mark_paid(self, invoice_id: UUID) -> Invoice:
         inv = self.repo.get(self.db, invoice_id)
         if not inv:
@@ -54,11 +59,14 @@ class InvoicesService:
         inv.paid_at = datetime.now(timezone.utc)
         return self.repo.update(self.db, inv)
 
+    # marks many invoices paid in one statement inside the caller's transaction
+    # (unknown numbers are skipped instead of raising)
+    def mark_paid_by_numbers(self, invoice_numbers: list[str]) -> int:
+        return self.repo.mark_paid_by_numbers(self.db, invoice_numbers, datetime.now(timezone.utc))
+
 
     def _generate_invoice_number(self) -> str:
-        now = datetime.now(timezone.utc)
-        suffix = int(now.timestamp() * 1000) % 1_000_000_000
-        return f"INV-{now.year}-{suffix:09d}"
+        return self.allocator.next_number(datetime.now(timezone.utc).year)
     
     def create_invoice_for_booking(self, booking, payer_id, provider_id, amount_total, currency="EUR"):
         existing = self.repo.get_by_booking(self.db, booking.booking_id)
@@ -5,6 +5,7 @@ from typing import Protocol
 from uuid import UUID
 from fastapi import Depends
 
+from app.loaders import BatchLoader
 from .service import ListingsService, get_listings_service
 from .schemas import ListingCreate
 
@@ -21,16 +22,21 @@ class ListingsPublic(Protocol):
 
 
 # Default implementation of ListingsPublic
-# Thin adapter layer that forwards calls to the service layer
+# Thin adapter layer that forwards calls to the service layer; single listings are
+# resolved through a request-scoped BatchLoader (coalesced IN queries, memoised)
 class ListingsPublicImpl:
     def __init__(self, service: ListingsService):
         self.service = service
+        self.listings = BatchLoader(service.get_listings_by_ids)
 
     def create_listing(self, customer_id: UUID, payload: ListingCreate):
         return self.service.create_listing(customer_id, payload)
 
     def get_listing_by_id(self, listing_id: UUID):
-        return self.service.get_listing_by_id(listing_id)
+        listing = self.listings.load(listing_id)
+        if listing is None:
+            raise ValueError("Listing not found.")
+        return listing
 
     def list_listings(self):
         return self.service.list_listings()
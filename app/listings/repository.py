@@ -1,7 +1,9 @@
 
 from __future__ import annotations
 
+from typing import Any, Sequence
 from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
 from .models import Listing
@@ -15,6 +17,14 @@ class ListingsRepository:
             .all()
         )
 
+    # plain row tuples of the requested columns, same ordering as get_listings (no machine join)
+    def get_listing_rows(self, db: Session, columns: Sequence[str]) -> list[tuple[Any, ...]]:
+        stmt = (
+            select(*(getattr(Listing, c) for c in columns))
+            .order_by(Listing.updated_at.desc().nullslast(), Listing.created_at.desc())
+        )
+        return [tuple(row) for row in db.execute(stmt).all()]
+
     def create_listing(self, db: Session, listing: Listing) -> Listing:
         db.add(listing)
         db.commit()
@@ -22,4 +32,9 @@ class ListingsRepository:
         return listing
 
     def get_listing_by_id(self, db: Session, listing_id: UUID) -> Listing | None:
-        return db.get(Listing, listing_id)
\ No newline at end of file
+        return db.get(Listing, listing_id)
+
+    def get_listings_by_ids(self, db: Session, listing_ids: Sequence[UUID]) -> list[Listing]:
+        if not listing_ids:
+            return []
+        return db.query(Listing).filter(Listing.listing_id.in_(list(listing_ids))).all()
\ No newline at end of file
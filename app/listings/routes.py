@@ -10,6 +10,7 @@ from fastapi import Depends, APIRouter, HTTPException
 from uuid import UUID
 
 from app.auth import get_current_user
+from app.serialization import FastJSONResponse, rows_response
 from app.users import User
 
 from .schemas import ListingCreate, ListingRead
@@ -38,10 +39,11 @@ def create_listing(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/", response_model=list[ListingRead])
+@router.get("/", response_model=list[ListingRead], response_class=FastJSONResponse)
 def list_listings(service: ListingsService = Depends(get_listings_service)):
     """Public listings endpoint."""
-    return service.list_listings()
+    columns, rows = service.list_listing_rows()
+    return rows_response(columns, rows)
 
 
 @router.get("/{listing_id:uuid}", response_model=ListingRead)
@@ -4,15 +4,16 @@ from __future__ import annotations
 from uuid import UUID
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any
+from typing import Any, Sequence
 
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.serialization import schema_columns
 from .repository import ListingsRepository
 from .models import Listing
-from .schemas import ListingCreate
+from .schemas import ListingCreate, ListingRead
 
 
 _ALLOWED_STATUS = {"active", "paused", "archived"}
@@ -31,6 +32,11 @@ class ListingsService:
     def list_listings(self) -> list[Listing]:
         return self.listings_repo.get_listings(self.db)
 
+    # fast path for the listings catalogue: row tuples in ListingRead field order
+    def list_listing_rows(self) -> tuple[tuple[str, ...], list[tuple]]:
+        columns = schema_columns(ListingRead)
+        return columns, self.listings_repo.get_listing_rows(self.db, columns)
+
     def get_listing_by_id(self, listing_id: UUID) -> Listing:
         listing = self.listings_repo.get_listing_by_id(self.db, listing_id)
         if not listing:
@@ -38,6 +44,11 @@ class ListingsService:
         return listing
 
 
+    # {listing_id: listing} for the ids that exist, one query
+    def get_listings_by_ids(self, listing_ids: Sequence[UUID]) -> dict[UUID, Listing]:
+        listings = self.listings_repo.get_listings_by_ids(self.db, listing_ids)
+        return {listing.listing_id: listing for listing in listings}
+
     def create_listing(self, customer_id: UUID, payload: ListingCreate) -> Listing:
         machine = self.machines_repo.get_machine(self.db, payload.hardware_id)
         if not machine:
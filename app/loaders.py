@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Generic, Hashable, Iterable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Request-scoped batch loader (dataloader style) used behind the *Public facades
+# - batch_fn resolves many keys with one query and returns {key: value} for the keys found
+# - results are memoised for the lifetime of the loader, missing keys as None
+# - keys announced with prime() are fetched together with the next key that misses the
+#   cache, so a workflow that knows its ids upfront pays one IN query instead of N lookups
+# - loaders live on the facade instances, which FastAPI builds once per request
+
+
+class BatchLoader(Generic[K, V]):
+    def __init__(self, batch_fn: Callable[[list[K]], Dict[K, V]], max_batch_size: int = 1000):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self._cache: Dict[K, Optional[V]] = {}
+        self._pending: dict[K, None] = {}
+
+    def prime(self, keys: Iterable[K]) -> None:
+        for key in keys:
+            if key not in self._cache:
+                self._pending[key] = None
+
+    def load(self, key: K) -> Optional[V]:
+        if key not in self._cache:
+            self.prime((key,))
+            self._dispatch()
+        return self._cache[key]
+
+    # {key: value or None} in the order of the given keys
+    def load_many(self, keys: Iterable[K]) -> Dict[K, Optional[V]]:
+        keys = list(dict.fromkeys(keys))
+        self.prime(keys)
+        self._dispatch()
+        return {key: self._cache[key] for key in keys}
+
+    # drops memoised entries, e.g. after the caller changed the underlying rows
+    def clear(self, key: Optional[K] = None) -> None:
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _dispatch(self) -> None:
+        pending = [key for key in self._pending if key not in self._cache]
+        self._pending.clear()
+        for i in range(0, len(pending), self.max_batch_size):
+            chunk = pending[i:i + self.max_batch_size]
+            found = self.batch_fn(chunk)
+            for key in chunk:
+                self._cache[key] = found.get(key)
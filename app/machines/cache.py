@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+from uuid import UUID
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "machines_cache"
+
+
+@dataclass(frozen=True)
+class MachineSummary:
+    hardware_id: UUID
+    customer_id: UUID
+    provider_agent_status: str
+
+
+# returned by MachineCache.get for machines known not to exist
+class _Missing:
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+# Process-wide cache of hardware_id -> (owner, agent status) for existence/ownership checks
+# - bounded LRU; entries expire after `ttl`, "does not exist" answers after `negative_ttl`
+# - MachinesService invalidates entries on create and delete; with the optional
+#   cross-process channel the invalidation is also broadcast to the other workers
+#   over pg NOTIFY, otherwise they converge within the TTL
+class MachineCache:
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        max_entries: int = 50_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[UUID, tuple[float, Union[MachineSummary, _Missing]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # cached summary, MISSING, or None when the database has to be asked
+    def get(self, hardware_id: UUID) -> Optional[Union[MachineSummary, _Missing]]:
+        with self._lock:
+            entry = self._entries.get(hardware_id)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= self.clock():
+                del self._entries[hardware_id]
+                return None
+            self._entries.move_to_end(hardware_id)
+            return value
+
+    def put(self, hardware_id: UUID, summary: Optional[MachineSummary]) -> None:
+        ttl = self.ttl if summary is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[hardware_id] = (self.clock() + ttl, summary if summary is not None else MISSING)
+            self._entries.move_to_end(hardware_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, hardware_id: UUID) -> None:
+        with self._lock:
+            self._entries.pop(hardware_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+machine_cache = MachineCache(
+    ttl=settings.MACHINE_CACHE_TTL_SECONDS,
+    negative_ttl=settings.MACHINE_CACHE_NEGATIVE_TTL_SECONDS,
+    max_entries=settings.MACHINE_CACHE_MAX_ENTRIES,
+)
+
+
+# drops the entry here and, when enabled, in every other process
+def invalidate_machine(hardware_id: UUID) -> None:
+    machine_cache.invalidate(hardware_id)
+    if not settings.MACHINE_CACHE_INVALIDATION_ENABLED:
+        return
+    from app.pubsub import publish
+    try:
+        publish(INVALIDATION_CHANNEL, str(hardware_id))
+    except Exception:
+        # the other processes still converge within the TTL
+        logger.exception("machine cache: invalidation broadcast failed")
+
+
+def _on_invalidation(payload: str) -> None:
+    try:
+        machine_cache.invalidate(UUID(payload))
+    except ValueError:
+        machine_cache.clear()
+
+
+def subscribe_invalidations(listener) -> None:
+    listener.subscribe(INVALIDATION_CHANNEL, _on_invalidation)
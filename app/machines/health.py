@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+from typing import Any, Sequence
+
+from sqlalchemy import bindparam, case, cast, func, literal
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, JSONPATH
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.types import Text
+
+# health_indicators paths are dotted keys ("gpu.temp_c"); keys are restricted so
+# they can be embedded in jsonpath expressions and text[] paths verbatim
+_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_-]{0,63}$")
+MAX_DEPTH = 8
+
+# filter op -> jsonpath comparison operator ("exists" has none)
+OPERATORS = {"eq": "==", "ne": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def parse_path(path: str) -> list[str]:
+    keys = path.split(".")
+    if len(keys) > MAX_DEPTH or not all(_KEY.match(k) for k in keys):
+        raise ValueError(f"Invalid health indicator path: {path!r}.")
+    return keys
+
+
+def _jsonpath(keys: Sequence[str]) -> str:
+    return "$" + "".join(f'."{k}"' for k in keys)
+
+
+# `column @@ '$."a"."b" > 80'`, or `column @? '$."a"."b"'` for "exists"; the value is
+# embedded as a JSON literal. GIN (jsonb_path_ops) only extracts `==` from @@ and @?,
+# so "eq" and "exists" are index-assisted; ne / gt / gte / lt / lte are checked row by
+# row, so pair them with a containment filter or back them with an expression index
+def path_predicate(column, path: str, op: str, value: Any = None) -> ColumnElement[bool]:
+    target = _jsonpath(parse_path(path))
+    if op == "exists":
+        return column.op("@?")(cast(literal(target), JSONPATH))
+    if op not in OPERATORS:
+        raise ValueError(f"Unsupported operator: {op!r}.")
+    if value is None or isinstance(value, (dict, list)):
+        raise ValueError(f"Operator {op!r} needs a scalar value.")
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError("Filter values must be finite numbers.")
+    expression = f"{target} {OPERATORS[op]} {json.dumps(value)}"
+    return column.op("@@")(cast(literal(expression), JSONPATH))
+
+
+def containment_predicate(column, document: dict[str, Any]) -> ColumnElement[bool]:
+    return column.op("@>")(bindparam(None, document, type_=JSONB))
+
+
+def _text_path(keys: Sequence[str]):
+    return cast(literal(list(keys), ARRAY(Text)), ARRAY(Text))
+
+
+# SQL expression applying a partial update to the document in place:
+# - updates: {"gpu.temp_c": 71} via jsonb_set
+# - removals: ["gpu.fan"] via the #- operator
+# jsonb_set only creates the last key of a path, so every parent of an updated key is
+# first set to its current value when that is an object, or to {} (parents shallowest
+# first, before any leaf is written). Each step wraps the previous one once, so the
+# statement grows linearly with the patch.
+def patch_expression(column, updates: dict[str, Any], removals: Sequence[str]):
+    leaves = [(parse_path(path), value) for path, value in updates.items()]
+    parents = sorted({tuple(keys[:depth]) for keys, _ in leaves for depth in range(1, len(keys))}, key=len)
+    if any(tuple(keys) in parents for keys, _ in leaves):
+        raise ValueError("A patch cannot set a key and one of its children.")
+
+    empty = cast(literal("{}"), JSONB)
+    doc = func.coalesce(column, empty)
+    for parent in parents:
+        current = column.op("#>")(_text_path(parent))
+        doc = func.jsonb_set(
+            doc,
+            _text_path(parent),
+            case((func.jsonb_typeof(current) == "object", current), else_=empty),
+            True,
+        )
+    for keys, value in leaves:
+        doc = func.jsonb_set(doc, _text_path(keys), bindparam(None, value, type_=JSONB), True)
+    for path in removals:
+        doc = doc.op("#-")(_text_path(parse_path(path)))
+    return doc
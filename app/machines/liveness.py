@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from .cache import invalidate_machine
+from .repository import MachinesRepository
+
+logger = logging.getLogger(__name__)
+
+
+# Liveness of provider agents, fed by POST /machines/{id}/heartbeat
+# - beat() only touches memory; each process remembers when it last wrote an agent's
+#   heartbeat and queues it again once `refresh_interval` (timeout / 3) has passed
+# - every `flush_interval` the queued agents get last_seen_at = now() in
+#   agent_heartbeats (one upsert) and are set online in machines (one UPDATE that
+#   skips rows already online), so steady-state agents cost one narrow row write per
+#   refresh interval, batched across all agents
+# - last-seen state is shared by all workers: an agent may hit any of them, and the
+#   offline sweep only looks at agent_heartbeats
+# - the sweep runs in whichever process takes the advisory lock first and marks
+#   machines offline that are online without a heartbeat in the last `timeout`;
+#   machines left online while no tracker was running are covered the same way
+# - every status change is broadcast to the machine caches (invalidate_machine)
+class LivenessTracker:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        repo: Optional[MachinesRepository] = None,
+        timeout: float = 90.0,
+        flush_interval: float = 5.0,
+        refresh_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.session_factory = session_factory
+        self.repo = repo or MachinesRepository()
+        self.timeout = timeout
+        self.flush_interval = flush_interval
+        # a written heartbeat must be refreshed well before it counts as stale
+        self.refresh_interval = refresh_interval if refresh_interval is not None else timeout / 3
+        self.clock = clock
+        # hardware_id -> when this process last wrote its heartbeat, oldest first
+        self._written: OrderedDict[UUID, float] = OrderedDict()
+        # agents whose heartbeat is written on the next flush
+        self._pending: set[UUID] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def beat(self, hardware_id: UUID) -> None:
+        with self._lock:
+            written = self._written.get(hardware_id)
+            if written is None or self.clock() - written >= self.refresh_interval:
+                self._pending.add(hardware_id)
+
+    # forgets agents this process has not written for a timeout (bounds memory only,
+    # the database decides when they are offline)
+    def expire(self) -> int:
+        cutoff = self.clock() - self.timeout
+        expired = 0
+        with self._lock:
+            while self._written:
+                hardware_id, written = next(iter(self._written.items()))
+                if written >= cutoff:
+                    break
+                del self._written[hardware_id]
+                expired += 1
+        return expired
+
+    # writes queued heartbeats; returns the number of machines that came online
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        if not pending:
+            return 0
+
+        ids = sorted(pending)
+        db = self.session_factory()
+        try:
+            self.repo.touch_heartbeats(db, ids)
+            changed = self.repo.set_agent_status(db, ids, "online")
+            db.commit()
+        except Exception:
+            db.rollback()
+            # retried on the next flush
+            with self._lock:
+                self._pending |= pending
+            raise
+        finally:
+            db.close()
+
+        now = self.clock()
+        with self._lock:
+            for hardware_id in ids:
+                self._written[hardware_id] = now
+                self._written.move_to_end(hardware_id)
+        # cached summaries carry the agent status
+        for hardware_id in changed:
+            invalidate_machine(hardware_id)
+        return len(changed)
+
+    # marks silent agents offline; returns the number of machines that went offline,
+    # 0 when another process is sweeping
+    def sweep(self) -> int:
+        db = self.session_factory()
+        try:
+            if not self.repo.try_lock_liveness_sweep(db):
+                db.rollback()
+                return 0
+            changed = self.repo.expire_agents(db, self.timeout)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        for hardware_id in changed:
+            invalidate_machine(hardware_id)
+        return len(changed)
+
+    def run_once(self) -> None:
+        self.expire()
+        self.flush()
+        self.sweep()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="agent-liveness", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Agent liveness: final flush failed")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Agent liveness: sweep failed")
+
+
+liveness_tracker = LivenessTracker(
+    timeout=settings.AGENT_HEARTBEAT_TIMEOUT_SECONDS,
+    flush_interval=settings.AGENT_LIVENESS_FLUSH_SECONDS,
+)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 from typing import Optional, List, Dict, Any
 
 from sqlalchemy import (
     CheckConstraint,
+    DateTime,
     ForeignKey,
     Index,
     Integer,
@@ -57,5 +59,24 @@ class Machine(Base):
         CheckConstraint("disk_size_gb IS NULL OR disk_size_gb > 0", name="chk_machines_disk_positive"),
         CheckConstraint("provider_agent_status IN ('online', 'offline')", name="chk_provider_agent_status"),
         Index("idx_machines_customer_id", "customer_id"),
+        Index(
+            "idx_machines_health_indicators",
+            "health_indicators",
+            postgresql_using="gin",
+            postgresql_ops={"health_indicators": "jsonb_path_ops"},
+        ),
         Index("idx_machines_status", "provider_agent_status"),
     )
+
+
+# Last heartbeat of each provider agent, shared by all workers; written in batches by
+# the liveness tracker, machines without a recent row are marked offline
+class AgentHeartbeat(Base):
+    __tablename__ = "agent_heartbeats"
+
+    hardware_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("machines.hardware_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,10 +1,12 @@
 
 from __future__ import annotations
 
-from typing import Protocol
+from typing import Iterable, Optional, Protocol
 from uuid import UUID
 
 from fastapi import Depends
+from app.loaders import BatchLoader
+from .models import Machine
 from .service import MachinesService, get_machines_service
 
 # Public facade for machine-related read checks
@@ -12,26 +14,41 @@ class MachinesPublic(Protocol):
     def customer_owns_machine(self, customer_id: UUID, machine_id: UUID) -> bool:
         pass
 
+    def machine_exists(self, machine_id: UUID) -> bool:
+        pass
+
     def get_machine(self, machine_id: UUID):
         pass
 
+    def get_machines(self, machine_ids: Iterable[UUID]) -> dict[UUID, Optional[Machine]]:
+        pass
+
     def list_machines_for_customer(self, customer_id: UUID):
         pass
 
 # Default implementation of MachinesPublic
+# Machines are resolved through a request-scoped BatchLoader: ids requested during the
+# request share IN queries and each machine is fetched at most once
 class MachinesPublicImpl:
     def __init__(self, service: MachinesService):
         self.service = service
+        self.machines = BatchLoader(service.get_machines_by_ids)
 
+    # existence/ownership checks are answered by the service's machine cache (no SQL when warm)
     def customer_owns_machine(self, customer_id: UUID, machine_id: UUID) -> bool:
-        try:
-            machine = self.service.get_machine(machine_id)
-        except ValueError:
-            return False
-        return machine.customer_id == customer_id
+        return self.service.customer_owns_machine(customer_id, machine_id)
+
+    def machine_exists(self, machine_id: UUID) -> bool:
+        return self.service.machine_exists(machine_id)
 
     def get_machine(self, machine_id: UUID):
-        return self.service.get_machine(machine_id)
+        machine = self.machines.load(machine_id)
+        if machine is None:
+            raise ValueError("Machine does not exist.")
+        return machine
+
+    def get_machines(self, machine_ids: Iterable[UUID]) -> dict[UUID, Optional[Machine]]:
+        return self.machines.load_many(machine_ids)
 
     def list_machines_for_customer(self, customer_id: UUID):
         return self.service.list_machines_for_customer(customer_id)
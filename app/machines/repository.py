@@ -1,10 +1,18 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
+from typing import Sequence
 from uuid import UUID
+from sqlalchemy import exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from .models import Machine
+from . import health
+from .models import AgentHeartbeat, Machine
+
+# pg_try_advisory_xact_lock key of the liveness sweep (one process at a time)
+LIVENESS_SWEEP_LOCK = 7_041_001
 from .schemas import MachineCreate
 
 
@@ -34,24 +42,119 @@ class MachinesRepository:
             .first()
         )
 
-    def list_machines_for_customer(self, db: Session, customer_id: UUID) -> list[Machine]:
+    # (hardware_id, customer_id, provider_agent_status) or None; primary-key lookup
+    def get_machine_summary(self, db: Session, machine_id: UUID):
+        return db.execute(
+            select(Machine.hardware_id, Machine.customer_id, Machine.provider_agent_status)
+            .where(Machine.hardware_id == machine_id)
+        ).first()
+
+    def get_machines_by_ids(self, db: Session, machine_ids: Sequence[UUID]) -> list[Machine]:
+        if not machine_ids:
+            return []
         return (
             db.query(Machine)
-            .filter(Machine.customer_id == customer_id)
+            .filter(Machine.hardware_id.in_(list(machine_ids)))
             .all()
         )
 
-    def customer_owns_machine(self, db: Session, customer_id: UUID, machine_id: UUID) -> bool:
+    def list_machines_for_customer(self, db: Session, customer_id: UUID) -> list[Machine]:
         return (
             db.query(Machine)
-            .filter(
-                Machine.hardware_id == machine_id,
-                Machine.customer_id == customer_id,
+            .filter(Machine.customer_id == customer_id)
+            .all()
+        )
+
+    # machines matching every given condition; GIN (jsonb_path_ops) serves @> and equality
+    # (`==`) in @@ / @?, range and `!=` comparisons are evaluated per row
+    def search_by_health(
+        self,
+        db: Session,
+        customer_id: UUID | None,
+        contains: dict | None,
+        filters: Sequence[tuple[str, str, object]],
+        limit: int,
+    ) -> list[Machine]:
+        stmt = select(Machine)
+        if customer_id is not None:
+            stmt = stmt.where(Machine.customer_id == customer_id)
+        if contains:
+            stmt = stmt.where(health.containment_predicate(Machine.health_indicators, contains))
+        for path, op, value in filters:
+            stmt = stmt.where(health.path_predicate(Machine.health_indicators, path, op, value))
+        return list(db.scalars(stmt.order_by(Machine.hardware_id).limit(limit)))
+
+    # applies a partial health_indicators update in one UPDATE; returns the new document,
+    # or None when the machine does not exist or belongs to someone else
+    def patch_health_indicators(
+        self,
+        db: Session,
+        machine_id: UUID,
+        customer_id: UUID,
+        updates: dict,
+        removals: Sequence[str],
+    ):
+        result = db.execute(
+            update(Machine)
+            .where(Machine.hardware_id == machine_id, Machine.customer_id == customer_id)
+            .values(health_indicators=health.patch_expression(Machine.health_indicators, updates, removals))
+            .returning(Machine.health_indicators)
+            .execution_options(synchronize_session=False)
+        ).first()
+        db.commit()
+        return None if result is None else (result[0] or {})
+
+    # bulk status transition, rows already in `status` are not written; returns changed ids
+    def set_agent_status(self, db: Session, machine_ids: Sequence[UUID], status: str) -> list[UUID]:
+        if not machine_ids:
+            return []
+        result = db.execute(
+            update(Machine)
+            .where(
+                Machine.hardware_id.in_(list(machine_ids)),
+                Machine.provider_agent_status != status,
+            )
+            .values(provider_agent_status=status)
+            .returning(Machine.hardware_id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars())
+
+    # upserts last_seen_at = now() for the given machines (deleted ones are skipped)
+    def touch_heartbeats(self, db: Session, machine_ids: Sequence[UUID]) -> None:
+        if not machine_ids:
+            return
+        stmt = insert(AgentHeartbeat).from_select(
+            ["hardware_id", "last_seen_at"],
+            select(Machine.hardware_id, func.now()).where(Machine.hardware_id.in_(list(machine_ids))),
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[AgentHeartbeat.hardware_id],
+                set_={"last_seen_at": stmt.excluded.last_seen_at},
             )
-            .count()
-            > 0
         )
 
+    # False when another process holds the sweep lock (released at commit/rollback)
+    def try_lock_liveness_sweep(self, db: Session) -> bool:
+        return bool(db.scalar(select(func.pg_try_advisory_xact_lock(LIVENESS_SWEEP_LOCK))))
+
+    # marks online machines without a heartbeat in the last `timeout` seconds offline;
+    # returns changed ids
+    def expire_agents(self, db: Session, timeout: float) -> list[UUID]:
+        fresh = exists().where(
+            AgentHeartbeat.hardware_id == Machine.hardware_id,
+            AgentHeartbeat.last_seen_at > func.now() - timedelta(seconds=timeout),
+        )
+        result = db.execute(
+            update(Machine)
+            .where(Machine.provider_agent_status == "online", ~fresh)
+            .values(provider_agent_status="offline")
+            .returning(Machine.hardware_id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars())
+
     def delete_machine(self, db: Session, machine: Machine) -> None:
         db.delete(machine)
         db.commit()
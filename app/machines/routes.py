@@ -1,4 +1,5 @@
 
+from typing import Any, Dict
 from uuid import UUID
 
 from fastapi import Depends, APIRouter, HTTPException
@@ -6,7 +7,7 @@ from fastapi import Depends, APIRouter, HTTPException
 from app.auth import get_current_user
 from app.users import User
 
-from .schemas import MachineCreate, MachineRead
+from .schemas import HealthIndicatorsPatch, MachineCreate, MachineHealthQuery, MachineRead
 from .service import MachinesService, get_machines_service
 
 router = APIRouter()
@@ -54,6 +55,53 @@ def delete_machine(
         raise
 
 
+# filters the caller's machines by health_indicators (containment and path comparisons)
+@router.post("/health/search", response_model=list[MachineRead])
+def search_machines_by_health(
+    query: MachineHealthQuery,
+    user: User = Depends(get_current_user),
+    service: MachinesService = Depends(get_machines_service),
+):
+    try:
+        return service.search_by_health(user.customer_id, query)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
+# partial update of health_indicators (jsonb_set), returns the updated document
+@router.patch("/{machine_id:uuid}/health", response_model=Dict[str, Any])
+def patch_health_indicators(
+    machine_id: UUID,
+    patch: HealthIndicatorsPatch,
+    user: User = Depends(get_current_user),
+    service: MachinesService = Depends(get_machines_service),
+):
+    try:
+        return service.patch_health_indicators(machine_id, user.customer_id, patch)
+    except PermissionError:
+        raise HTTPException(403, "Not allowed")
+    except ValueError as e:
+        if "does not exist" in str(e):
+            raise HTTPException(404, "Machine not found")
+        raise HTTPException(400, str(e))
+
+
+# provider agents call this every few seconds; last-seen times and status
+# transitions reach the database in batches (see liveness.py)
+@router.post("/{machine_id:uuid}/heartbeat", status_code=204)
+def heartbeat(
+    machine_id: UUID,
+    user: User = Depends(get_current_user),
+    service: MachinesService = Depends(get_machines_service),
+):
+    try:
+        service.record_heartbeat(machine_id, customer_id=user.customer_id)
+    except ValueError:
+        raise HTTPException(404, "Machine not found")
+    except PermissionError:
+        raise HTTPException(403, "Not allowed")
+
+
 @router.post("/", response_model=MachineRead, status_code=201)
 def create_machine(
     machine: MachineCreate,
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field, ConfigDict
 from uuid import UUID
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Literal, Union
 
 # API contract models (DTOs) for machine endpoints
 # These schemas define external endpoint contract
@@ -25,6 +25,26 @@ class MachineCreate(BaseModel):
     health_indicators: Optional[Dict[str, Any]] = None
 
 
+# health_indicators queries: containment (`@>`) and path filters, e.g.
+# {"contains": {"ecc": {"uncorrected": 0}}, "filters": [{"path": "gpu.temp_c", "op": "gt", "value": 80}]}
+class HealthFilter(BaseModel):
+    path: str = Field(..., max_length=512, description="Dotted key path, e.g. gpu.temp_c")
+    op: Literal["eq", "ne", "gt", "gte", "lt", "lte", "exists"]
+    value: Optional[Union[bool, int, float, str]] = None
+
+
+class MachineHealthQuery(BaseModel):
+    contains: Optional[Dict[str, Any]] = None
+    filters: list[HealthFilter] = Field(default_factory=list, max_length=20)
+    limit: int = Field(100, ge=1, le=1000)
+
+
+# partial update of health_indicators; keys are dotted paths
+class HealthIndicatorsPatch(BaseModel):
+    set: Dict[str, Any] = Field(default_factory=dict, max_length=100)
+    remove: list[str] = Field(default_factory=list, max_length=100)
+
+
 class MachineRead(BaseModel):
     hardware_id: UUID
     customer_id: UUID
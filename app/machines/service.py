@@ -1,6 +1,7 @@
 
 from __future__ import annotations
 
+from typing import Optional, Sequence
 from uuid import UUID
 
 from fastapi import Depends
@@ -8,8 +9,10 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from .repository import MachinesRepository
-from .schemas import MachineCreate
+from .schemas import HealthIndicatorsPatch, MachineCreate, MachineHealthQuery
 from .models import Machine
+from .cache import MISSING, MachineSummary, invalidate_machine, machine_cache
+from .liveness import liveness_tracker
 
 # Service layer for machine-related business operations
 class MachinesService:
@@ -23,13 +26,75 @@ class MachinesService:
             raise ValueError("Machine does not exist.")
         return machine
 
+    # {hardware_id: machine} for the ids that exist, one query
+    def get_machines_by_ids(self, machine_ids: Sequence[UUID]) -> dict[UUID, Machine]:
+        machines = self.machine_repo.get_machines_by_ids(self.db, machine_ids)
+        return {m.hardware_id: m for m in machines}
+
+    # owner and agent status, served from the process-wide cache when possible
+    def get_machine_summary(self, machine_id: UUID) -> Optional[MachineSummary]:
+        cached = machine_cache.get(machine_id)
+        if cached is MISSING:
+            return None
+        if cached is not None:
+            return cached
+
+        row = self.machine_repo.get_machine_summary(self.db, machine_id)
+        summary = MachineSummary(*row) if row is not None else None
+        machine_cache.put(machine_id, summary)
+        return summary
+
+    def machine_exists(self, machine_id: UUID) -> bool:
+        return self.get_machine_summary(machine_id) is not None
+
+    def customer_owns_machine(self, customer_id: UUID, machine_id: UUID) -> bool:
+        summary = self.get_machine_summary(machine_id)
+        return summary is not None and summary.customer_id == customer_id
+
+    def search_by_health(self, customer_id: UUID, query: MachineHealthQuery) -> list[Machine]:
+        if not query.contains and not query.filters:
+            raise ValueError("Provide `contains` and/or `filters`.")
+        return self.machine_repo.search_by_health(
+            self.db,
+            customer_id,
+            query.contains,
+            [(f.path, f.op, f.value) for f in query.filters],
+            query.limit,
+        )
+
+    # agents patch individual indicators; the document is never rewritten from the client
+    def patch_health_indicators(self, machine_id: UUID, customer_id: UUID, patch: HealthIndicatorsPatch) -> dict:
+        if not patch.set and not patch.remove:
+            raise ValueError("Nothing to update.")
+        document = self.machine_repo.patch_health_indicators(
+            self.db, machine_id, customer_id, patch.set, patch.remove
+        )
+        if document is None:
+            # tell a missing machine from a foreign one
+            if not self.machine_exists(machine_id):
+                raise ValueError("Machine does not exist.")
+            raise PermissionError("You do not own this machine.")
+        return document
+
+    # agent heartbeat: ownership from the machine cache, last-seen written in batches (no SQL per heartbeat)
+    def record_heartbeat(self, machine_id: UUID, customer_id: UUID) -> None:
+        summary = self.get_machine_summary(machine_id)
+        if summary is None:
+            raise ValueError("Machine does not exist.")
+        if summary.customer_id != customer_id:
+            raise PermissionError("You do not own this machine.")
+        liveness_tracker.beat(machine_id)
+
     def list_machines_for_customer(self, customer_id: UUID) -> list[Machine]:
         return self.machine_repo.list_machines_for_customer(self.db, customer_id)
 
     def create_machine(self, payload: MachineCreate) -> Machine:
         if payload.customer_id is None:
             raise ValueError("customer_id is required.")
-        return self.machine_repo.create_machine(self.db, payload)
+        machine = self.machine_repo.create_machine(self.db, payload)
+        # replaces a cached "does not exist" answer
+        invalidate_machine(machine.hardware_id)
+        return machine
 
     # ownership check: only the owner can delete the machine
     def delete_machine(self, machine_id: UUID, customer_id: UUID):
@@ -39,6 +104,7 @@ class MachinesService:
         if machine.customer_id != customer_id:
             raise ValueError("You do not own this machine.")
         self.machine_repo.delete_machine(self.db, machine)
+        invalidate_machine(machine_id)
 
 # Dependency provider for MachinesService
 def get_machines_service(db: Session = Depends(get_db)) -> MachinesService:
@@ -12,9 +12,26 @@ from app.machines import router as machines_router
 from app.payments import router as payments_router
 from app.benchmarks import router as benchmarks_router
 from app.metrics import router as metrics_router
+from app.payouts import router as payouts_router
+from app.fleet import router as fleet_router
+from app.data_wipes import data_wipe_scheduler, router as data_wipes_router
 
 
 from app.auth import optional_user
+from app.config import settings
+from app.database import engine
+from app.payments.ports.stripe_http_adapter import close_shared_http_client
+from app.payments.worker import payment_event_worker
+from app.machines.cache import subscribe_invalidations as subscribe_machine_cache_invalidations
+from app.machines.liveness import liveness_tracker
+from app.metrics.stream import subscribe_remote as subscribe_metric_samples
+from app.pubsub import pg_listener
+from app.middleware import (
+    CompressionMiddleware,
+    QueryProfilerMiddleware,
+    RequestDecompressionMiddleware,
+    install_query_listeners,
+)
 
 
 
@@ -38,6 +55,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# agents may upload compressed metric batches (Content-Encoding: gzip / br / zstd)
+app.add_middleware(
+    RequestDecompressionMiddleware,
+    paths=[r"^/api/v1/metrics/machines/[^/]+/ingest/batch$"],
+    max_size=settings.REQUEST_DECOMPRESSION_MAX_BYTES,
+)
+
+# negotiated response compression for catalogues, booking lists and metric histories
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+# opt-in SQL profiler: flags repeated statements (N+1) and routes over their query budget
+if settings.QUERY_PROFILER_ENABLED:
+    install_query_listeners(engine)
+    app.add_middleware(
+        QueryProfilerMiddleware,
+        mode=settings.QUERY_PROFILER_MODE,
+        repeat_threshold=settings.QUERY_PROFILER_REPEAT_THRESHOLD,
+        max_queries=settings.QUERY_PROFILER_MAX_QUERIES,
+        budgets=settings.QUERY_PROFILER_BUDGETS,
+    )
+
 
 app.include_router(machines_router, prefix="/api/v1/machines", tags=["machines"])
 app.include_router(benchmarks_router, prefix="/api/v1/benchmarks", tags=["benchmarks"])
@@ -45,6 +84,51 @@ app.include_router(metrics_router, prefix="/api/v1/metrics", tags=["metrics"])
 app.include_router(listings_router, prefix="/api/v1/listings", tags=["listings"])
 app.include_router(bookings_router, prefix="/api/v1/bookings", tags=["bookings"])
 app.include_router(payments_router, prefix="/api/v1/payments", tags=["payments"])
+app.include_router(payouts_router, prefix="/api/v1/payouts", tags=["payouts"])
+app.include_router(fleet_router, prefix="/api/v1/fleet", tags=["fleet"])
+app.include_router(data_wipes_router, prefix="/api/v1/data-wipes", tags=["data-wipes"])
+
+
+# applies processor webhook events recorded by /api/v1/payments/webhook
+@app.on_event("startup")
+def start_payment_event_worker():
+    if settings.PAYMENT_EVENTS_WORKER_ENABLED:
+        payment_event_worker.start()
+
+
+# flushes provider agent heartbeats and marks silent agents offline
+@app.on_event("startup")
+def start_liveness_tracker():
+    if settings.AGENT_LIVENESS_ENABLED:
+        liveness_tracker.start()
+
+
+# wipes machines after their bookings end
+@app.on_event("startup")
+def start_data_wipe_scheduler():
+    if settings.DATA_WIPES_SCHEDULER_ENABLED:
+        data_wipe_scheduler.start()
+
+
+# cross-process cache invalidation and live metric fan-out over pg LISTEN/NOTIFY
+@app.on_event("startup")
+def start_pg_listener():
+    if settings.MACHINE_CACHE_INVALIDATION_ENABLED:
+        subscribe_machine_cache_invalidations(pg_listener)
+    if settings.METRICS_STREAM_CROSS_WORKER:
+        subscribe_metric_samples(pg_listener)
+    if settings.MACHINE_CACHE_INVALIDATION_ENABLED or settings.METRICS_STREAM_CROSS_WORKER:
+        pg_listener.start()
+
+
+# release pooled keep-alive connections to the payment processor
+@app.on_event("shutdown")
+async def close_payment_client():
+    payment_event_worker.stop()
+    liveness_tracker.stop()
+    data_wipe_scheduler.stop()
+    pg_listener.stop()
+    await close_shared_http_client()
 
 
 @app.get("/api/v1/health")
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import base64
+import math
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+# Columnar wire format for metric series (GET /metrics/machines/{id}?format=columnar)
+#
+# {
+#   "hardware_id": "...", "count": 3, "time_unit": "us", "packing": "json" | "float32",
+#   "t0": 1735689600000000,          # first recorded_at, microseconds since the Unix epoch
+#   "dt": [0, 60000000, 60000000],   # delta to the previous timestamp (first is 0)
+#   "fields": {"gpu_util": [...], ...}
+# }
+#
+# With packing="float32" every field is a base64 string of little-endian float32
+# values and missing values are NaN. Timestamps stay exact (integer microseconds).
+
+SERIES_FIELDS = ("gpu_util", "cpu_util", "mem_used_gb", "net_rx_mb", "net_tx_mb")
+PACKINGS = ("json", "float32")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+
+def _pack_float32(values: Sequence[Optional[float]]) -> str:
+    packed = array("f", (math.nan if v is None else v for v in values))
+    if packed.itemsize != 4:
+        raise RuntimeError("float32 packing requires a 4-byte C float.")
+    return base64.b64encode(_little_endian(packed).tobytes()).decode("ascii")
+
+
+def _unpack_float32(data: str) -> list[Optional[float]]:
+    packed = array("f")
+    packed.frombytes(base64.b64decode(data))
+    return [None if math.isnan(v) else v for v in _little_endian(packed)]
+
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+# rows are tuples ordered as `columns`, which must contain recorded_at and SERIES_FIELDS
+def encode_columnar(
+    hardware_id: UUID,
+    columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    packing: str = "json",
+) -> dict[str, Any]:
+    if packing not in PACKINGS:
+        raise ValueError(f"packing must be one of: {', '.join(PACKINGS)}.")
+
+    transposed = dict(zip(columns, zip(*rows))) if rows else {c: () for c in columns}
+
+    micros = [(ts - _EPOCH) // _US for ts in transposed["recorded_at"]]
+    deltas = [b - a for a, b in zip([micros[0]] + micros[:-1], micros)] if micros else []
+
+    fields: dict[str, Any] = {}
+    for name in SERIES_FIELDS:
+        values = transposed[name]
+        fields[name] = _pack_float32(values) if packing == "float32" else list(values)
+
+    return {
+        "hardware_id": hardware_id,
+        "count": len(rows),
+        "time_unit": "us",
+        "packing": packing,
+        "t0": micros[0] if micros else None,
+        "dt": deltas,
+        "fields": fields,
+    }
+
+
+# reference decoder (for clients and round-trip checks): back to row dicts
+def decode_columnar(payload: dict[str, Any]) -> list[dict[str, Any]]:
+    if not payload["count"]:
+        return []
+
+    timestamps = [
+        _EPOCH + t * _US for t in accumulate(payload["dt"], initial=payload["t0"])
+    ][1:]
+    fields = {
+        name: _unpack_float32(values) if payload["packing"] == "float32" else values
+        for name, values in payload["fields"].items()
+    }
+    return [
+        {"recorded_at": ts, **{name: fields[name][i] for name in fields}}
+        for i, ts in enumerate(timestamps)
+    ]
@@ -1,5 +1,5 @@
 from uuid import uuid4
-from sqlalchemy import Column, DateTime, Float, ForeignKey
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -33,3 +33,8 @@ class MetricSample(Base):
     net_tx_mb = Column(Float, nullable=True)
 
     machine = relationship("Machine", back_populates="metric_samples")
+
+    __table_args__ = (
+        # latest sample / time window per machine (fleet overview, live snapshot)
+        Index("idx_metric_samples_hardware_recorded", "hardware_id", recorded_at.desc()),
+    )
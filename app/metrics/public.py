@@ -21,6 +21,13 @@ class MetricsPublic(Protocol):
     def ingest_raw_metrics(self, hardware_id: UUID, raw: dict, customer_id: UUID):
         pass
 
+    def list_metric_rows_for_machine(
+        self,
+        hardware_id: UUID,
+        query: MetricsQueryParams,
+    ) -> tuple[tuple[str, ...], list[tuple]]:
+        pass
+
 # Concrete implementation of MetricsPublic using the MetricsService
 class MetricsPublicImpl:
     def __init__(self, service: MetricsService):
@@ -39,6 +46,13 @@ class MetricsPublicImpl:
     def ingest_raw_metrics(self, hardware_id: UUID, raw: dict, customer_id: UUID):
         return self.service.ingest_raw_metrics(hardware_id, raw, customer_id)
 
+    def list_metric_rows_for_machine(
+        self,
+        hardware_id: UUID,
+        query: MetricsQueryParams,
+    ) -> tuple[tuple[str, ...], list[tuple]]:
+        return self.service.list_machine_metric_rows(hardware_id, query)
+
 # Dependency injection provider for MetricsService interface
 def get_metrics_public(
     service: MetricsService = Depends(get_metrics_service),
@@ -1,10 +1,10 @@
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence
 from uuid import UUID
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select, desc
+from sqlalchemy import insert, select, desc, Select
 
 from .models import MetricSample
 
@@ -35,6 +35,32 @@ class MetricsRepository:
         db.refresh(sample)
         return sample
 
+    # bulk insert in a single executemany round-trip (no per-row refresh)
+    def create_samples(self, db: Session, rows: list[dict[str, Any]]) -> int:
+        if not rows:
+            return 0
+        db.execute(insert(MetricSample), rows)
+        db.commit()
+        return len(rows)
+
+    def _window(
+        self,
+        stmt: Select,
+        hardware_id: UUID,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        limit: Optional[int],
+    ) -> Select:
+        stmt = stmt.where(MetricSample.hardware_id == hardware_id).order_by(MetricSample.recorded_at)
+
+        if start:
+            stmt = stmt.where(MetricSample.recorded_at >= start)
+        if end:
+            stmt = stmt.where(MetricSample.recorded_at <= end)
+        if limit:
+            stmt = stmt.limit(limit)
+        return stmt
+
     def list_samples(
         self,
         db: Session,
@@ -43,19 +69,35 @@ class MetricsRepository:
         end: Optional[datetime] = None,
         limit: Optional[int] = None,
     ) -> List[MetricSample]:
+        stmt = self._window(select(MetricSample), hardware_id, start, end, limit)
+        return list(db.scalars(stmt).all())
+
+    # same window as list_samples, but returns plain tuples of the requested columns
+    # (no ORM identity map / entity construction), used by the fast list serialisation path
+    def list_sample_rows(
+        self,
+        db: Session,
+        columns: Sequence[str],
+        hardware_id: UUID,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[tuple[Any, ...]]:
+        stmt = self._window(
+            select(*(getattr(MetricSample, c) for c in columns)), hardware_id, start, end, limit
+        )
+        return [tuple(row) for row in db.execute(stmt).all()]
+
+    # latest sample of each machine in one DISTINCT ON query (machines without samples are absent)
+    def get_latest_samples(self, db: Session, hardware_ids: Sequence[UUID]) -> List[MetricSample]:
+        if not hardware_ids:
+            return []
         stmt = (
             select(MetricSample)
-            .where(MetricSample.hardware_id == hardware_id)
-            .order_by(MetricSample.recorded_at)
+            .where(MetricSample.hardware_id.in_(list(hardware_ids)))
+            .distinct(MetricSample.hardware_id)
+            .order_by(MetricSample.hardware_id, desc(MetricSample.recorded_at))
         )
-
-        if start:
-            stmt = stmt.where(MetricSample.recorded_at >= start)
-        if end:
-            stmt = stmt.where(MetricSample.recorded_at <= end)
-        if limit:
-            stmt = stmt.limit(limit)
-
         return list(db.scalars(stmt).all())
 
     def get_latest_sample(
@@ -1,11 +1,26 @@
 
+from typing import Literal, Union
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
+from .columnar import encode_columnar
 from .service import MetricsService, get_metrics_service
-from .schemas import MetricSampleCreate, MetricsQueryParams, MetricSampleRead, MetricSampleListItem
+from .stream import metrics_broker, sse_stream
+from .schemas import (
+    MetricBatchIngestResult,
+    MetricSampleBatch,
+    MetricSampleCreate,
+    MetricsQueryParams,
+    MetricSampleRead,
+    MetricSampleListItem,
+    MetricSeriesColumnar,
+)
 
 from app.auth import get_current_user
+from app.config import settings
+from app.serialization import FastJSONResponse, rows_response
 from app.users import User
 
 router = APIRouter()
@@ -34,22 +49,100 @@ def ingest_metric_sample(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
 
 
+# Accepts Content-Encoding: gzip / br / zstd request bodies (see RequestDecompressionMiddleware)
+@router.post(
+    "/machines/{hardware_id}/ingest/batch",
+    response_model=MetricBatchIngestResult,
+    summary="Submit a batch of metric samples for a machine",
+)
+def ingest_metric_batch(
+    hardware_id: UUID,
+    payload: MetricSampleBatch,
+    service: MetricsService = Depends(get_metrics_service),
+    user: User = Depends(get_current_user),
+):
+    try:
+        return service.ingest_metrics_batch(
+            hardware_id=hardware_id,
+            payload=payload,
+            customer_id=user.customer_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+
 @router.get(
     "/machines/{hardware_id}",
-    response_model=list[MetricSampleListItem],
+    # row list by default, MetricSeriesColumnar with format=columnar
+    response_model=Union[list[MetricSampleListItem], MetricSeriesColumnar],
+    response_class=FastJSONResponse,
     summary="List metrics for a machine",
 )
 def list_metrics_for_machine(
     hardware_id: UUID,
     query: MetricsQueryParams = Depends(),
+    series_format: Literal["rows", "columnar"] = Query(
+        "rows",
+        alias="format",
+        description="'columnar' returns parallel arrays per field with delta-encoded timestamps",
+    ),
+    packing: Literal["json", "float32"] = Query(
+        "json",
+        description="columnar only: 'float32' sends each field as base64 little-endian float32 (NaN = null)",
+    ),
     user: User = Depends(get_current_user),
     service: MetricsService = Depends(get_metrics_service),
 ):
     try:
-        return service.list_machine_metrics(hardware_id, query)
+        columns, rows = service.list_machine_metric_rows(hardware_id, query)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
+    if series_format == "columnar":
+        return FastJSONResponse(encode_columnar(hardware_id, columns, rows, packing=packing))
+    return rows_response(columns, rows)
+
+
+# Server-sent events: one "sample" event per machine with its latest sample, then
+# every newly ingested sample of the subscribed machines (replaces polling /latest)
+@router.get("/stream", summary="Stream live metric samples for a set of machines")
+async def stream_metrics(
+    request: Request,
+    hardware_id: list[UUID] = Query(..., description="Machines to subscribe to (repeat the parameter)"),
+    user: User = Depends(get_current_user),
+    service: MetricsService = Depends(get_metrics_service),
+):
+    hardware_ids = list(dict.fromkeys(hardware_id))
+    if len(hardware_ids) > settings.METRICS_STREAM_MAX_MACHINES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.METRICS_STREAM_MAX_MACHINES} machines per stream.",
+        )
+
+    # subscribe before reading the snapshot so no sample falls in between
+    subscription = metrics_broker.subscribe(hardware_ids)
+    try:
+        snapshot = await run_in_threadpool(service.latest_samples_for, hardware_ids)
+    except ValueError as e:
+        metrics_broker.unsubscribe(subscription)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BaseException:
+        metrics_broker.unsubscribe(subscription)
+        raise
+
+    return StreamingResponse(
+        sse_stream(
+            subscription,
+            snapshot,
+            request.is_disconnected,
+            keepalive=settings.METRICS_STREAM_KEEPALIVE_SECONDS,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 @router.get(
     "/machines/{hardware_id}/latest",
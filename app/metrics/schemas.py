@@ -1,9 +1,9 @@
 
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Literal, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 
 # API contract models (DTOs) for metric endpoints
 class MetricSampleCreate(BaseModel):
@@ -13,6 +13,14 @@ class MetricSampleCreate(BaseModel):
                     "If not provided, backend will set current time.",
     )
 
+    # naive timestamps are taken as UTC, so samples of one batch always compare
+    @field_validator("recorded_at", mode="after")
+    @classmethod
+    def ensure_timezone_aware(cls, v: Optional[datetime]) -> Optional[datetime]:
+        if v is not None and v.tzinfo is None:
+            return v.replace(tzinfo=timezone.utc)
+        return v
+
     gpu_util: Optional[float] = Field(None, ge=0, le=100, description="GPU utilization percentage")
     cpu_util: Optional[float] = Field(None, ge=0, le=100, description="CPU utilization percentage")
     mem_used_gb: Optional[float] = Field(None, ge=0, description="Used RAM in GB")
@@ -20,6 +28,15 @@ class MetricSampleCreate(BaseModel):
     net_tx_mb: Optional[float] = Field(None, ge=0, description="Transmitted MB during sampling interval")
 
 
+class MetricSampleBatch(BaseModel):
+    samples: list[MetricSampleCreate] = Field(..., min_length=1, max_length=5000)
+
+
+class MetricBatchIngestResult(BaseModel):
+    hardware_id: UUID
+    ingested: int
+
+
 class MetricSampleRead(BaseModel):
     id: UUID
     hardware_id: UUID
@@ -45,6 +62,20 @@ class MetricSampleListItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# GET /metrics/machines/{id}?format=columnar (see columnar.py)
+class MetricSeriesColumnar(BaseModel):
+    hardware_id: UUID
+    count: int
+    time_unit: Literal["us"]
+    packing: Literal["json", "float32"]
+    t0: Optional[int] = Field(..., description="First recorded_at in microseconds since the Unix epoch")
+    dt: list[int] = Field(..., description="Delta to the previous timestamp, the first is 0")
+    fields: dict[str, Union[list[Optional[float]], str]] = Field(
+        ...,
+        description="Values per field; with packing=float32 a base64 string of little-endian float32 (NaN = null)",
+    )
+
+
 class MetricsQueryParams(BaseModel):
     start: Optional[datetime] = Field(None, description="Return metrics recorded on/after this timestamp")
     end: Optional[datetime] = Field(None, description="Return metrics recorded on/before this timestamp")
@@ -1,12 +1,17 @@
 
+import logging
 from fastapi import Depends
 from datetime import datetime, timezone
-from typing import Optional
-from uuid import UUID
+from typing import Optional, Sequence
+from uuid import UUID, uuid4
 from sqlalchemy.orm import Session
 
+from app.serialization import schema_columns
 from .repository import MetricsRepository
+from .stream import metrics_broker
 from .schemas import (
+    MetricBatchIngestResult,
+    MetricSampleBatch,
     MetricSampleCreate,
     MetricSampleRead,
     MetricSampleListItem,
@@ -16,6 +21,8 @@ from .schemas import (
 from app.machines import MachinesPublic, get_machines_public
 from app.database import get_db
 
+logger = logging.getLogger(__name__)
+
 
 class MetricsService:
     def __init__(
@@ -28,6 +35,23 @@ class MetricsService:
         self.repo = repo
         self.machines_public = machines_public
 
+    # hot path: served from the machine cache; a failed check is resolved into a
+    # missing machine (404) or a foreign one (403)
+    def _ensure_owner(self, customer_id: UUID, hardware_id: UUID) -> None:
+        if self.machines_public.customer_owns_machine(customer_id=customer_id, machine_id=hardware_id):
+            return
+        if not self.machines_public.machine_exists(hardware_id):
+            raise ValueError("Machine does not exist.")
+        raise PermissionError("User does not own machine.")
+
+    # live delivery of the newest sample is best effort: the samples are already
+    # committed, so a failure here must not fail (and get retried into duplicates)
+    def _publish_latest(self, samples: Sequence[dict]) -> None:
+        try:
+            metrics_broker.publish(max(samples, key=lambda s: s["recorded_at"]))
+        except Exception:
+            logger.exception("Metrics: live publish failed")
+
     # ingests a validated metric sample for a machine
     def ingest_metrics(
         self,
@@ -35,16 +59,8 @@ class MetricsService:
         payload: MetricSampleCreate,
         customer_id: UUID,
     ) -> MetricSampleRead:
-        machine = self.machines_public.get_machine(hardware_id)
-        if not machine:
-            raise ValueError("Machine does not exist.")
-
         # only machine owner can ingest metrics
-        if not self.machines_public.customer_owns_machine(
-            customer_id=customer_id,
-            machine_id=hardware_id,
-        ):
-            raise PermissionError("User does not own machine.")
+        self._ensure_owner(customer_id, hardware_id)
 
         # if client doesn't provide a timestamp, record ingestion time in UTC
         recorded_at = payload.recorded_at or datetime.now(timezone.utc)
@@ -60,7 +76,37 @@ class MetricsService:
             net_tx_mb=payload.net_tx_mb,
         )
 
-        return MetricSampleRead.model_validate(sample)
+        result = MetricSampleRead.model_validate(sample)
+        self._publish_latest([result.model_dump()])
+        return result
+
+    # ingests many samples for one machine with a single ownership check and one bulk insert
+    def ingest_metrics_batch(
+        self,
+        hardware_id: UUID,
+        payload: MetricSampleBatch,
+        customer_id: UUID,
+    ) -> MetricBatchIngestResult:
+        self._ensure_owner(customer_id, hardware_id)
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": uuid4(),
+                "hardware_id": hardware_id,
+                "recorded_at": s.recorded_at or now,
+                "gpu_util": s.gpu_util,
+                "cpu_util": s.cpu_util,
+                "mem_used_gb": s.mem_used_gb,
+                "net_rx_mb": s.net_rx_mb,
+                "net_tx_mb": s.net_tx_mb,
+            }
+            for s in payload.samples
+        ]
+        ingested = self.repo.create_samples(self.db, rows)
+        # live subscribers only need the newest sample of the batch
+        self._publish_latest(rows)
+        return MetricBatchIngestResult(hardware_id=hardware_id, ingested=ingested)
 
     # adapter for raw payloads (best-effort mapping to MetricSampleCreate)
     def ingest_raw_metrics(self, hardware_id: UUID, raw: dict, customer_id: UUID):
@@ -80,8 +126,7 @@ class MetricsService:
         hardware_id: UUID,
         query: MetricsQueryParams,
     ) -> list[MetricSampleListItem]:
-        machine = self.machines_public.get_machine(hardware_id)
-        if not machine:
+        if not self.machines_public.machine_exists(hardware_id):
             raise ValueError("Machine does not exist.")
 
         samples = self.repo.list_samples(
@@ -94,13 +139,32 @@ class MetricsService:
 
         return [MetricSampleListItem.model_validate(s) for s in samples]
 
+    # fast path for list_machine_metrics: plain row tuples in MetricSampleListItem field order
+    def list_machine_metric_rows(
+        self,
+        hardware_id: UUID,
+        query: MetricsQueryParams,
+    ) -> tuple[tuple[str, ...], list[tuple]]:
+        if not self.machines_public.machine_exists(hardware_id):
+            raise ValueError("Machine does not exist.")
+
+        columns = schema_columns(MetricSampleListItem)
+        rows = self.repo.list_sample_rows(
+            self.db,
+            columns,
+            hardware_id=hardware_id,
+            start=query.start,
+            end=query.end,
+            limit=query.limit,
+        )
+        return columns, rows
+
     # returns the most recent metric sample for a machine (or None if no samples exist)
     def get_latest_metrics(
         self,
         hardware_id: UUID,
     ) -> Optional[MetricSampleRead]:
-        machine = self.machines_public.get_machine(hardware_id)
-        if not machine:
+        if not self.machines_public.machine_exists(hardware_id):
             raise ValueError("Machine does not exist.")
 
         sample = self.repo.get_latest_sample(self.db, hardware_id)
@@ -109,6 +173,14 @@ class MetricsService:
 
         return MetricSampleRead.model_validate(sample)
 
+    # initial state for a live metrics subscription; unknown machines raise ValueError
+    def latest_samples_for(self, hardware_ids: Sequence[UUID]) -> list[dict]:
+        missing = [h for h in hardware_ids if not self.machines_public.machine_exists(h)]
+        if missing:
+            raise ValueError(f"Machine does not exist: {missing[0]}")
+        samples = self.repo.get_latest_samples(self.db, hardware_ids)
+        return [MetricSampleRead.model_validate(s).model_dump() for s in samples]
+
 # Dependency provider for MetricsService
 def get_metrics_service(
     db: Session = Depends(get_db),
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+from uuid import UUID
+
+import orjson
+
+from app.config import settings
+from app.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "metric_samples"
+
+
+# Live metric push for dashboards (GET /metrics/stream, server-sent events)
+# - the ingest path publishes each new sample (the latest one per batch) to the broker
+# - subscriptions hold a bounded asyncio queue on the event loop that serves the
+#   stream; publishers run on other threads (sync routes, pg listener) and hand
+#   messages over with call_soon_threadsafe
+# - a slow client drops its oldest queued samples instead of growing without bound
+# - cross-worker fan-out (optional): samples are sent as pg NOTIFY and every worker's
+#   listener republishes them locally, including the sending worker's
+
+
+class Subscription:
+    def __init__(self, hardware_ids: frozenset[UUID], loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.hardware_ids = hardware_ids
+        self.loop = loop
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    # runs on the subscription's event loop
+    def _offer(self, message: bytes) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    def deliver(self, message: bytes) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._offer, message)
+        except RuntimeError:
+            # loop already closed, the stream is gone
+            pass
+
+
+class MetricsBroker:
+    def __init__(self, queue_size: int = 256, publish_remote: Optional[Callable[[bytes], None]] = None):
+        self.queue_size = queue_size
+        self.publish_remote = publish_remote
+        self._by_machine: dict[UUID, set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, hardware_ids: Iterable[UUID]) -> Subscription:
+        subscription = Subscription(frozenset(hardware_ids), asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            for hardware_id in subscription.hardware_ids:
+                self._by_machine[hardware_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for hardware_id in subscription.hardware_ids:
+                subscribers = self._by_machine.get(hardware_id)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_machine[hardware_id]
+
+    def has_subscribers(self, hardware_id: UUID) -> bool:
+        return hardware_id in self._by_machine
+
+    # sample: MetricSampleRead-shaped dict
+    def publish(self, sample: dict[str, Any]) -> None:
+        hardware_id = sample["hardware_id"]
+        if self.publish_remote is None and not self.has_subscribers(hardware_id):
+            return
+        message = dumps(sample)
+        if self.publish_remote is not None:
+            try:
+                self.publish_remote(message)
+                return
+            except Exception:
+                logger.exception("Metrics broker: remote publish failed, delivering locally only")
+        self.publish_local(hardware_id, message)
+
+    def publish_local(self, hardware_id: UUID, message: bytes) -> None:
+        with self._lock:
+            subscribers = list(self._by_machine.get(hardware_id, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+
+
+def _notify(message: bytes) -> None:
+    from app.pubsub import publish
+    publish(NOTIFY_CHANNEL, message.decode())
+
+
+def _on_notify(payload: str) -> None:
+    message = payload.encode()
+    try:
+        hardware_id = UUID(orjson.loads(message)["hardware_id"])
+    except (ValueError, KeyError, TypeError):
+        return
+    metrics_broker.publish_local(hardware_id, message)
+
+
+def subscribe_remote(listener) -> None:
+    listener.subscribe(NOTIFY_CHANNEL, _on_notify)
+
+
+def sse_event(data: bytes, event: str = "sample") -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+# SSE body: a snapshot of the latest samples, then live samples as they are ingested;
+# comment lines keep idle connections (and proxies) alive
+async def sse_stream(
+    subscription: Subscription,
+    snapshot: list[dict[str, Any]],
+    is_disconnected: Callable[[], Any],
+    keepalive: float = 15.0,
+) -> AsyncIterator[bytes]:
+    try:
+        for sample in snapshot:
+            yield sse_event(dumps(sample))
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    break
+                yield b": keepalive\n\n"
+                continue
+            yield sse_event(message)
+    finally:
+        metrics_broker.unsubscribe(subscription)
+
+
+metrics_broker = MetricsBroker(
+    queue_size=settings.METRICS_STREAM_QUEUE_SIZE,
+    publish_remote=_notify if settings.METRICS_STREAM_CROSS_WORKER else None,
+)
@@ -0,0 +1,20 @@
+"""
+Cross-cutting ASGI middleware (diagnostics, transport concerns).
+"""
+
+from .compression import CompressionMiddleware, RequestDecompressionMiddleware
+from .query_profiler import (
+    QueryProfilerMiddleware,
+    QueryBudgetExceeded,
+    QueryReport,
+    install_query_listeners,
+)
+
+__all__ = [
+    "CompressionMiddleware",
+    "RequestDecompressionMiddleware",
+    "QueryProfilerMiddleware",
+    "QueryBudgetExceeded",
+    "QueryReport",
+    "install_query_listeners",
+]
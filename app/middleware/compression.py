@@ -0,0 +1,326 @@
+"""
+Response compression and request-body decompression.
+
+CompressionMiddleware negotiates zstd / br / gzip from Accept-Encoding, leaves
+small responses alone and compresses streaming responses chunk by chunk (each
+chunk is flushed, so NDJSON exports still arrive as they are produced).
+Server-sent events (text/event-stream) are passed through uncompressed.
+
+RequestDecompressionMiddleware inflates Content-Encoding request bodies for the
+configured paths (the batch metric ingest endpoint), with a cap on the inflated
+size so a small compressed upload cannot expand without bound.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from typing import Iterable, Optional, Protocol
+
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import PlainTextResponse
+
+
+# server preference when the client accepts several encodings with the same q-value
+_PREFERENCE = ("zstd", "br", "gzip")
+
+DEFAULT_EXCLUDED_MEDIA_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+    "application/octet-stream",
+    # server-sent events are flushed per event, compressing them gains nothing
+    "text/event-stream",
+)
+
+
+# picks the best supported encoding from an Accept-Encoding header (RFC 9110 q-values)
+def negotiate_encoding(accept_encoding: str, supported: Iterable[str]) -> Optional[str]:
+    supported = tuple(supported)
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[token] = q
+
+    wildcard = weights.get("*")
+    candidates = []
+    for rank, encoding in enumerate(e for e in _PREFERENCE if e in supported):
+        q = weights.get(encoding, wildcard if wildcard is not None else 0.0)
+        if q > 0:
+            candidates.append((-q, rank, encoding))
+    return min(candidates)[2] if candidates else None
+
+
+class _Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+    def finish(self) -> bytes: ...
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app,
+        *,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+        excluded_media_types: Iterable[str] = DEFAULT_EXCLUDED_MEDIA_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.zstd_level = zstd_level
+        self.excluded_media_types = tuple(excluded_media_types)
+        self.encodings = _PREFERENCE
+
+    def _encoder(self, encoding: str) -> _Encoder:
+        if encoding == "zstd":
+            return _ZstdEncoder(self.zstd_level)
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[dict] = None
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+
+    def _skip(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return True
+        media_type = headers.get("content-type", "")
+        return media_type.startswith(self.middleware.excluded_media_types)
+
+    async def send(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            self.passthrough = self._skip(Headers(raw=message.get("headers", [])))
+            return
+
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough:
+            if self.start_message is not None:
+                await self._send(self.start_message)
+                self.start_message = None
+            await self._send(message)
+            return
+
+        if self.start_message is not None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if not more_body:
+                # whole body known up front: compress only above the threshold
+                if len(body) < self.middleware.minimum_size:
+                    await self._send(self.start_message)
+                    await self._send(message)
+                    self.start_message = None
+                    return
+                encoder = self.middleware._encoder(self.encoding)
+                body = encoder.compress(body) + encoder.finish()
+                headers["Content-Length"] = str(len(body))
+            else:
+                # streaming: unknown total size, compress every chunk and flush it
+                self.encoder = self.middleware._encoder(self.encoding)
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                body = self.encoder.compress(body) + self.encoder.flush()
+
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            await self._send(self.start_message)
+            self.start_message = None
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        if self.encoder is None:
+            await self._send(message)
+            return
+
+        chunk = self.encoder.compress(body)
+        chunk += self.encoder.flush() if more_body else self.encoder.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+class RequestBodyTooLarge(Exception):
+    pass
+
+
+def decompress_body(encoding: str, data: bytes, max_size: int) -> bytes:
+    if encoding in ("gzip", "x-gzip", "deflate"):
+        # wbits=47: auto-detect gzip or zlib header
+        obj = zlib.decompressobj(47)
+        out = obj.decompress(data, max_size + 1)
+        if len(out) > max_size or obj.unconsumed_tail:
+            raise RequestBodyTooLarge()
+        if not obj.eof:
+            raise zlib.error("truncated compressed stream")
+        return out
+
+    if encoding == "br":
+        obj = brotli.Decompressor()
+        # the output limit stops inflating at the cap, however far the input expands
+        out = obj.process(data, output_buffer_limit=max_size + 1)
+        if len(out) > max_size or not obj.can_accept_more_data():
+            raise RequestBodyTooLarge()
+        if not obj.is_finished():
+            raise brotli.error("truncated compressed stream")
+        return out
+
+    if encoding == "zstd":
+        decompressor = zstandard.ZstdDecompressor()
+        out = decompressor.stream_reader(data).read(max_size + 1)
+        if len(out) > max_size:
+            raise RequestBodyTooLarge()
+        # the reader returns a truncated frame silently; the output is known to be
+        # within the cap, so a second pass can check for the end of the frame
+        obj = decompressor.decompressobj()
+        obj.decompress(data)
+        if not obj.eof:
+            raise zstandard.ZstdError("truncated compressed stream")
+        return out
+
+    raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+
+class RequestDecompressionMiddleware:
+    def __init__(self, app, *, paths: Iterable[str], max_size: int = 32 * 1024 * 1024):
+        self.app = app
+        self.paths = [re.compile(p) for p in paths]
+        self.max_size = max_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not any(p.search(scope["path"]) for p in self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = headers.get("content-encoding", "").strip().lower()
+        if not encoding or encoding == "identity":
+            await self.app(scope, receive, send)
+            return
+
+        compressed = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            compressed += message.get("body", b"")
+            if len(compressed) > self.max_size:
+                await PlainTextResponse("Request body too large", status_code=413)(scope, receive, send)
+                return
+            if not message.get("more_body", False):
+                break
+
+        try:
+            body = decompress_body(encoding, bytes(compressed), self.max_size)
+        except RequestBodyTooLarge:
+            await PlainTextResponse("Decompressed request body too large", status_code=413)(scope, receive, send)
+            return
+        except ValueError as e:
+            await PlainTextResponse(str(e), status_code=415)(scope, receive, send)
+            return
+        except Exception:
+            await PlainTextResponse("Malformed compressed request body", status_code=400)(scope, receive, send)
+            return
+
+        new_headers = MutableHeaders(scope=scope)
+        del new_headers["content-encoding"]
+        new_headers["content-length"] = str(len(body))
+
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, replay, send)
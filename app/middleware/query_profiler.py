@@ -0,0 +1,220 @@
+"""
+Opt-in SQL profiler for development and staging.
+
+Records every statement issued while a request is being handled, groups them by
+their parameterised text and reports statements that repeat (the N+1 pattern,
+e.g. lazy loads of Listing.machine or Booking.invoice during serialisation).
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_MODES = {"log", "header", "raise"}
+
+# recorder for the request currently being handled (None outside profiled requests)
+_current_recorder: ContextVar[Optional["QueryRecorder"]] = ContextVar("query_recorder", default=None)
+
+# expanded IN lists vary in length per call, collapse them so they group together
+_IN_LIST = re.compile(r"\(\s*%\([^)]+\)s(?:\s*,\s*%\([^)]+\)s)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    statement = _IN_LIST.sub("(?)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+@dataclass
+class RepeatedStatement:
+    statement: str
+    count: int
+    total_time_ms: float
+
+
+@dataclass
+class QueryReport:
+    method: str
+    route: str
+    total_queries: int
+    total_time_ms: float
+    repeated: list[RepeatedStatement] = field(default_factory=list)
+    budget: Optional[int] = None
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.total_queries > self.budget
+
+    @property
+    def has_n_plus_one(self) -> bool:
+        return bool(self.repeated)
+
+    def summary(self) -> str:
+        lines = [
+            f"{self.method} {self.route}: {self.total_queries} queries "
+            f"in {self.total_time_ms:.1f} ms"
+            + (f" (budget {self.budget})" if self.budget is not None else "")
+        ]
+        for rep in self.repeated:
+            lines.append(f"  x{rep.count} ({rep.total_time_ms:.1f} ms): {rep.statement[:300]}")
+        return "\n".join(lines)
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, report: QueryReport):
+        super().__init__(report.summary())
+        self.report = report
+
+
+# Collects (normalised statement, duration) pairs for a single request
+class QueryRecorder:
+    def __init__(self):
+        self.statements: list[tuple[str, float]] = []
+
+    def record(self, statement: str, duration_s: float) -> None:
+        self.statements.append((normalize_statement(statement), duration_s))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_time_ms(self) -> float:
+        return sum(d for _, d in self.statements) * 1000
+
+    def build_report(
+        self,
+        method: str,
+        route: str,
+        repeat_threshold: int,
+        budget: Optional[int] = None,
+    ) -> QueryReport:
+        counts = Counter(stmt for stmt, _ in self.statements)
+        durations: dict[str, float] = defaultdict(float)
+        for stmt, duration in self.statements:
+            durations[stmt] += duration
+
+        repeated = [
+            RepeatedStatement(statement=stmt, count=n, total_time_ms=durations[stmt] * 1000)
+            for stmt, n in counts.most_common()
+            if n >= repeat_threshold
+        ]
+        return QueryReport(
+            method=method,
+            route=route,
+            total_queries=self.count,
+            total_time_ms=self.total_time_ms,
+            repeated=repeated,
+            budget=budget,
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_recorder.get() is not None:
+        conn.info.setdefault("query_profiler_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return
+    starts = conn.info.get("query_profiler_start")
+    started = starts.pop() if starts else time.perf_counter()
+    recorder.record(statement, time.perf_counter() - started)
+
+
+# Hooks the recorder into the engine; listeners are no-ops outside profiled requests
+def install_query_listeners(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryProfilerMiddleware:
+    """
+    ASGI middleware reporting the queries issued per request.
+
+    mode="log"    -> log a warning for N+1 patterns or exceeded budgets
+    mode="header" -> additionally expose X-Query-Count / X-Query-Time-Ms / X-Query-Repeats
+    mode="raise"  -> raise QueryBudgetExceeded after the response (fails TestClient calls)
+
+    `budgets` maps route templates (e.g. "/api/v1/bookings/") to a maximum query
+    count and overrides `max_queries` for those routes.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        mode: str = "log",
+        repeat_threshold: int = 3,
+        max_queries: Optional[int] = None,
+        budgets: Optional[dict[str, int]] = None,
+        on_report: Optional[Callable[[QueryReport], None]] = None,
+    ):
+        if mode not in _MODES:
+            raise ValueError(f"mode must be one of: {', '.join(sorted(_MODES))}.")
+        self.app = app
+        self.mode = mode
+        self.repeat_threshold = repeat_threshold
+        self.max_queries = max_queries
+        self.budgets = budgets or {}
+        self.on_report = on_report
+
+    def _route_of(self, scope) -> str:
+        route = scope.get("route")
+        return getattr(route, "path", None) or scope.get("path", "")
+
+    def _budget_for(self, route: str) -> Optional[int]:
+        return self.budgets.get(route, self.max_queries)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recorder = QueryRecorder()
+        token = _current_recorder.set(recorder)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.mode != "log":
+                # for regular responses every query has run by the time headers are sent
+                report = recorder.build_report(
+                    scope["method"], self._route_of(scope), self.repeat_threshold
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(report.total_queries).encode()))
+                headers.append((b"x-query-time-ms", f"{report.total_time_ms:.1f}".encode()))
+                headers.append((b"x-query-repeats", str(len(report.repeated)).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_recorder.reset(token)
+
+        route = self._route_of(scope)
+        report = recorder.build_report(
+            scope["method"], route, self.repeat_threshold, budget=self._budget_for(route)
+        )
+        if self.on_report is not None:
+            self.on_report(report)
+
+        if report.over_budget or report.has_n_plus_one:
+            logger.warning("Query profiler:\n%s", report.summary())
+            if self.mode == "raise":
+                raise QueryBudgetExceeded(report)
+        elif report.total_queries:
+            logger.debug("Query profiler: %s", report.summary())
@@ -10,9 +10,11 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Index,
+    Integer,
     Numeric,
     Text,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB, CHAR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -59,6 +61,13 @@ class Payment(Base):
 
     timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     invoice_number: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # processor-side reference (Checkout session id); invoice_number keeps the real invoice number
+    processor_ref: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # settlement (manual-capture payments are captured after the booking has ended)
+    captured_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    capture_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    capture_attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
 
     booking: Mapped["Booking"] = relationship("Booking", back_populates="payments")
     machine: Mapped["Machine"] = relationship("Machine", back_populates="payments")
@@ -83,4 +92,44 @@ class Payment(Base):
         Index("idx_payments_provider_id", "provider_id"),
         Index("idx_payments_timestamp", "timestamp"),
         Index("idx_payments_status", "payment_status"),
-    )
\ No newline at end of file
+        Index("idx_payments_invoice_number", "invoice_number"),
+        Index("uq_payments_processor_ref", "processor_ref", unique=True),
+        # payout statements: captured amount per booking from the index alone
+        Index(
+            "idx_payments_booking_captured",
+            "booking_id",
+            "captured_at",
+            postgresql_include=["amount_total"],
+        ),
+        Index(
+            "idx_payments_pending_capture",
+            "payment_id",
+            postgresql_where=text(
+                "payment_status = 'paid' AND captured_at IS NULL AND processor_ref IS NOT NULL"
+            ),
+        ),
+    )
+
+
+# Processor webhook events, deduplicated by event_id and applied in batches by the
+# payment event worker (processed_at IS NULL = still pending)
+class PaymentEvent(Base):
+    __tablename__ = "payment_events"
+
+    event_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    event_type: Mapped[str] = mapped_column(Text, nullable=False)
+    session_id: Mapped[str] = mapped_column(Text, nullable=False)
+    action: Mapped[str] = mapped_column(Text, nullable=False)
+
+    received_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    result: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("action IN ('paid', 'failed')", name="chk_payment_events_action"),
+        Index(
+            "idx_payment_events_pending",
+            "received_at",
+            postgresql_where=processed_at.is_(None),
+        ),
+    )
@@ -0,0 +1,109 @@
+from abc import abstractmethod
+from decimal import Decimal
+from typing import Protocol, Optional, Dict, Any
+
+from starlette.concurrency import run_in_threadpool
+
+from .payment_port import PaymentPort
+
+
+class PaymentProcessorUnavailable(RuntimeError):
+    """Raised when the processor is unreachable or the circuit breaker is open."""
+
+
+# Async counterpart of PaymentPort for the request paths that call the processor
+# Implementations must not block the event loop
+class AsyncPaymentPort(Protocol):
+    # create Checkout Session with manual capture
+    @abstractmethod
+    async def create_checkout_session(
+        self,
+        booking_id: str,
+        user_id: str,
+        amount: Decimal,
+        currency: str,
+        success_url: str,
+        cancel_url: str,
+        customer_email: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        pass
+
+    # retrieve Checkout Session details
+    @abstractmethod
+    async def retrieve_checkout_session(self, session_id: str) -> Dict[str, Any]:
+        pass
+
+    # retrieve a PaymentIntent status from processor
+    @abstractmethod
+    async def get_payment_intent(self, payment_intent_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    # capture a previously authorized payment
+    @abstractmethod
+    async def capture(self, processor_ref: str, idempotency_key: Optional[str] = None) -> None:
+        pass
+
+    # cancel PaymentIntent that won't be used
+    @abstractmethod
+    async def cancel_payment_intent(self, processor_ref: str, idempotency_key: Optional[str] = None) -> None:
+        pass
+
+    # refund a previously captured or authorized payment
+    @abstractmethod
+    async def refund(
+        self,
+        processor_ref: str,
+        amount: Decimal,
+        idempotency_key: Optional[str] = None,
+    ) -> Optional[str]:
+        pass
+
+
+# Exposes a blocking PaymentPort (e.g. MockStripeAdapter, RealStripeAdapter) through the
+# async interface by running each call in the threadpool
+class ThreadedPaymentPort(AsyncPaymentPort):
+    def __init__(self, port: PaymentPort):
+        self.port = port
+
+    async def create_checkout_session(
+        self,
+        booking_id: str,
+        user_id: str,
+        amount: Decimal,
+        currency: str,
+        success_url: str,
+        cancel_url: str,
+        customer_email: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return await run_in_threadpool(
+            self.port.create_checkout_session,
+            booking_id=booking_id,
+            user_id=user_id,
+            amount=amount,
+            currency=currency,
+            success_url=success_url,
+            cancel_url=cancel_url,
+            customer_email=customer_email,
+        )
+
+    async def retrieve_checkout_session(self, session_id: str) -> Dict[str, Any]:
+        return await run_in_threadpool(self.port.retrieve_checkout_session, session_id=session_id)
+
+    async def get_payment_intent(self, payment_intent_id: str) -> Optional[Dict[str, Any]]:
+        return await run_in_threadpool(self.port.get_payment_intent, payment_intent_id=payment_intent_id)
+
+    async def capture(self, processor_ref: str, idempotency_key: Optional[str] = None) -> None:
+        await run_in_threadpool(self.port.capture, processor_ref=processor_ref)
+
+    async def cancel_payment_intent(self, processor_ref: str, idempotency_key: Optional[str] = None) -> None:
+        await run_in_threadpool(self.port.cancel_payment_intent, processor_ref=processor_ref)
+
+    async def refund(
+        self,
+        processor_ref: str,
+        amount: Decimal,
+        idempotency_key: Optional[str] = None,
+    ) -> Optional[str]:
+        return await run_in_threadpool(self.port.refund, processor_ref=processor_ref, amount=amount)
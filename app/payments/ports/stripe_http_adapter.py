@@ -0,0 +1,334 @@
+import asyncio
+import os
+import random
+import uuid
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional, Dict, Any
+
+import httpx
+
+from .async_payment_port import AsyncPaymentPort, PaymentProcessorUnavailable, ThreadedPaymentPort
+from .circuit_breaker import CircuitBreaker
+from .stripe_adapter import MockStripeAdapter
+
+# per-call read timeouts in seconds; connect timeout is capped separately
+DEFAULT_TIMEOUTS: Dict[str, float] = {
+    "create_checkout_session": 10.0,
+    "retrieve_checkout_session": 5.0,
+    "get_payment_intent": 5.0,
+    "capture": 15.0,
+    "cancel_payment_intent": 10.0,
+    "refund": 15.0,
+}
+CONNECT_TIMEOUT = 2.0
+
+# One pooled client and one circuit breaker per process, shared by every request
+_shared_client: Optional[httpx.AsyncClient] = None
+_shared_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("PAYMENTS_BREAKER_FAILURES", "5")),
+    reset_timeout=float(os.getenv("PAYMENTS_BREAKER_RESET_S", "30")),
+)
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        max_connections = int(os.getenv("PAYMENTS_MAX_CONNECTIONS", "50"))
+        _shared_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=30.0,
+            ),
+            timeout=httpx.Timeout(10.0, connect=CONNECT_TIMEOUT),
+        )
+    return _shared_client
+
+
+async def close_shared_http_client() -> None:
+    global _shared_client
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+    _shared_client = None
+
+
+def _minor_units(amount: Decimal) -> int:
+    return int((Decimal(str(amount)) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def _scalar(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+# Stripe's form encoding for nested params: line_items[0][price_data][currency]=eur
+# (every flattened key is unique, so the result can be passed on as a dict)
+def form_encode(params: Dict[str, Any], prefix: str = "") -> list[tuple[str, str]]:
+    items: list[tuple[str, str]] = []
+    for key, value in params.items():
+        name = f"{prefix}[{key}]" if prefix else key
+        if value is None:
+            continue
+        if isinstance(value, dict):
+            items.extend(form_encode(value, name))
+        elif isinstance(value, (list, tuple)):
+            for i, element in enumerate(value):
+                if isinstance(element, dict):
+                    items.extend(form_encode(element, f"{name}[{i}]"))
+                else:
+                    items.append((f"{name}[{i}]", _scalar(element)))
+        else:
+            items.append((name, _scalar(value)))
+    return items
+
+
+# Async Stripe adapter speaking the REST API over a shared, pooled httpx client
+# - per-call timeouts, bounded retries with full-jitter exponential backoff
+# - Idempotency-Key on every POST, kept across the retries of one call; captures and
+#   refunds derive it from the business reference, checkout takes it from the caller
+#   (PaymentsService adds a per-attempt counter, so a new attempt gets a new session)
+# - circuit breaker: after repeated processor failures calls fail fast with
+#   PaymentProcessorUnavailable instead of tying up requests until timeout
+class AsyncStripeAdapter(AsyncPaymentPort):
+    def __init__(
+        self,
+        api_key: str,
+        client: httpx.AsyncClient,
+        breaker: CircuitBreaker,
+        base_url: str = "https://api.stripe.com",
+        max_retries: int = 2,
+        backoff_base: float = 0.2,
+        backoff_cap: float = 2.0,
+        timeouts: Optional[Dict[str, float]] = None,
+    ):
+        if not api_key:
+            raise ValueError("STRIPE_SECRET_KEY environment variable is required")
+        self.api_key = api_key
+        self.client = client
+        self.breaker = breaker
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_cap))
+            except ValueError:
+                pass
+        return delay
+
+    @staticmethod
+    def _is_retryable(resp: httpx.Response) -> bool:
+        should_retry = resp.headers.get("stripe-should-retry")
+        if should_retry is not None:
+            return should_retry == "true"
+        return resp.status_code in (409, 429) or resp.status_code >= 500
+
+    @staticmethod
+    def _error_message(resp: httpx.Response) -> str:
+        try:
+            return resp.json().get("error", {}).get("message") or resp.text
+        except ValueError:
+            return resp.text
+
+    async def _request(
+        self,
+        operation: str,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        if not self.breaker.allow_request():
+            raise PaymentProcessorUnavailable("Payment processor is unavailable (circuit open).")
+
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        if method == "POST":
+            headers["Idempotency-Key"] = idempotency_key or f"{operation}-{uuid.uuid4().hex}"
+
+        read_timeout = self.timeouts[operation]
+        timeout = httpx.Timeout(read_timeout, connect=min(CONNECT_TIMEOUT, read_timeout))
+        encoded = dict(form_encode(params)) if params else None
+        data = encoded if method == "POST" else None
+        query = encoded if method == "GET" else None
+
+        # every path records an outcome or releases the breaker, so a cancelled or crashed
+        # half-open trial cannot keep the circuit blocked
+        recorded = False
+        attempt = 0
+        try:
+            while True:
+                resp: Optional[httpx.Response] = None
+                error: Optional[Exception] = None
+                try:
+                    resp = await self.client.request(
+                        method,
+                        f"{self.base_url}{path}",
+                        data=data,
+                        params=query,
+                        headers=headers,
+                        timeout=timeout,
+                    )
+                except httpx.TransportError as e:
+                    error = e
+                else:
+                    if resp.status_code < 400:
+                        recorded = True
+                        self.breaker.record_success()
+                        return resp.json()
+                    if not self._is_retryable(resp):
+                        # request-level error (declined card, bad params): the processor itself is healthy
+                        recorded = True
+                        self.breaker.record_success()
+                        raise ValueError(f"Stripe {operation} error: {self._error_message(resp)}")
+
+                if attempt >= self.max_retries:
+                    recorded = True
+                    self.breaker.record_failure()
+                    if resp is None:
+                        raise PaymentProcessorUnavailable(f"Stripe {operation} failed: {error!r}") from error
+                    raise PaymentProcessorUnavailable(
+                        f"Stripe {operation} failed with HTTP {resp.status_code}: {self._error_message(resp)}"
+                    )
+
+                attempt += 1
+                await asyncio.sleep(self._backoff(attempt, resp.headers.get("retry-after") if resp else None))
+        except Exception:
+            # unexpected error before an outcome: count it against the processor
+            if not recorded:
+                recorded = True
+                self.breaker.record_failure()
+            raise
+        finally:
+            # cancelled (client disconnect) mid-call: no outcome, just free the trial slot
+            if not recorded:
+                self.breaker.release()
+
+    # single Checkout Session call with manual capture (no separate PaymentIntent round-trip)
+    async def create_checkout_session(
+        self,
+        booking_id: str,
+        user_id: str,
+        amount: Decimal,
+        currency: str,
+        success_url: str,
+        cancel_url: str,
+        customer_email: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        minor = _minor_units(amount)
+        session = await self._request(
+            "create_checkout_session",
+            "POST",
+            "/v1/checkout/sessions",
+            params={
+                "payment_method_types": ["card"],
+                "line_items": [{
+                    "price_data": {
+                        "currency": currency.lower(),
+                        "product_data": {
+                            "name": f"Booking {booking_id}",
+                            "description": "Server rental booking",
+                        },
+                        "unit_amount": minor,
+                    },
+                    "quantity": 1,
+                }],
+                "mode": "payment",
+                "payment_intent_data": {"capture_method": "manual"},
+                "metadata": {"booking_id": booking_id, "user_id": user_id},
+                "success_url": success_url,
+                "cancel_url": cancel_url,
+                "customer_email": customer_email,
+            },
+            idempotency_key=idempotency_key,
+        )
+        return {
+            "session_id": session["id"],
+            "payment_intent_id": session.get("payment_intent"),
+            "url": session.get("url"),
+            "amount": amount,
+            "currency": currency,
+        }
+
+    async def retrieve_checkout_session(self, session_id: str) -> Dict[str, Any]:
+        session = await self._request(
+            "retrieve_checkout_session", "GET", f"/v1/checkout/sessions/{session_id}"
+        )
+        amount_total = session.get("amount_total")
+        return {
+            "id": session["id"],
+            "payment_status": session.get("payment_status"),
+            "payment_intent": session.get("payment_intent"),
+            "customer_email": session.get("customer_email"),
+            "amount_total": Decimal(amount_total) / 100 if amount_total else None,
+            "currency": session.get("currency"),
+            "metadata": session.get("metadata"),
+        }
+
+    async def get_payment_intent(self, payment_intent_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            intent = await self._request(
+                "get_payment_intent", "GET", f"/v1/payment_intents/{payment_intent_id}"
+            )
+        except ValueError:
+            return None
+        return {
+            "id": intent["id"],
+            "status": intent.get("status"),
+            "amount": Decimal(intent.get("amount") or 0) / 100,
+            "currency": intent.get("currency"),
+            "client_secret": intent.get("client_secret"),
+            "capture_method": intent.get("capture_method"),
+        }
+
+    async def capture(self, processor_ref: str, idempotency_key: Optional[str] = None) -> None:
+        await self._request(
+            "capture",
+            "POST",
+            f"/v1/payment_intents/{processor_ref}/capture",
+            idempotency_key=idempotency_key or f"capture-{processor_ref}",
+        )
+
+    async def cancel_payment_intent(self, processor_ref: str, idempotency_key: Optional[str] = None) -> None:
+        await self._request(
+            "cancel_payment_intent",
+            "POST",
+            f"/v1/payment_intents/{processor_ref}/cancel",
+            idempotency_key=idempotency_key or f"cancel-{processor_ref}",
+        )
+
+    async def refund(
+        self,
+        processor_ref: str,
+        amount: Decimal,
+        idempotency_key: Optional[str] = None,
+    ) -> Optional[str]:
+        minor = _minor_units(amount)
+        refund = await self._request(
+            "refund",
+            "POST",
+            "/v1/refunds",
+            params={"payment_intent": processor_ref, "amount": minor},
+            idempotency_key=idempotency_key or f"refund-{processor_ref}-{minor}",
+        )
+        return refund.get("id")
+
+
+def get_async_payment_adapter() -> AsyncPaymentPort:
+    # factory returning the AsyncPaymentPort interface
+    # STRIPE_API_BASE can point at a local fake processor (perf/fake_processor.py)
+    if os.getenv("USE_REAL_STRIPE", "false").lower() == "true":
+        return AsyncStripeAdapter(
+            api_key=os.getenv("STRIPE_SECRET_KEY"),
+            client=get_shared_http_client(),
+            breaker=_shared_breaker,
+            base_url=os.getenv("STRIPE_API_BASE", "https://api.stripe.com"),
+            max_retries=int(os.getenv("PAYMENTS_MAX_RETRIES", "2")),
+        )
+    return ThreadedPaymentPort(MockStripeAdapter())
@@ -1,12 +1,19 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from uuid import UUID
 from typing import Optional, List
 
+from sqlalchemy import bindparam, column, func, select, table, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from .models import Payment
+from .models import Payment, PaymentEvent
+
+# lightweight handle on the bookings table for settlement queries
+# (avoids importing the bookings module, which itself depends on payments)
+_bookings = table("bookings", column("booking_id"), column("end_timestamp"))
 
 
 class PaymentsRepository:
@@ -16,6 +23,20 @@ class PaymentsRepository:
         db.refresh(payment)
         return payment
 
+    # checkout retries get the same session back (deterministic idempotency key): the
+    # first call records the payment, later ones return the row already recorded
+    def create_for_processor_ref(self, db: Session, values: dict) -> Payment:
+        payment_id = db.execute(
+            insert(Payment)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[Payment.processor_ref])
+            .returning(Payment.payment_id)
+        ).scalar()
+        db.commit()
+        if payment_id is None:
+            return self.get_by_processor_ref(db, values["processor_ref"])
+        return self.get(db, payment_id)
+
     def update(self, db: Session, payment: Payment) -> Payment:
         db.commit()
         db.refresh(payment)
@@ -32,6 +53,9 @@ class PaymentsRepository:
             .all()
         )
 
+    def count_for_booking(self, db: Session, booking_id: UUID) -> int:
+        return db.scalar(select(func.count()).select_from(Payment).where(Payment.booking_id == booking_id))
+
     def list_for_bookings(self, db: Session, booking_ids: list[UUID]) -> list[Payment]:
         if not booking_ids:
             return []
@@ -48,3 +72,123 @@ class PaymentsRepository:
             .filter(Payment.invoice_number == invoice_number)
             .first()
         )
+
+    def get_by_processor_ref(self, db: Session, processor_ref: str) -> Optional[Payment]:
+        return (
+            db.query(Payment)
+            .filter(Payment.processor_ref == processor_ref)
+            .first()
+        )
+
+    # processor session id first, then invoice number; both lookups are index scans
+    def get_by_reference(self, db: Session, reference: str) -> Optional[Payment]:
+        return self.get_by_processor_ref(db, reference) or self.get_by_invoice_number(db, reference)
+
+    # single UPDATE for a batch of processor references
+    # returns (processor_ref, invoice_number) of the rows that changed; does not commit
+    def set_status_by_processor_refs(
+        self,
+        db: Session,
+        processor_refs: list[str],
+        status: str,
+        from_statuses: tuple[str, ...],
+    ) -> list[tuple[str, Optional[str]]]:
+        if not processor_refs:
+            return []
+        result = db.execute(
+            update(Payment)
+            .where(
+                Payment.processor_ref.in_(processor_refs),
+                Payment.payment_status.in_(from_statuses),
+            )
+            .values(payment_status=status)
+            .returning(Payment.processor_ref, Payment.invoice_number)
+            .execution_options(synchronize_session=False)
+        )
+        return [(row[0], row[1]) for row in result]
+
+    # authorised, uncaptured payments of bookings that ended before `ended_before`
+    # keyset-paginated on payment_id; returns (payment_id, processor_ref) rows
+    def list_capturable(
+        self,
+        db: Session,
+        ended_before: datetime,
+        after_payment_id: Optional[UUID],
+        limit: int,
+        max_attempts: int,
+    ) -> list[tuple[UUID, str]]:
+        stmt = (
+            select(Payment.payment_id, Payment.processor_ref)
+            .join(_bookings, _bookings.c.booking_id == Payment.booking_id)
+            .where(
+                Payment.payment_status == "paid",
+                Payment.captured_at.is_(None),
+                Payment.processor_ref.is_not(None),
+                Payment.capture_attempts < max_attempts,
+                _bookings.c.end_timestamp <= ended_before,
+            )
+            .order_by(Payment.payment_id)
+            .limit(limit)
+        )
+        if after_payment_id is not None:
+            stmt = stmt.where(Payment.payment_id > after_payment_id)
+        return [(row[0], row[1]) for row in db.execute(stmt)]
+
+    # one executemany UPDATE for a batch of capture outcomes
+    # results: [{"payment_id", "captured_at", "capture_error"}]; rows already captured are left alone
+    def record_capture_results(self, db: Session, results: list[dict]) -> None:
+        if not results:
+            return
+        payments = Payment.__table__
+        db.execute(
+            update(payments)
+            .where(payments.c.payment_id == bindparam("b_payment_id"), payments.c.captured_at.is_(None))
+            .values(
+                captured_at=bindparam("b_captured_at"),
+                capture_error=bindparam("b_capture_error"),
+                capture_attempts=payments.c.capture_attempts + 1,
+            ),
+            [
+                {
+                    "b_payment_id": r["payment_id"],
+                    "b_captured_at": r["captured_at"],
+                    "b_capture_error": r["capture_error"],
+                }
+                for r in results
+            ],
+        )
+        db.commit()
+
+    # returns False when the event was already recorded (processor redelivery)
+    def insert_event(self, db: Session, event_id: str, event_type: str, session_id: str, action: str) -> bool:
+        inserted = db.execute(
+            insert(PaymentEvent)
+            .values(event_id=event_id, event_type=event_type, session_id=session_id, action=action)
+            .on_conflict_do_nothing(index_elements=[PaymentEvent.event_id])
+            .returning(PaymentEvent.event_id)
+        ).first()
+        db.commit()
+        return inserted is not None
+
+    # locks a batch of pending events; concurrent workers skip rows already claimed
+    def claim_pending_events(self, db: Session, limit: int) -> list[PaymentEvent]:
+        return (
+            db.query(PaymentEvent)
+            .filter(PaymentEvent.processed_at.is_(None))
+            .order_by(PaymentEvent.received_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    # results: event_id -> result; does not commit
+    def mark_events_processed(self, db: Session, results: dict[str, str], processed_at: datetime) -> None:
+        if not results:
+            return
+        db.execute(
+            update(PaymentEvent),
+            [
+                {"event_id": event_id, "processed_at": processed_at, "result": result}
+                for event_id, result in results.items()
+            ],
+        )
@@ -4,14 +4,22 @@ from __future__ import annotations
 from uuid import UUID
 from decimal import Decimal
 
+import json
+
 from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 
 from app.auth import get_current_user
+from app.config import settings
 from app.users import User
 
 from .schemas import PaymentRead, CheckoutRequest
 from .public import PaymentsPublic, get_payments_public
 from .service import PaymentsService, get_payments_service
+from .ports.async_payment_port import PaymentProcessorUnavailable
+from .webhooks import verify_signature
+from .worker import payment_event_worker
 
 router = APIRouter()
 
@@ -28,7 +36,7 @@ def list_payments_for_booking(
 # This endpoint is not applicable in a mock environment; in a production system,
 # it would be used to retrieve a payment intent confirmation URL
 @router.post("/checkout")
-def create_checkout(
+async def create_checkout(
     checkout_data: CheckoutRequest,
     request: Request,
     payments_service: PaymentsService = Depends(get_payments_service),
@@ -44,7 +52,7 @@ def create_checkout(
         )
         cancel_url = f"{base_url}api/v1/payments/cancel?booking_id={checkout_data.booking_id}"
 
-        result = payments_service.create_checkout_session(
+        result = await payments_service.create_checkout_session_async(
             booking_id=checkout_data.booking_id,
             hardware_id=checkout_data.hardware_id,
             payer_id=user.customer_id,
@@ -58,23 +66,57 @@ def create_checkout(
 
         return {"checkout_url": result.get("url"), "session_id": result.get("session_id")}
 
+    except PaymentProcessorUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Payment conflicts with an existing record.")
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 # Verify Stripe Checkout Session
 @router.get("/verify/{session_id}")
-def verify_payment(
+async def verify_payment(
     session_id: str,
     payments_service: PaymentsService = Depends(get_payments_service),
 ):
     try:
-        session = payments_service.verify_checkout_session(session_id)
+        session = await payments_service.verify_checkout_session_async(session_id)
         paid = session.get("payment_status") == "paid"
         return {"paid": paid, "session": session}
+    except PaymentProcessorUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+# Processor webhook: verifies the signature, records the event (deduplicated by event id)
+# and leaves applying it to the background payment event worker
+@router.post("/webhook")
+async def payment_webhook(
+    request: Request,
+    payments_service: PaymentsService = Depends(get_payments_service),
+):
+    if not settings.STRIPE_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="Webhook secret is not configured.")
+
+    payload = await request.body()
+    try:
+        verify_signature(
+            payload,
+            request.headers.get("stripe-signature"),
+            settings.STRIPE_WEBHOOK_SECRET,
+            tolerance=settings.STRIPE_WEBHOOK_TOLERANCE_SECONDS,
+        )
+        event = json.loads(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    recorded = await run_in_threadpool(payments_service.record_webhook_event, event)
+    if recorded:
+        payment_event_worker.notify()
+    return {"received": True, "duplicate": recorded is False}
+
 # Marking invoice as paid, updating invoice's state in database
+# session_id is the processor reference; an invoice number is accepted as well
 @router.patch("/mark-paid/{session_id}", response_model=PaymentRead)
 def mark_paid(
     session_id: str,
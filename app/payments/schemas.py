@@ -35,6 +35,7 @@ class PaymentRead(BaseModel):
     payment_status: str
     timestamp: datetime
     invoice_number: Optional[str] = None
+    processor_ref: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
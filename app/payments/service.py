@@ -1,18 +1,23 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from uuid import UUID
 from decimal import Decimal
 from typing import Dict, Any, Optional
 
 from fastapi import Depends
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
 from .models import Payment
 from .repository import PaymentsRepository
 from .ports.payment_port import PaymentPort
+from .ports.async_payment_port import AsyncPaymentPort
 from .ports.stripe_adapter import get_payment_adapter
+from .ports.stripe_http_adapter import get_async_payment_adapter
+from .webhooks import event_action
 from app.invoices import InvoicesService, get_invoices_service
 
 _ALLOWED_STATUS = {"incomplete", "paid", "failed"}
@@ -25,10 +30,12 @@ class PaymentsService:
         repo: PaymentsRepository,
         port: PaymentPort,
         invoices_service: InvoicesService,
+        async_port: Optional[AsyncPaymentPort] = None,
     ):
         self.db = db
         self.repo = repo
         self.port = port
+        self.async_port = async_port
         self.invoices = invoices_service
 
     def list_for_booking(self, booking_id: UUID):
@@ -38,7 +45,7 @@ class PaymentsService:
         return self.repo.list_for_bookings(self.db, booking_ids)
 
     # creates a Stripe Checkout Session and persists a Payment with status=incomplete
-    # the Stripe session_id is stored in invoice_number
+    # the Stripe session_id is stored in processor_ref, invoice_number holds the booking's invoice
     def create_checkout_session(
         self,
         booking_id: UUID,
@@ -61,23 +68,73 @@ class PaymentsService:
             customer_email=customer_email,
         )
 
+        self._record_checkout(result, booking_id, hardware_id, payer_id, provider_id, amount, currency)
+        return result
+
+    # async variant for the checkout route: the processor call does not hold a worker thread,
+    # only the short database write runs in the threadpool
+    async def create_checkout_session_async(
+        self,
+        booking_id: UUID,
+        hardware_id: UUID,
+        payer_id: UUID,
+        provider_id: Optional[UUID],
+        amount: Decimal,
+        currency: str,
+        success_url: str,
+        cancel_url: str,
+        customer_email: str | None = None,
+    ) -> Dict[str, Any]:
+        if self.async_port is None:
+            raise RuntimeError("PaymentsService was created without an async payment port.")
+
+        # retries of one attempt replay its session; once a session has been recorded
+        # (it may since have expired or been cancelled) the next checkout opens a new one
+        attempt = await run_in_threadpool(self.repo.count_for_booking, self.db, booking_id)
+        result = await self.async_port.create_checkout_session(
+            booking_id=str(booking_id),
+            user_id=str(payer_id),
+            amount=amount,
+            currency=currency,
+            success_url=success_url,
+            cancel_url=cancel_url,
+            customer_email=customer_email,
+            idempotency_key=f"checkout-{booking_id}-{attempt}-{amount:f}-{currency.lower()}",
+        )
+        await run_in_threadpool(
+            self._record_checkout, result, booking_id, hardware_id, payer_id, provider_id, amount, currency
+        )
+        return result
+
+    def _record_checkout(
+        self,
+        result: Dict[str, Any],
+        booking_id: UUID,
+        hardware_id: UUID,
+        payer_id: UUID,
+        provider_id: Optional[UUID],
+        amount: Decimal,
+        currency: str,
+    ) -> Payment:
         session_id = result.get("session_id") or result.get("id") or result.get("sessionId")
         if not session_id:
             raise ValueError("Payment processor did not return session_id.")
 
-        payment = Payment(
-            booking_id=booking_id,
-            hardware_id=hardware_id,
-            payer_id=payer_id,
-            provider_id=provider_id,
-            amount_total=amount,
-            currency=currency.upper(),
-            payment_status="incomplete",
-            invoice_number=str(session_id),
+        invoice = self.invoices.get_for_booking(booking_id)
+        return self.repo.create_for_processor_ref(
+            self.db,
+            dict(
+                booking_id=booking_id,
+                hardware_id=hardware_id,
+                payer_id=payer_id,
+                provider_id=provider_id,
+                amount_total=amount,
+                currency=currency.upper(),
+                payment_status="incomplete",
+                invoice_number=invoice.invoice_number if invoice else None,
+                processor_ref=str(session_id),
+            ),
         )
-        self.repo.create(self.db, payment)
-
-        return result
 
     # development purposes helper: records payment directly to the database, bypassing Stripe
     def create_dummy_for_booking(
@@ -112,26 +169,84 @@ class PaymentsService:
     def verify_checkout_session(self, session_id: str) -> Dict[str, Any]:
         return self.port.retrieve_checkout_session(session_id=session_id)
 
-    def mark_paid_by_invoice(self, invoice_number: str) -> Payment:
+    # once the webhook has settled the payment, answer from the database instead of
+    # asking the processor again on every client poll
+    async def verify_checkout_session_async(self, session_id: str) -> Dict[str, Any]:
+        if self.async_port is None:
+            raise RuntimeError("PaymentsService was created without an async payment port.")
+
+        payment = await run_in_threadpool(self.repo.get_by_processor_ref, self.db, session_id)
+        if payment is not None and payment.payment_status == "paid":
+            return {
+                "id": session_id,
+                "payment_status": "paid",
+                "amount_total": payment.amount_total,
+                "currency": payment.currency.lower(),
+                "metadata": {"booking_id": str(payment.booking_id)},
+            }
+        return await self.async_port.retrieve_checkout_session(session_id=session_id)
+
+    # records a verified webhook event for the background worker
+    # returns None when the event type is not relevant, False for a redelivered event
+    def record_webhook_event(self, event: Dict[str, Any]) -> Optional[bool]:
+        mapped = event_action(event)
+        event_id = event.get("id")
+        if mapped is None or not event_id:
+            return None
+        session_id, action = mapped
+        return self.repo.insert_event(self.db, str(event_id), event["type"], session_id, action)
+
+    # applies a batch of pending webhook events in one transaction:
+    # one UPDATE per target status for payments, one for invoices
+    def apply_pending_events(self, limit: int = 200) -> int:
         try:
-            payment = self.repo.get_by_invoice_number(self.db, invoice_number)
-            if not payment:
-                raise ValueError("Payment not found for this invoice_number.")
+            events = self.repo.claim_pending_events(self.db, limit)
+            if not events:
+                self.db.rollback()
+                return 0
 
-            payment.payment_status = "paid"
-            payment = self.repo.update(self.db, payment)
+            paid = sorted({e.session_id for e in events if e.action == "paid"})
+            failed = sorted({e.session_id for e in events if e.action == "failed"} - set(paid))
 
-            self.invoices.mark_paid_by_number(invoice_number)
+            newly_paid = self.repo.set_status_by_processor_refs(
+                self.db, paid, "paid", from_statuses=("incomplete", "failed")
+            )
+            self.invoices.mark_paid_by_numbers([number for _, number in newly_paid if number])
+            newly_failed = self.repo.set_status_by_processor_refs(
+                self.db, failed, "failed", from_statuses=("incomplete",)
+            )
+            changed = {ref for ref, _ in newly_paid + newly_failed}
 
-            return payment
+            self.repo.mark_events_processed(
+                self.db,
+                {e.event_id: "applied" if e.session_id in changed else "skipped" for e in events},
+                processed_at=datetime.now(timezone.utc),
+            )
+            self.db.commit()
+            return len(events)
+        except Exception:
+            self.db.rollback()
+            raise
+
+    # reference: processor session id (processor_ref) or invoice number
+    def mark_paid_by_invoice(self, reference: str) -> Payment:
+        try:
+            payment = self.repo.get_by_reference(self.db, reference)
+            if not payment:
+                raise ValueError("Payment not found for this reference.")
+
+            payment.payment_status = "paid"
+            if payment.invoice_number:
+                self.invoices.mark_paid_by_numbers([payment.invoice_number])
+            return self.repo.update(self.db, payment)
         except Exception:
             self.db.rollback()
             raise
 
-    def mark_failed_by_invoice(self, invoice_number: str) -> Payment:
-        payment = self.repo.get_by_invoice_number(self.db, invoice_number)
+    def mark_failed_by_invoice(self, reference: str) -> Payment:
+        payment = self.repo.get_by_reference(self.db, reference)
         if not payment:
-            raise ValueError("Payment not found for this invoice_number.")
+            raise ValueError("Payment not found for this reference.")
         payment.payment_status = "failed"
         return self.repo.update(self.db, payment)
 
@@ -140,10 +255,12 @@ def get_payments_service(
     db: Session = Depends(get_db),
     port: PaymentPort = Depends(get_payment_adapter),
     invoices_service: InvoicesService = Depends(get_invoices_service),
+    async_port: AsyncPaymentPort = Depends(get_async_payment_adapter),
 ) -> PaymentsService:
     return PaymentsService(
         db=db,
         repo=PaymentsRepository(),
         port=port,
         invoices_service=invoices_service,
+        async_port=async_port,
     )
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""
+Settlement job: captures authorised (manual-capture) payments of bookings that have ended.
+
+    python -m app.payments.settlement --concurrency 32
+    python -m app.payments.settlement --ended-before 2025-01-31T23:59:59Z --limit 1000
+
+- payments are read in keyset-paginated batches and captured concurrently through the
+  AsyncPaymentPort, bounded by --concurrency
+- each batch's outcomes are written with one executemany UPDATE
+- resumable: progress lives in payments.captured_at, so an interrupted run simply
+  continues with whatever is still uncaptured
+- idempotent: captures use a deterministic idempotency key per PaymentIntent and the
+  UPDATE never touches rows that are already captured; payments that keep failing are
+  skipped after --max-attempts runs
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from .ports.async_payment_port import AsyncPaymentPort, PaymentProcessorUnavailable
+from .ports.stripe_http_adapter import close_shared_http_client, get_async_payment_adapter
+from .repository import PaymentsRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SettlementSummary:
+    scanned: int = 0
+    captured: int = 0
+    failed: int = 0
+    deferred: int = 0
+    stopped_early: bool = False
+    elapsed_s: float = 0.0
+
+
+class SettlementJob:
+    def __init__(
+        self,
+        port: AsyncPaymentPort,
+        session_factory: Callable[[], Session] = SessionLocal,
+        repo: Optional[PaymentsRepository] = None,
+        concurrency: int = 16,
+        batch_size: int = 500,
+        max_attempts: int = 5,
+    ):
+        self.port = port
+        self.session_factory = session_factory
+        self.repo = repo or PaymentsRepository()
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+
+    async def run(self, ended_before: Optional[datetime] = None, limit: Optional[int] = None) -> SettlementSummary:
+        ended_before = ended_before or datetime.now(timezone.utc)
+        summary = SettlementSummary()
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        after: Optional[UUID] = None
+
+        db = self.session_factory()
+        try:
+            while limit is None or summary.scanned < limit:
+                size = self.batch_size if limit is None else min(self.batch_size, limit - summary.scanned)
+                batch = self.repo.list_capturable(db, ended_before, after, size, self.max_attempts)
+                # release the snapshot while the captures run
+                db.rollback()
+                if not batch:
+                    break
+                after = batch[-1][0]
+                summary.scanned += len(batch)
+
+                outcomes = await asyncio.gather(
+                    *(self._settle(semaphore, payment_id, ref) for payment_id, ref in batch)
+                )
+                results = [o for o in outcomes if o is not None]
+                self.repo.record_capture_results(db, results)
+
+                captured = sum(1 for r in results if r["captured_at"] is not None)
+                summary.captured += captured
+                summary.failed += len(results) - captured
+                summary.deferred += len(batch) - len(results)
+                logger.info("Settlement batch: %d payments, %d captured", len(batch), captured)
+
+                # the processor is unavailable (circuit open): stop, the next run resumes
+                if len(results) < len(batch):
+                    summary.stopped_early = True
+                    break
+        finally:
+            db.close()
+
+        summary.elapsed_s = round(time.perf_counter() - started, 3)
+        return summary
+
+    # returns the outcome to record, or None when the payment should be retried by a later run
+    async def _settle(self, semaphore: asyncio.Semaphore, payment_id: UUID, processor_ref: str) -> Optional[dict]:
+        async with semaphore:
+            try:
+                intent_id = await self._resolve_payment_intent(processor_ref)
+                await self.port.capture(intent_id, idempotency_key=f"capture-{intent_id}")
+            except PaymentProcessorUnavailable:
+                return None
+            except Exception as e:
+                # a capture that already happened (earlier run, other worker) counts as captured
+                if await self._already_captured(processor_ref):
+                    return {"payment_id": payment_id, "captured_at": datetime.now(timezone.utc), "capture_error": None}
+                return {"payment_id": payment_id, "captured_at": None, "capture_error": str(e)[:500]}
+        return {"payment_id": payment_id, "captured_at": datetime.now(timezone.utc), "capture_error": None}
+
+    # processor_ref is a Checkout session id; captures need its PaymentIntent
+    async def _resolve_payment_intent(self, processor_ref: str) -> str:
+        if processor_ref.startswith("pi_"):
+            return processor_ref
+        session = await self.port.retrieve_checkout_session(processor_ref)
+        intent_id = session.get("payment_intent")
+        if not intent_id:
+            raise ValueError("Checkout session has no PaymentIntent.")
+        return intent_id
+
+    async def _already_captured(self, processor_ref: str) -> bool:
+        try:
+            intent = await self.port.get_payment_intent(await self._resolve_payment_intent(processor_ref))
+        except Exception:
+            return False
+        return bool(intent) and intent.get("status") == "succeeded"
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Capture authorised payments of ended bookings.")
+    parser.add_argument("--ended-before", type=datetime.fromisoformat, default=None,
+                        help="settle bookings that ended before this ISO timestamp (default: now)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--max-attempts", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many payments")
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> SettlementSummary:
+    job = SettlementJob(
+        port=get_async_payment_adapter(),
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        max_attempts=args.max_attempts,
+    )
+    try:
+        return await job.run(ended_before=args.ended_before, limit=args.limit)
+    finally:
+        await close_shared_http_client()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    print(json.dumps(asdict(asyncio.run(_main(_parse_args()))), indent=2))
@@ -0,0 +1,74 @@
+import hashlib
+import hmac
+import time
+from typing import Any, Dict, Optional
+
+# Stripe webhook signature: header "Stripe-Signature: t=<unix ts>,v1=<hex hmac>[,v1=...]"
+# where the HMAC-SHA256 is computed over "<t>.<raw body>" with the endpoint secret
+DEFAULT_TOLERANCE_SECONDS = 300
+
+# processor event type -> payment status it settles
+EVENT_ACTIONS = {
+    "checkout.session.completed": "paid",
+    "checkout.session.async_payment_succeeded": "paid",
+    "checkout.session.async_payment_failed": "failed",
+    "checkout.session.expired": "failed",
+}
+
+
+def compute_signature(payload: bytes, timestamp: int, secret: str) -> str:
+    signed = f"{timestamp}.".encode() + payload
+    return hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
+
+
+def verify_signature(
+    payload: bytes,
+    header: Optional[str],
+    secret: str,
+    tolerance: int = DEFAULT_TOLERANCE_SECONDS,
+    now: Optional[float] = None,
+) -> None:
+    if not header:
+        raise ValueError("Missing Stripe-Signature header.")
+
+    timestamp: Optional[int] = None
+    signatures: list[str] = []
+    for item in header.split(","):
+        key, _, value = item.strip().partition("=")
+        if key == "t":
+            try:
+                timestamp = int(value)
+            except ValueError:
+                raise ValueError("Invalid signature timestamp.")
+        elif key == "v1":
+            signatures.append(value)
+
+    if timestamp is None or not signatures:
+        raise ValueError("Malformed Stripe-Signature header.")
+
+    # replay protection: reject events signed too long ago (or too far in the future)
+    current = time.time() if now is None else now
+    if abs(current - timestamp) > tolerance:
+        raise ValueError("Signature timestamp outside the tolerance window.")
+
+    expected = compute_signature(payload, timestamp, secret)
+    if not any(hmac.compare_digest(expected, candidate) for candidate in signatures):
+        raise ValueError("Signature mismatch.")
+
+
+# returns (session_id, action) for events that settle a payment, None for anything else
+def event_action(event: Dict[str, Any]) -> Optional[tuple[str, str]]:
+    action = EVENT_ACTIONS.get(event.get("type", ""))
+    if action is None:
+        return None
+
+    session = (event.get("data") or {}).get("object") or {}
+    session_id = session.get("id")
+    if not session_id:
+        return None
+
+    # a completed session paid with a delayed method stays unpaid until
+    # async_payment_succeeded / async_payment_failed arrives
+    if event["type"] == "checkout.session.completed" and session.get("payment_status") == "unpaid":
+        return None
+    return session_id, action
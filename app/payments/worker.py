@@ -0,0 +1,88 @@
+import logging
+import threading
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.invoices.repository import InvoicesRepository
+from app.invoices.service import InvoicesService
+from .ports.stripe_adapter import get_payment_adapter
+from .repository import PaymentsRepository
+from .service import PaymentsService
+
+logger = logging.getLogger(__name__)
+
+
+# Background thread applying recorded webhook events to payments and invoices
+# - woken by the webhook route (notify) and otherwise polls, so events recorded by
+#   other processes or left over from a restart are picked up as well
+# - waits `linger` seconds after a wake-up so bursts of events share one batch
+# - keeps draining without sleeping while full batches come back
+class PaymentEventWorker:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 200,
+        poll_interval: float = 5.0,
+        linger: float = 0.2,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.linger = linger
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="payment-event-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # applies one batch; returns the number of events processed
+    def run_once(self) -> int:
+        db = self.session_factory()
+        try:
+            service = PaymentsService(
+                db=db,
+                repo=PaymentsRepository(),
+                port=get_payment_adapter(),
+                invoices_service=InvoicesService(db=db, repo=InvoicesRepository()),
+            )
+            return service.apply_pending_events(limit=self.batch_size)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception:
+                logger.exception("Payment event worker: batch failed")
+                processed = 0
+
+            if processed >= self.batch_size:
+                continue
+            if self._wake.wait(self.poll_interval) and not self._stop.is_set():
+                self._stop.wait(self.linger)
+            self._wake.clear()
+
+
+payment_event_worker = PaymentEventWorker(
+    batch_size=settings.PAYMENT_EVENTS_BATCH_SIZE,
+    poll_interval=settings.PAYMENT_EVENTS_POLL_SECONDS,
+)
@@ -0,0 +1,12 @@
+"""
+Public interface for the Payouts domain module.
+"""
+
+from .routes import router
+from .service import PayoutsService, get_payouts_service
+
+__all__ = [
+    "router",
+    "PayoutsService",
+    "get_payouts_service",
+]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, Numeric, func
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, CHAR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+# Entity class for table payout_statements
+# Cached per-currency totals of a provider's closed statement period (month of booking end)
+class PayoutStatement(Base):
+    __tablename__ = "payout_statements"
+
+    provider_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("users.customer_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    currency: Mapped[str] = mapped_column(CHAR(3), primary_key=True)
+
+    booking_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    invoiced_total: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    paid_total: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    outstanding_total: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    captured_total: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+# Closed periods of a provider whose statements are cached in payout_statements; a
+# period without bookings has a row here and none there
+class PayoutClosedPeriod(Base):
+    __tablename__ = "payout_closed_periods"
+
+    provider_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("users.customer_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Iterator, Sequence
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.bookings.models import Booking
+from app.invoices.models import Invoice
+from app.payments.models import Payment
+from .models import PayoutClosedPeriod, PayoutStatement
+
+TOTAL_COLUMNS = ("booking_count", "invoiced_total", "paid_total", "outstanding_total", "captured_total")
+
+
+class PayoutsRepository:
+    # one row per invoiced booking of the provider that ended in [start, end)
+    # captured_total is a correlated sum over the booking's captured payments (covering index)
+    def _provider_bookings(self, provider_id: UUID, start: datetime, end: datetime, *columns):
+        captured = (
+            select(func.coalesce(func.sum(Payment.amount_total), 0))
+            .where(Payment.booking_id == Invoice.booking_id, Payment.captured_at.is_not(None))
+            .correlate(Invoice)
+            .scalar_subquery()
+        )
+        return (
+            select(*columns, captured.label("captured_total"))
+            .select_from(Invoice)
+            .join(Booking, Booking.booking_id == Invoice.booking_id)
+            .where(
+                Invoice.provider_id == provider_id,
+                Booking.end_timestamp >= start,
+                Booking.end_timestamp < end,
+            )
+        )
+
+    # per (month, currency) totals for every month in [start, end), computed in one query
+    def aggregate_periods(self, db: Session, provider_id: UUID, start: datetime, end: datetime) -> list[dict[str, Any]]:
+        period = func.date_trunc("month", func.timezone("UTC", Booking.end_timestamp))
+        bookings = self._provider_bookings(
+            provider_id, start, end,
+            period.label("period_start"),
+            Invoice.currency,
+            Invoice.amount_total,
+            Invoice.status,
+        ).subquery()
+
+        amount, status = bookings.c.amount_total, bookings.c.status
+        stmt = (
+            select(
+                bookings.c.period_start,
+                bookings.c.currency,
+                func.count().label("booking_count"),
+                func.coalesce(func.sum(amount).filter(status != "void"), 0).label("invoiced_total"),
+                func.coalesce(func.sum(amount).filter(status == "paid"), 0).label("paid_total"),
+                func.coalesce(func.sum(amount).filter(status.in_(("draft", "issued"))), 0).label("outstanding_total"),
+                func.coalesce(func.sum(bookings.c.captured_total), 0).label("captured_total"),
+            )
+            .group_by(bookings.c.period_start, bookings.c.currency)
+            .order_by(bookings.c.period_start, bookings.c.currency)
+        )
+        return [
+            {**row._asdict(), "period_start": row.period_start.date()}
+            for row in db.execute(stmt)
+        ]
+
+    # the given periods that are cached (with or without statement rows)
+    def get_closed_periods(self, db: Session, provider_id: UUID, periods: Sequence[date]) -> set[date]:
+        if not periods:
+            return set()
+        return set(
+            db.scalars(
+                select(PayoutClosedPeriod.period_start).where(
+                    PayoutClosedPeriod.provider_id == provider_id,
+                    PayoutClosedPeriod.period_start.in_(list(periods)),
+                )
+            )
+        )
+
+    def get_cached(self, db: Session, provider_id: UUID, periods: Sequence[date]) -> list[PayoutStatement]:
+        if not periods:
+            return []
+        return (
+            db.query(PayoutStatement)
+            .filter(
+                PayoutStatement.provider_id == provider_id,
+                PayoutStatement.period_start.in_(list(periods)),
+            )
+            .order_by(PayoutStatement.period_start, PayoutStatement.currency)
+            .all()
+        )
+
+    # periods: closed periods to mark as cached; rows: their aggregate_periods output
+    # (empty periods have none); one transaction, concurrent writers are harmless
+    def store_cached(
+        self,
+        db: Session,
+        provider_id: UUID,
+        periods: Sequence[date],
+        rows: list[dict[str, Any]],
+    ) -> None:
+        if not periods:
+            return
+        if rows:
+            values = [
+                {"provider_id": provider_id, "period_start": r["period_start"], "currency": r["currency"],
+                 **{c: r[c] for c in TOTAL_COLUMNS}}
+                for r in rows
+            ]
+            db.execute(insert(PayoutStatement).values(values).on_conflict_do_nothing())
+        db.execute(
+            insert(PayoutClosedPeriod)
+            .values([{"provider_id": provider_id, "period_start": p} for p in periods])
+            .on_conflict_do_nothing()
+        )
+        db.commit()
+
+    # streams line items as row tuples ordered as `columns` (server-side cursor)
+    def iter_line_items(
+        self,
+        db: Session,
+        provider_id: UUID,
+        start: datetime,
+        end: datetime,
+        columns: Sequence[str],
+        chunk_size: int = 1000,
+    ) -> Iterator[tuple]:
+        sources = {
+            "booking_id": Invoice.booking_id,
+            "hardware_id": Booking.hardware_id,
+            "invoice_number": Invoice.invoice_number,
+            "invoice_status": Invoice.status,
+            "start_timestamp": Booking.start_timestamp,
+            "end_timestamp": Booking.end_timestamp,
+            "currency": Invoice.currency,
+            "amount_total": Invoice.amount_total,
+            "issued_at": Invoice.issued_at,
+        }
+        selected = [sources[c].label(c) for c in columns if c != "captured_total"]
+        stmt = (
+            self._provider_bookings(provider_id, start, end, *selected)
+            .order_by(Booking.end_timestamp, Invoice.booking_id)
+            .execution_options(yield_per=chunk_size)
+        )
+        for row in db.execute(stmt):
+            record = row._mapping
+            yield tuple(record[c] for c in columns)
@@ -0,0 +1,58 @@
+"""
+Payout statements for providers: monthly earnings per currency, aggregated from
+invoices and captured payments of bookings that ended in the period.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.auth import get_current_user
+from app.serialization import ndjson_response
+from app.users import User
+
+from .schemas import PayoutStatementRead
+from .service import PayoutsService, get_payouts_service
+
+router = APIRouter()
+
+
+@router.get("/statements", response_model=list[PayoutStatementRead])
+def list_statements(
+    period_from: Optional[str] = Query(None, alias="from", description="YYYY-MM, default: 11 months before `to`"),
+    period_to: Optional[str] = Query(None, alias="to", description="YYYY-MM, default: current month"),
+    user: User = Depends(get_current_user),
+    service: PayoutsService = Depends(get_payouts_service),
+):
+    try:
+        return service.list_statements(user.customer_id, period_from, period_to)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/statements/{period}", response_model=PayoutStatementRead)
+def get_statement(
+    period: str,
+    user: User = Depends(get_current_user),
+    service: PayoutsService = Depends(get_payouts_service),
+):
+    try:
+        return service.get_statement(user.customer_id, period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# NDJSON, one line per booking; streamed from a server-side cursor
+@router.get("/statements/{period}/lines")
+def stream_statement_lines(
+    period: str,
+    user: User = Depends(get_current_user),
+    service: PayoutsService = Depends(get_payouts_service),
+):
+    try:
+        columns, rows = service.iter_line_items(user.customer_id, period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ndjson_response(columns, rows)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+# API contract models (DTOs) for payout statement endpoints
+class PayoutTotals(BaseModel):
+    currency: str
+    booking_count: int
+    invoiced_total: Decimal
+    paid_total: Decimal
+    outstanding_total: Decimal
+    captured_total: Decimal
+
+
+class PayoutStatementRead(BaseModel):
+    provider_id: UUID
+    period: str
+    period_start: date
+    period_end: date
+    closed: bool
+    totals: list[PayoutTotals]
+
+
+# one statement line per booking that ended in the period
+class PayoutLineItem(BaseModel):
+    booking_id: UUID
+    hardware_id: UUID
+    invoice_number: str
+    invoice_status: str
+    start_timestamp: datetime
+    end_timestamp: datetime
+    currency: str
+    amount_total: Decimal
+    captured_total: Decimal
+    issued_at: Optional[datetime] = None
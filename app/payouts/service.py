@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Iterator, Optional
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal, get_db
+from app.serialization import schema_columns
+from .repository import PayoutsRepository, TOTAL_COLUMNS
+from .schemas import PayoutLineItem
+
+MAX_PERIODS = 36
+
+
+# "2025-03" -> date(2025, 3, 1)
+def parse_period(period: str) -> date:
+    try:
+        return datetime.strptime(period, "%Y-%m").date()
+    except ValueError:
+        raise ValueError("Period must be formatted as YYYY-MM.")
+
+
+def _add_months(period_start: date, months: int) -> date:
+    index = period_start.year * 12 + period_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _utc(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+# consecutive months as (first, last) runs: [Jan, Feb, Apr] -> [(Jan, Feb), (Apr, Apr)]
+def _runs(periods: list[date]) -> list[tuple[date, date]]:
+    runs: list[tuple[date, date]] = []
+    for p in periods:
+        if runs and _add_months(runs[-1][1], 1) == p:
+            runs[-1] = (runs[-1][0], p)
+        else:
+            runs.append((p, p))
+    return runs
+
+
+class PayoutsService:
+    def __init__(
+        self,
+        db: Session,
+        repo: PayoutsRepository,
+        session_factory: Callable[[], Session] = SessionLocal,
+        close_after_days: int = 7,
+    ):
+        self.db = db
+        self.repo = repo
+        self.session_factory = session_factory
+        self.close_after_days = close_after_days
+
+    # a period is closed (and cacheable) once late captures of its bookings have settled
+    def is_closed(self, period_start: date, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now(timezone.utc)
+        return _utc(_add_months(period_start, 1)) + timedelta(days=self.close_after_days) <= now
+
+    # statements for every month from `first` to `last` (inclusive), oldest first
+    # defaults: the current month and the eleven before it
+    # cached closed months (marked in payout_closed_periods, empty ones included) come
+    # from payout_statements; the rest is aggregated with one query per run of
+    # consecutive uncached months
+    def list_statements(
+        self,
+        provider_id: UUID,
+        first: Optional[str] = None,
+        last: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        end = parse_period(last) if last else datetime.now(timezone.utc).date().replace(day=1)
+        start = parse_period(first) if first else _add_months(end, -11)
+        if end < start:
+            raise ValueError("Period range is reversed.")
+        periods = []
+        while start <= end:
+            periods.append(start)
+            start = _add_months(start, 1)
+        if len(periods) > MAX_PERIODS:
+            raise ValueError(f"At most {MAX_PERIODS} periods per request.")
+
+        totals: dict[date, list[dict[str, Any]]] = {p: [] for p in periods}
+        closed = [p for p in periods if self.is_closed(p)]
+        cached_periods = self.repo.get_closed_periods(self.db, provider_id, closed)
+        for cached in self.repo.get_cached(self.db, provider_id, sorted(cached_periods)):
+            totals[cached.period_start].append(
+                {"currency": cached.currency, **{c: getattr(cached, c) for c in TOTAL_COLUMNS}}
+            )
+
+        missing = [p for p in periods if p not in cached_periods]
+        for run_first, run_last in _runs(missing):
+            rows = self.repo.aggregate_periods(
+                self.db, provider_id, _utc(run_first), _utc(_add_months(run_last, 1))
+            )
+            for row in rows:
+                totals[row["period_start"]].append({k: v for k, v in row.items() if k != "period_start"})
+
+            self.repo.store_cached(
+                self.db,
+                provider_id,
+                [p for p in missing if run_first <= p <= run_last and self.is_closed(p)],
+                [r for r in rows if self.is_closed(r["period_start"])],
+            )
+
+        return [
+            {
+                "provider_id": provider_id,
+                "period": p.strftime("%Y-%m"),
+                "period_start": p,
+                "period_end": _add_months(p, 1) - timedelta(days=1),
+                "closed": self.is_closed(p),
+                "totals": totals[p],
+            }
+            for p in periods
+        ]
+
+    def get_statement(self, provider_id: UUID, period: str) -> dict[str, Any]:
+        return self.list_statements(provider_id, period, period)[0]
+
+    # statement lines for streaming: runs on its own session, because the response body is
+    # produced after the request-scoped session has been closed
+    def iter_line_items(self, provider_id: UUID, period: str) -> tuple[tuple[str, ...], Iterator[tuple]]:
+        start = parse_period(period)
+        columns = schema_columns(PayoutLineItem)
+
+        def rows() -> Iterator[tuple]:
+            db = self.session_factory()
+            try:
+                yield from self.repo.iter_line_items(
+                    db, provider_id, _utc(start), _utc(_add_months(start, 1)), columns
+                )
+            finally:
+                db.close()
+
+        return columns, rows()
+
+# Dependency provider wiring the service and its collaborators
+def get_payouts_service(db: Session = Depends(get_db)) -> PayoutsService:
+    return PayoutsService(
+        db=db,
+        repo=PayoutsRepository(),
+        close_after_days=settings.PAYOUT_STATEMENT_CLOSE_DAYS,
+    )
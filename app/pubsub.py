@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import logging
+import select
+import threading
+from collections import defaultdict
+from typing import Callable, Optional
+
+from sqlalchemy import func
+from sqlalchemy import select as sql_select
+from sqlalchemy.engine import Engine
+
+from app.database import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+# Cross-process notifications over PostgreSQL LISTEN/NOTIFY
+# - publish() sends a NOTIFY on its own short transaction (payloads are plain strings,
+#   Postgres caps them at 8000 bytes)
+# - PgListener keeps one dedicated connection per process, LISTENs on every subscribed
+#   channel and runs the callbacks on its background thread; callbacks must be quick
+#   and must not raise
+# - the connection is re-established after errors; notifications sent while it is down
+#   are lost, so subscribers must tolerate gaps (caches fall back to their TTL)
+# - relies on the psycopg2 driver (poll() / notifies)
+
+
+def publish(channel: str, payload: str = "", bind: Optional[Engine] = None) -> None:
+    with (bind or default_engine).begin() as conn:
+        conn.execute(sql_select(func.pg_notify(channel, payload)))
+
+
+class PgListener:
+    def __init__(self, engine: Engine, poll_interval: float = 1.0, reconnect_delay: float = 5.0):
+        self.engine = engine
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self._callbacks: dict[str, list[Callable[[str], None]]] = defaultdict(list)
+        self._unlistened: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        with self._lock:
+            if channel not in self._callbacks:
+                self._unlistened.add(channel)
+            self._callbacks[channel].append(callback)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pg-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("pg listener: connection lost, reconnecting")
+                self._stop.wait(self.reconnect_delay)
+
+    def _listen(self) -> None:
+        raw = self.engine.raw_connection()
+        try:
+            conn = raw.driver_connection
+            conn.autocommit = True
+            with self._lock:
+                # every channel is (re-)LISTENed on a fresh connection
+                self._unlistened = set(self._callbacks)
+
+            while not self._stop.is_set():
+                self._listen_new_channels(conn)
+                if select.select([conn], [], [], self.poll_interval) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    self._dispatch(notify.channel, notify.payload)
+        finally:
+            raw.invalidate()
+
+    def _listen_new_channels(self, conn) -> None:
+        with self._lock:
+            channels, self._unlistened = self._unlistened, set()
+        if channels:
+            with conn.cursor() as cursor:
+                for channel in channels:
+                    cursor.execute(f'LISTEN "{channel}"')
+
+    def _dispatch(self, channel: str, payload: str) -> None:
+        with self._lock:
+            callbacks = list(self._callbacks.get(channel, ()))
+        for callback in callbacks:
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("pg listener: callback for %s failed", channel)
+
+
+pg_listener = PgListener(default_engine)
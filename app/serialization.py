@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Sequence
+
+import orjson
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+# Fast path for large list responses
+# Routes fetch plain row tuples (no ORM entities), map them to dicts keyed by the
+# response schema's field names and return a FastJSONResponse directly, which
+# FastAPI sends as-is (no per-row model construction, no response_model re-validation)
+
+
+def _default(obj: Any) -> Any:
+    # pydantic serialises Decimal as a string in JSON mode, keep the same wire format
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        # OPT_UTC_Z renders UTC datetimes as "...Z", like pydantic does
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+# field names of a response schema, in declaration order; repositories select exactly these columns
+def schema_columns(schema: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(schema.model_fields)
+
+
+def rows_to_records(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> list[dict[str, Any]]:
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def rows_response(columns: Sequence[str], rows: Iterable[Sequence[Any]], status_code: int = 200) -> FastJSONResponse:
+    return FastJSONResponse(rows_to_records(columns, rows), status_code=status_code)
+
+
+# newline-delimited JSON, one record per row, emitted in chunks of `chunk_rows` lines
+def ndjson_lines(columns: Sequence[str], rows: Iterable[Sequence[Any]], chunk_rows: int = 500) -> Iterator[bytes]:
+    option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+    chunk: list[bytes] = []
+    for row in rows:
+        chunk.append(orjson.dumps(dict(zip(columns, row)), default=_default, option=option))
+        if len(chunk) >= chunk_rows:
+            yield b"".join(chunk)
+            chunk.clear()
+    if chunk:
+        yield b"".join(chunk)
+
+
+def ndjson_response(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> StreamingResponse:
+    return StreamingResponse(ndjson_lines(columns, rows), media_type="application/x-ndjson")
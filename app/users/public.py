@@ -8,6 +8,7 @@ from fastapi import Depends
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.loaders import BatchLoader
 from .repository import UsersRepository
 from .models import User
 
@@ -54,12 +55,17 @@ class UsersPublicImpl:
     def __init__(self, db: Session):
         self.db = db
         self.repo = UsersRepository()
+        # request-scoped: user lookups share IN queries and are memoised
+        self.users = BatchLoader(self._load_users)
+
+    def _load_users(self, user_ids: list[UUID]) -> dict[UUID, User]:
+        return {u.customer_id: u for u in self.repo.get_many(self.db, user_ids)}
 
     def get_or_create_by_email(self, email: str) -> User:
         return self.repo.get_or_create_by_email(self.db, email=email)
     
     def get_user(self, user_id: UUID) -> Optional[User]:
-        return self.repo.get(self.db, user_id)
+        return self.users.load(user_id)
 
     def get_user_by_email(self, email: str) -> Optional[User]:
         return self.repo.get_by_email(self.db, email)
@@ -1,7 +1,7 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Optional, Sequence
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -13,6 +13,11 @@ class UsersRepository:
     def get(self, db: Session, user_id: UUID) -> Optional[User]:
         return db.get(User, user_id)
 
+    def get_many(self, db: Session, user_ids: Sequence[UUID]) -> list[User]:
+        if not user_ids:
+            return []
+        return db.query(User).filter(User.customer_id.in_(list(user_ids))).all()
+
     def get_by_email(self, db: Session, email: str) -> Optional[User]:
         return db.query(User).filter(User.email == email).first()
 
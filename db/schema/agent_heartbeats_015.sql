@@ -0,0 +1,9 @@
+-- agent_heartbeats_015.sql
+-- Last heartbeat of each provider agent (app/machines/liveness.py). Every worker
+-- upserts the agents it hears from in batches; one worker at a time (advisory lock)
+-- marks machines offline whose row is older than the heartbeat timeout.
+
+CREATE TABLE IF NOT EXISTS agent_heartbeats (
+    hardware_id     UUID            PRIMARY KEY REFERENCES machines(hardware_id) ON DELETE CASCADE,
+    last_seen_at    TIMESTAMPTZ     NOT NULL DEFAULT NOW()
+);
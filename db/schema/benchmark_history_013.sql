@@ -0,0 +1,8 @@
+-- benchmark_history_013.sql
+-- A machine's benchmark history newest first (keyset pages, time buckets, compaction).
+-- Replaces the single-column hardware_id index, which is a prefix of the new one.
+
+CREATE INDEX IF NOT EXISTS idx_benchmarks_hardware_collected
+    ON benchmarks (hardware_id, collected_at, benchmark_id);
+
+DROP INDEX IF EXISTS idx_benchmarks_hardware_id;
@@ -0,0 +1,6 @@
+-- benchmark_plausibility_012.sql
+-- Automated plausibility check of benchmark submissions (score 1.000 = nothing suspicious).
+
+ALTER TABLE benchmarks
+    ADD COLUMN IF NOT EXISTS plausibility_score NUMERIC(4, 3),
+    ADD COLUMN IF NOT EXISTS plausibility_flags JSONB;
@@ -0,0 +1,48 @@
+-- benchmark_rankings_009.sql
+-- Precomputed leaderboards (app/benchmarks/ranking.py): the best approved value per
+-- metric and machine, once per GPU-model cohort and once for the whole marketplace ('*').
+
+CREATE TABLE IF NOT EXISTS benchmark_rankings (
+    metric          TEXT            NOT NULL,
+    cohort          TEXT            NOT NULL,
+    hardware_id     UUID            NOT NULL,
+    benchmark_id    UUID            NOT NULL,
+    value           NUMERIC(18,4)   NOT NULL,
+    updated_at      TIMESTAMPTZ     NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (metric, cohort, hardware_id),
+
+    CONSTRAINT fk_benchmark_rankings_hardware
+        FOREIGN KEY (hardware_id)
+        REFERENCES machines (hardware_id)
+        ON DELETE CASCADE,
+
+    CONSTRAINT fk_benchmark_rankings_benchmark
+        FOREIGN KEY (benchmark_id)
+        REFERENCES benchmarks (benchmark_id)
+        ON DELETE CASCADE
+);
+
+-- top-K per leaderboard
+CREATE INDEX IF NOT EXISTS idx_benchmark_rankings_leaderboard
+    ON benchmark_rankings (metric, cohort, value DESC);
+
+-- backfill from the benchmarks approved so far
+INSERT INTO benchmark_rankings (metric, cohort, hardware_id, benchmark_id, value)
+SELECT DISTINCT ON (v.metric, c.cohort, b.hardware_id)
+    v.metric, c.cohort, b.hardware_id, b.benchmark_id, v.value
+FROM benchmarks b
+JOIN machines m ON m.hardware_id = b.hardware_id
+CROSS JOIN LATERAL (VALUES
+    ('gpu_throughput_fp16', b.gpu_throughput_fp16),
+    ('gpu_throughput_fp32', b.gpu_throughput_fp32),
+    ('cpu_score', b.cpu_score),
+    ('disk_read_mb_s', b.disk_read_mb_s),
+    ('disk_write_mb_s', b.disk_write_mb_s),
+    ('network_bandwidth_gbps', b.network_bandwidth_gbps)
+) AS v (metric, value)
+CROSS JOIN LATERAL (VALUES (COALESCE(m.gpu_model, 'unknown')), ('*')) AS c (cohort)
+WHERE b.admin_verification_status = 'approved'
+  AND v.value IS NOT NULL
+ORDER BY v.metric, c.cohort, b.hardware_id, v.value DESC
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,6 @@
+-- benchmark_review_queue_011.sql
+-- Admin verification queue: pending benchmarks paged by (collected_at, benchmark_id).
+
+CREATE INDEX IF NOT EXISTS idx_benchmarks_pending_queue
+    ON benchmarks (collected_at, benchmark_id)
+    WHERE admin_verification_status = 'pending';
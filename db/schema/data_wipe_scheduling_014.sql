@@ -0,0 +1,9 @@
+-- data_wipe_scheduling_014.sql
+-- Scan position of the data wipe scheduler over ended bookings.
+
+CREATE TABLE IF NOT EXISTS data_wipe_watermarks (
+    name           TEXT            PRIMARY KEY,
+    end_timestamp  TIMESTAMPTZ     NOT NULL,
+    booking_id     UUID            NOT NULL,
+    updated_at     TIMESTAMPTZ     NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,4 @@
+-- fleet overview and live snapshots read the latest sample and a recent window per
+-- machine; both are a backward range scan on this index
+CREATE INDEX IF NOT EXISTS idx_metric_samples_hardware_recorded
+    ON metric_samples (hardware_id, recorded_at DESC);
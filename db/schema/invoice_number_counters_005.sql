@@ -0,0 +1,10 @@
+-- invoice_number_counters_005.sql
+-- Per-year counters for the block-based invoice number allocator
+-- (app/invoices/numbering.py). Each process reserves a block of numbers with one
+-- upsert ... RETURNING and hands them out locally; unused numbers leave gaps.
+
+CREATE TABLE IF NOT EXISTS invoice_number_counters (
+    year            INTEGER         PRIMARY KEY,
+    next_value      BIGINT          NOT NULL DEFAULT 1,
+    updated_at      TIMESTAMPTZ     NOT NULL DEFAULT NOW()
+);
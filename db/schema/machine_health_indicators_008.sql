@@ -0,0 +1,3 @@
+-- containment (@>) and jsonpath (@@, @?) filters on machines.health_indicators
+CREATE INDEX IF NOT EXISTS idx_machines_health_indicators
+    ON machines USING gin (health_indicators jsonb_path_ops);
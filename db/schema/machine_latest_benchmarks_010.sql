@@ -0,0 +1,45 @@
+-- machine_latest_benchmarks_010.sql
+-- Projection of the latest approved benchmark per machine, maintained by
+-- BenchmarkService.verify_benchmark, plus the partial index used to rebuild it.
+
+CREATE INDEX IF NOT EXISTS idx_benchmarks_approved_latest
+    ON benchmarks (hardware_id, collected_at DESC)
+    WHERE admin_verification_status = 'approved';
+
+CREATE TABLE IF NOT EXISTS machine_latest_benchmarks (
+    hardware_id             UUID            PRIMARY KEY,
+    benchmark_id            UUID            NOT NULL,
+    collected_at            TIMESTAMPTZ     NOT NULL,
+    gpu_throughput_fp16     NUMERIC(18,4),
+    gpu_throughput_fp32     NUMERIC(18,4),
+    cpu_score               NUMERIC(18,4),
+    disk_read_mb_s          NUMERIC(18,4),
+    disk_write_mb_s         NUMERIC(18,4),
+    network_bandwidth_gbps  NUMERIC(18,4),
+    updated_at              TIMESTAMPTZ     NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT fk_machine_latest_benchmarks_hardware
+        FOREIGN KEY (hardware_id)
+        REFERENCES machines (hardware_id)
+        ON DELETE CASCADE,
+
+    CONSTRAINT fk_machine_latest_benchmarks_benchmark
+        FOREIGN KEY (benchmark_id)
+        REFERENCES benchmarks (benchmark_id)
+        ON DELETE CASCADE
+);
+
+-- backfill
+INSERT INTO machine_latest_benchmarks (
+    hardware_id, benchmark_id, collected_at,
+    gpu_throughput_fp16, gpu_throughput_fp32, cpu_score,
+    disk_read_mb_s, disk_write_mb_s, network_bandwidth_gbps
+)
+SELECT DISTINCT ON (hardware_id)
+    hardware_id, benchmark_id, collected_at,
+    gpu_throughput_fp16, gpu_throughput_fp32, cpu_score,
+    disk_read_mb_s, disk_write_mb_s, network_bandwidth_gbps
+FROM benchmarks
+WHERE admin_verification_status = 'approved'
+ORDER BY hardware_id, collected_at DESC, benchmark_id DESC
+ON CONFLICT (hardware_id) DO NOTHING;
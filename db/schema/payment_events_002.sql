@@ -0,0 +1,25 @@
+-- payment_events_002.sql
+-- Processor webhook events: deduplicated by event_id, applied in batches by the
+-- payment event worker (app/payments/worker.py)
+
+CREATE TABLE IF NOT EXISTS payment_events (
+    event_id        TEXT            PRIMARY KEY,
+    event_type      TEXT            NOT NULL,
+    session_id      TEXT            NOT NULL,
+    action          TEXT            NOT NULL,
+    received_at     TIMESTAMPTZ     NOT NULL DEFAULT NOW(),
+    processed_at    TIMESTAMPTZ,
+    result          TEXT,
+
+    CONSTRAINT chk_payment_events_action
+        CHECK (action IN ('paid', 'failed'))
+);
+
+-- pending events in arrival order
+CREATE INDEX IF NOT EXISTS idx_payment_events_pending
+    ON payment_events (received_at)
+    WHERE processed_at IS NULL;
+
+-- batched status updates look payments up by invoice_number (Checkout session id)
+CREATE INDEX IF NOT EXISTS idx_payments_invoice_number
+    ON payments (invoice_number);
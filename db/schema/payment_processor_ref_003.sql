@@ -0,0 +1,34 @@
+-- payment_processor_ref_003.sql
+-- Dedicated processor reference on payments. Checkout session ids used to be stored
+-- in payments.invoice_number next to real invoice numbers; they move to processor_ref
+-- (unique), and invoice_number points at the booking's invoice again.
+
+ALTER TABLE payments
+    ADD COLUMN IF NOT EXISTS processor_ref TEXT;
+
+-- backfill: session ids ("cs_...") move to processor_ref; if the same session was
+-- recorded more than once, only the most recent payment keeps the reference
+WITH sessions AS (
+    SELECT
+        payment_id,
+        invoice_number AS session_id,
+        ROW_NUMBER() OVER (
+            PARTITION BY invoice_number
+            ORDER BY timestamp DESC, payment_id
+        ) AS rn
+    FROM payments
+    WHERE processor_ref IS NULL
+      AND invoice_number LIKE 'cs\_%'
+)
+UPDATE payments p
+SET processor_ref = CASE WHEN s.rn = 1 THEN s.session_id END,
+    invoice_number = (
+        SELECT i.invoice_number
+        FROM invoices i
+        WHERE i.booking_id = p.booking_id  -- one invoice per booking
+    )
+FROM sessions s
+WHERE p.payment_id = s.payment_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_payments_processor_ref
+    ON payments (processor_ref);
@@ -0,0 +1,16 @@
+-- payment_settlement_004.sql
+-- Capture bookkeeping for the settlement job (app/payments/settlement.py)
+
+ALTER TABLE payments
+    ADD COLUMN IF NOT EXISTS captured_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS capture_error TEXT,
+    ADD COLUMN IF NOT EXISTS capture_attempts INTEGER NOT NULL DEFAULT 0;
+
+-- authorised payments still waiting for capture (small, shrinks as settlement runs)
+CREATE INDEX IF NOT EXISTS idx_payments_pending_capture
+    ON payments (payment_id)
+    WHERE payment_status = 'paid' AND captured_at IS NULL AND processor_ref IS NOT NULL;
+
+-- settlement selects bookings by end time
+CREATE INDEX IF NOT EXISTS idx_bookings_end_timestamp
+    ON bookings (end_timestamp);
@@ -0,0 +1,46 @@
+-- payout_statements_006.sql
+-- Provider payout statements (app/payouts): cache of closed monthly periods and the
+-- composite indexes the set-based aggregation relies on.
+
+CREATE TABLE IF NOT EXISTS payout_statements (
+    provider_id         UUID            NOT NULL,
+    period_start        DATE            NOT NULL,
+    currency            CHAR(3)         NOT NULL,
+    booking_count       INTEGER         NOT NULL,
+    invoiced_total      NUMERIC(14,2)   NOT NULL,
+    paid_total          NUMERIC(14,2)   NOT NULL,
+    outstanding_total   NUMERIC(14,2)   NOT NULL,
+    captured_total      NUMERIC(14,2)   NOT NULL,
+    computed_at         TIMESTAMPTZ     NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (provider_id, period_start, currency),
+
+    CONSTRAINT fk_payout_statements_provider
+        FOREIGN KEY (provider_id)
+        REFERENCES users (customer_id)
+        ON DELETE CASCADE
+);
+
+-- closed periods cached above, including those without bookings (no statement rows)
+CREATE TABLE IF NOT EXISTS payout_closed_periods (
+    provider_id         UUID            NOT NULL,
+    period_start        DATE            NOT NULL,
+    computed_at         TIMESTAMPTZ     NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (provider_id, period_start),
+
+    CONSTRAINT fk_payout_closed_periods_provider
+        FOREIGN KEY (provider_id)
+        REFERENCES users (customer_id)
+        ON DELETE CASCADE
+);
+
+-- a provider's invoices (amount, currency and status served from the index)
+CREATE INDEX IF NOT EXISTS idx_invoices_provider_booking
+    ON invoices (provider_id, booking_id)
+    INCLUDE (amount_total, currency, status);
+
+-- captured amount per booking without visiting payments rows
+CREATE INDEX IF NOT EXISTS idx_payments_booking_captured
+    ON payments (booking_id, captured_at)
+    INCLUDE (amount_total);
@@ -0,0 +1,5 @@
+"""
+Performance suite for the marketplace API (seeding, load tests, micro-benchmarks).
+
+Not imported by the application; run the modules with `python -m perf.<module>`.
+"""
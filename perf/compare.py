@@ -0,0 +1,70 @@
+"""
+Compares two perf result files (loadtest or microbench) scenario by scenario.
+
+    python -m perf.compare perf/results/main.json perf/results/HEAD.json --fail-over 10
+
+Exits with status 1 when any scenario's p95 regresses by more than --fail-over percent.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+
+
+def _delta_pct(old: Optional[float], new: Optional[float]) -> Optional[float]:
+    if old in (None, 0) or new is None:
+        return None
+    return (new - old) / old * 100
+
+
+def compare(baseline: dict, candidate: dict, fail_over: Optional[float]) -> int:
+    regressions = []
+    print(f"baseline  {baseline.get('commit')}\ncandidate {candidate.get('commit')}\n")
+    header = f"{'scenario':<28}" + "".join(f"{m:>30}" for m in METRICS)
+    print(header)
+    print("-" * len(header))
+
+    for name, new in candidate["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            print(f"{name:<28} (new scenario)")
+            continue
+        cells = []
+        for metric in METRICS:
+            delta = _delta_pct(old.get(metric), new.get(metric))
+            delta_txt = f"{delta:+.1f}%" if delta is not None else "n/a"
+            cells.append(f"{old.get(metric)} -> {new.get(metric)} ({delta_txt})")
+        print(f"{name:<28}" + "".join(f"{c:>30}" for c in cells))
+
+        p95_delta = _delta_pct(old.get("p95_ms"), new.get("p95_ms"))
+        if fail_over is not None and p95_delta is not None and p95_delta > fail_over:
+            regressions.append((name, p95_delta))
+
+    if regressions:
+        print()
+        for name, delta in regressions:
+            print(f"REGRESSION {name}: p95 {delta:+.1f}% (limit {fail_over:+.1f}%)")
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--fail-over", type=float, help="max allowed p95 regression in percent")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    sys.exit(compare(baseline, candidate, args.fail_over))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Local fake payment processor speaking the subset of the Stripe REST API used by
+AsyncStripeAdapter. For development, the adapter tests (tests/payments) and load
+tests:
+
+    FAKE_PROCESSOR_FAILURE_RATE=0.2 FAKE_PROCESSOR_LATENCY_MS=50 \
+        uvicorn perf.fake_processor:app --port 12111
+
+    USE_REAL_STRIPE=true STRIPE_SECRET_KEY=sk_test_fake \
+        STRIPE_API_BASE=http://127.0.0.1:12111 uvicorn app.main:app
+
+Failure rate and latency can also be changed at runtime via POST /_control/config.
+"""
+
+import asyncio
+import os
+import random
+import uuid
+from threading import Lock
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="Fake payment processor")
+
+_lock = Lock()
+_sessions: Dict[str, Dict[str, Any]] = {}
+_intents: Dict[str, Dict[str, Any]] = {}
+_refunds: Dict[str, Dict[str, Any]] = {}
+# (idempotency key, path) -> (status code, response body)
+_idempotency: Dict[tuple[str, str], tuple[int, Dict[str, Any]]] = {}
+
+_config = {
+    "failure_rate": float(os.getenv("FAKE_PROCESSOR_FAILURE_RATE", "0")),
+    "latency_ms": float(os.getenv("FAKE_PROCESSOR_LATENCY_MS", "0")),
+}
+_stats = {"requests": 0, "injected_failures": 0, "idempotent_replays": 0}
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:24]}"
+
+
+def _error(status_code: int, message: str, error_type: str = "invalid_request_error") -> JSONResponse:
+    return JSONResponse({"error": {"type": error_type, "message": message}}, status_code=status_code)
+
+
+# unflattens Stripe's form encoding (line_items[0][price_data][currency]=eur) into dicts
+def _parse_form(body: bytes) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+    for key, value in parse_qsl(body.decode(), keep_blank_values=True):
+        parts = key.replace("]", "").split("[")
+        node = params
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = value
+    return params
+
+
+async def _simulate(request: Request) -> Optional[JSONResponse]:
+    _stats["requests"] += 1
+    if _config["latency_ms"]:
+        await asyncio.sleep(_config["latency_ms"] / 1000)
+    if not request.headers.get("authorization", "").startswith("Bearer "):
+        return _error(401, "No API key provided.")
+    if random.random() < _config["failure_rate"]:
+        _stats["injected_failures"] += 1
+        return _error(503, "Injected processor failure.", "api_error")
+    return None
+
+
+async def _post(request: Request, handler) -> JSONResponse:
+    failure = await _simulate(request)
+    if failure is not None:
+        return failure
+
+    params = _parse_form(await request.body())
+    key = request.headers.get("idempotency-key")
+    cache_key = (key, request.url.path) if key else None
+    with _lock:
+        if cache_key and cache_key in _idempotency:
+            _stats["idempotent_replays"] += 1
+            status_code, body = _idempotency[cache_key]
+            return JSONResponse(body, status_code=status_code, headers={"Idempotent-Replayed": "true"})
+
+        status_code, body = handler(params)
+        if cache_key and status_code < 500:
+            _idempotency[cache_key] = (status_code, body)
+    return JSONResponse(body, status_code=status_code)
+
+
+@app.post("/v1/checkout/sessions")
+async def create_checkout_session(request: Request):
+    def handler(params):
+        line_item = params.get("line_items", {}).get("0", {})
+        price = line_item.get("price_data", {})
+        try:
+            amount = int(price["unit_amount"]) * int(line_item.get("quantity", 1))
+        except (KeyError, ValueError):
+            return 400, {"error": {"type": "invalid_request_error", "message": "Missing unit_amount."}}
+
+        intent = {
+            "id": _new_id("pi"),
+            "object": "payment_intent",
+            "status": "requires_payment_method",
+            "amount": amount,
+            "currency": price.get("currency", "eur"),
+            "capture_method": params.get("payment_intent_data", {}).get("capture_method", "automatic"),
+            "client_secret": _new_id("secret"),
+            "amount_refunded": 0,
+        }
+        session_id = _new_id("cs_test")
+        session = {
+            "id": session_id,
+            "object": "checkout.session",
+            "url": f"{request.base_url}pay/{session_id}",
+            "payment_status": "unpaid",
+            "status": "open",
+            "payment_intent": intent["id"],
+            "customer_email": params.get("customer_email"),
+            "amount_total": amount,
+            "currency": intent["currency"],
+            "metadata": params.get("metadata", {}),
+        }
+        _intents[intent["id"]] = intent
+        _sessions[session_id] = session
+        return 200, session
+
+    return await _post(request, handler)
+
+
+@app.get("/v1/checkout/sessions/{session_id}")
+async def retrieve_checkout_session(session_id: str, request: Request):
+    failure = await _simulate(request)
+    if failure is not None:
+        return failure
+    session = _sessions.get(session_id)
+    if session is None:
+        return _error(404, f"No such checkout.session: '{session_id}'")
+    return session
+
+
+@app.get("/v1/payment_intents/{intent_id}")
+async def retrieve_payment_intent(intent_id: str, request: Request):
+    failure = await _simulate(request)
+    if failure is not None:
+        return failure
+    intent = _intents.get(intent_id)
+    if intent is None:
+        return _error(404, f"No such payment_intent: '{intent_id}'")
+    return intent
+
+
+def _transition(intent_id: str, allowed: set[str], new_status: str):
+    intent = _intents.get(intent_id)
+    if intent is None:
+        return 404, {"error": {"type": "invalid_request_error", "message": f"No such payment_intent: '{intent_id}'"}}
+    if intent["status"] not in allowed:
+        return 400, {"error": {
+            "type": "invalid_request_error",
+            "message": f"PaymentIntent has status {intent['status']}.",
+        }}
+    intent["status"] = new_status
+    return 200, intent
+
+
+@app.post("/v1/payment_intents/{intent_id}/capture")
+async def capture_payment_intent(intent_id: str, request: Request):
+    return await _post(request, lambda params: _transition(intent_id, {"requires_capture"}, "succeeded"))
+
+
+@app.post("/v1/payment_intents/{intent_id}/cancel")
+async def cancel_payment_intent(intent_id: str, request: Request):
+    return await _post(
+        request,
+        lambda params: _transition(
+            intent_id, {"requires_payment_method", "requires_capture", "requires_confirmation"}, "canceled"
+        ),
+    )
+
+
+@app.post("/v1/refunds")
+async def create_refund(request: Request):
+    def handler(params):
+        intent = _intents.get(params.get("payment_intent", ""))
+        if intent is None or intent["status"] != "succeeded":
+            return 400, {"error": {"type": "invalid_request_error", "message": "PaymentIntent is not refundable."}}
+        amount = int(params.get("amount", intent["amount"] - intent["amount_refunded"]))
+        if amount > intent["amount"] - intent["amount_refunded"]:
+            return 400, {"error": {"type": "invalid_request_error", "message": "Refund exceeds captured amount."}}
+        intent["amount_refunded"] += amount
+        refund = {"id": _new_id("re"), "object": "refund", "amount": amount,
+                  "payment_intent": intent["id"], "status": "succeeded"}
+        _refunds[refund["id"]] = refund
+        return 200, refund
+
+    return await _post(request, handler)
+
+
+# --- test controls (not part of the Stripe API) ---
+
+# simulates the customer completing Checkout: the PaymentIntent becomes authorised
+@app.post("/_control/sessions/{session_id}/complete")
+def complete_session(session_id: str):
+    with _lock:
+        session = _sessions.get(session_id)
+        if session is None:
+            return _error(404, f"No such checkout.session: '{session_id}'")
+        session["payment_status"] = "paid"
+        session["status"] = "complete"
+        intent = _intents[session["payment_intent"]]
+        intent["status"] = "requires_capture" if intent["capture_method"] == "manual" else "succeeded"
+        return session
+
+
+@app.post("/_control/config")
+async def update_config(request: Request):
+    updates = await request.json()
+    for key in ("failure_rate", "latency_ms"):
+        if key in updates:
+            _config[key] = float(updates[key])
+    return _config
+
+
+@app.get("/_control/stats")
+def stats():
+    return {**_stats, "sessions": len(_sessions), "payment_intents": len(_intents), "refunds": len(_refunds)}
@@ -0,0 +1,268 @@
+"""
+Drives the API hot paths at controlled concurrency and reports latency percentiles.
+
+Runs against a live server (uvicorn app.main:app) seeded with `python -m perf.seed`,
+authenticating with DEV_BEARER_TOKEN. Results are JSON so runs can be compared
+between commits with `python -m perf.compare`.
+
+    python -m perf.loadtest --concurrency 32 --requests 2000 --output perf/results/HEAD.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import httpx
+
+from app.config import settings
+
+from .seed import DEFAULT_MANIFEST
+
+API = "/api/v1"
+
+# (method, path, json body or None)
+RequestSpec = tuple[str, str, Optional[dict[str, Any]]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    build: Callable[[dict, random.Random], RequestSpec]
+
+
+def _machine(manifest: dict, rng: random.Random) -> str:
+    return rng.choice(manifest["dev_machine_ids"])
+
+
+def _listing(manifest: dict, rng: random.Random) -> dict:
+    return rng.choice(manifest["listings"])
+
+
+def _ingest(manifest: dict, rng: random.Random) -> RequestSpec:
+    body = {
+        "gpu_util": round(rng.uniform(0, 100), 2),
+        "cpu_util": round(rng.uniform(0, 100), 2),
+        "mem_used_gb": round(rng.uniform(0, 64), 2),
+        "net_rx_mb": round(rng.uniform(0, 500), 2),
+        "net_tx_mb": round(rng.uniform(0, 500), 2),
+    }
+    return "POST", f"{API}/metrics/machines/{_machine(manifest, rng)}/ingest", body
+
+
+def _latest(manifest: dict, rng: random.Random) -> RequestSpec:
+    return "GET", f"{API}/metrics/machines/{_machine(manifest, rng)}/latest", None
+
+
+def _history(manifest: dict, rng: random.Random) -> RequestSpec:
+    return "GET", f"{API}/metrics/machines/{_machine(manifest, rng)}?limit=5000", None
+
+
+def _listing_browse(manifest: dict, rng: random.Random) -> RequestSpec:
+    return "GET", f"{API}/listings/", None
+
+
+def _listing_lookup(manifest: dict, rng: random.Random) -> RequestSpec:
+    return "GET", f"{API}/listings/{_listing(manifest, rng)['listing_id']}", None
+
+
+def _booking_request(manifest: dict, rng: random.Random) -> RequestSpec:
+    start = datetime.now(timezone.utc) + timedelta(days=rng.randint(1, 365), hours=rng.randint(0, 23))
+    body = {
+        "listing_id": _listing(manifest, rng)["listing_id"],
+        "start_timestamp": start.isoformat(),
+        "end_timestamp": (start + timedelta(hours=rng.randint(1, 48))).isoformat(),
+    }
+    return "POST", f"{API}/bookings/request", body
+
+
+def _checkout(manifest: dict, rng: random.Random) -> RequestSpec:
+    listing = _listing(manifest, rng)
+    body = {
+        # checkout does not validate the booking; a synthetic id exercises the processor path only
+        "booking_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "hardware_id": listing["hardware_id"],
+        "amount": round(rng.uniform(5, 500), 2),
+        "currency": "EUR",
+    }
+    return "POST", f"{API}/payments/checkout", body
+
+
+SCENARIOS: dict[str, Scenario] = {
+    s.name: s
+    for s in (
+        Scenario("metrics_ingest", _ingest),
+        Scenario("metrics_latest", _latest),
+        Scenario("metrics_history", _history),
+        Scenario("listings_browse", _listing_browse),
+        Scenario("listings_lookup", _listing_lookup),
+        # request_booking has no overlap check, so every non-2xx here is a real error
+        Scenario("booking_request", _booking_request),
+        Scenario("payments_checkout", _checkout),
+    )
+}
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    concurrency: int
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_counts: dict[str, int] = field(default_factory=dict)
+    wall_time_s: float = 0.0
+
+    def summary(self) -> dict[str, Any]:
+        lat = sorted(self.latencies_ms)
+        n = len(lat)
+        return {
+            "concurrency": self.concurrency,
+            "requests": n + self.errors,
+            "errors": self.errors,
+            "status_counts": self.status_counts,
+            "throughput_rps": round(n / self.wall_time_s, 2) if self.wall_time_s else 0.0,
+            "mean_ms": round(sum(lat) / n, 3) if n else None,
+            "p50_ms": percentile(lat, 50),
+            "p95_ms": percentile(lat, 95),
+            "p99_ms": percentile(lat, 99),
+            "max_ms": round(lat[-1], 3) if n else None,
+        }
+
+
+# nearest-rank percentile over an already sorted list
+def percentile(sorted_values: list[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return round(sorted_values[rank - 1], 3)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    manifest: dict,
+    concurrency: int,
+    requests: int,
+    warmup: int,
+    seed: int,
+) -> ScenarioResult:
+    rng = random.Random(f"{seed}:{scenario.name}")
+    result = ScenarioResult(name=scenario.name, concurrency=concurrency)
+    remaining = warmup + requests
+    issued = 0
+    lock = asyncio.Lock()
+
+    async def worker():
+        nonlocal remaining, issued
+        while True:
+            async with lock:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+                issued += 1
+                is_warmup = issued <= warmup
+                method, path, body = scenario.build(manifest, rng)
+
+            started = time.perf_counter()
+            try:
+                resp = await client.request(method, path, json=body)
+                await resp.aread()
+                status = resp.status_code
+            except httpx.HTTPError:
+                status = None
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            if is_warmup:
+                continue
+            key = str(status) if status is not None else "transport_error"
+            result.status_counts[key] = result.status_counts.get(key, 0) + 1
+            if status is not None and 200 <= status < 300:
+                result.latencies_ms.append(elapsed_ms)
+            else:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.wall_time_s = time.perf_counter() - started
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    manifest = json.loads(args.manifest.read_text())
+    names = args.scenario or list(SCENARIOS)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    headers = {"Authorization": f"Bearer {args.token}"}
+    scenarios: dict[str, Any] = {}
+    async with httpx.AsyncClient(
+        base_url=args.base_url, headers=headers, limits=limits, timeout=args.timeout
+    ) as client:
+        for name in names:
+            result = await run_scenario(
+                client, SCENARIOS[name], manifest, args.concurrency, args.requests, args.warmup, args.seed
+            )
+            scenarios[name] = result.summary()
+            s = scenarios[name]
+            print(
+                f"{name:<20} rps={s['throughput_rps']:>8} p50={s['p50_ms']} p95={s['p95_ms']} "
+                f"p99={s['p99_ms']} errors={s['errors']}",
+                file=sys.stderr,
+            )
+
+    return {
+        "kind": "loadtest",
+        "commit": _git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "base_url": args.base_url,
+        "volumes": manifest.get("volumes"),
+        "scenarios": scenarios,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", default=settings.DEV_BEARER_TOKEN)
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per scenario")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
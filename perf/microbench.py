@@ -0,0 +1,227 @@
+"""
+In-process micro-benchmarks for CPU-bound hot paths (no database or server needed).
+
+Output uses the same JSON shape as perf.loadtest so perf.compare works on both.
+
+    python -m perf.microbench --output perf/results/micro-HEAD.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.listings.schemas import ListingRead
+from app.metrics.columnar import _unpack_float32, encode_columnar
+from app.metrics.schemas import MetricSampleListItem
+from app.serialization import rows_response, schema_columns
+
+from .loadtest import _git_commit, percentile
+
+# name -> (setup returning the callable under test, description)
+BENCHMARKS: dict[str, tuple[Callable[[int], Callable[[], Any]], str]] = {}
+
+
+def benchmark(name: str, description: str):
+    def register(setup: Callable[[int], Callable[[], Any]]):
+        BENCHMARKS[name] = (setup, description)
+        return setup
+    return register
+
+
+def make_metric_rows(n: int) -> list[SimpleNamespace]:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            hardware_id=uuid.UUID(int=1),
+            recorded_at=start + timedelta(minutes=i),
+            gpu_util=float(i % 100),
+            cpu_util=float((i * 7) % 100),
+            mem_used_gb=12.5 + i % 10,
+            net_rx_mb=float(i % 500),
+            net_tx_mb=float((i * 3) % 500),
+        )
+        for i in range(n)
+    ]
+
+
+def make_listing_rows(n: int) -> list[SimpleNamespace]:
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            listing_id=uuid.uuid4(),
+            hardware_id=uuid.uuid4(),
+            price_hour=Decimal("1.25"),
+            price_day=Decimal("25.00"),
+            price_week=Decimal("150.00"),
+            currency="EUR",
+            status="active",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(n)
+    ]
+
+
+# ORM rows -> per-row model_validate -> response_model validation -> jsonable_encoder -> json.dumps
+# mirrors what list_machine_metrics + FastAPI's serialize_response do today
+@benchmark("metrics_list_pydantic", "per-row MetricSampleListItem + response_model + JSONResponse")
+def _metrics_list_pydantic(n: int) -> Callable[[], Any]:
+    rows = make_metric_rows(n)
+    adapter = TypeAdapter(list[MetricSampleListItem])
+
+    def run():
+        items = [MetricSampleListItem.model_validate(s) for s in rows]
+        validated = adapter.validate_python(items, from_attributes=True)
+        return json.dumps(jsonable_encoder(validated)).encode()
+    return run
+
+
+@benchmark("listings_list_pydantic", "ListingRead response_model + JSONResponse")
+def _listings_list_pydantic(n: int) -> Callable[[], Any]:
+    rows = make_listing_rows(n)
+    adapter = TypeAdapter(list[ListingRead])
+
+    def run():
+        validated = adapter.validate_python(rows, from_attributes=True)
+        return json.dumps(jsonable_encoder(validated)).encode()
+    return run
+
+
+# plain row tuples -> dicts -> orjson (the FastJSONResponse path used by the list routes)
+@benchmark("metrics_list_fast", "row tuples + FastJSONResponse")
+def _metrics_list_fast(n: int) -> Callable[[], Any]:
+    columns = schema_columns(MetricSampleListItem)
+    rows = [tuple(getattr(r, c) for c in columns) for r in make_metric_rows(n)]
+
+    def run():
+        return rows_response(columns, rows).body
+    return run
+
+
+@benchmark("listings_list_fast", "row tuples + FastJSONResponse")
+def _listings_list_fast(n: int) -> Callable[[], Any]:
+    columns = schema_columns(ListingRead)
+    rows = [tuple(getattr(r, c) for c in columns) for r in make_listing_rows(n)]
+
+    def run():
+        return rows_response(columns, rows).body
+    return run
+
+
+def _metric_tuples(n: int) -> tuple[tuple[str, ...], list[tuple]]:
+    columns = schema_columns(MetricSampleListItem)
+    return columns, [tuple(getattr(r, c) for c in columns) for r in make_metric_rows(n)]
+
+
+@benchmark("metrics_series_columnar", "columnar encoding, JSON arrays")
+def _metrics_series_columnar(n: int) -> Callable[[], Any]:
+    columns, rows = _metric_tuples(n)
+    return lambda: orjson.dumps(encode_columnar(uuid.UUID(int=1), columns, rows))
+
+
+@benchmark("metrics_series_columnar_f32", "columnar encoding, base64 float32 fields")
+def _metrics_series_columnar_f32(n: int) -> Callable[[], Any]:
+    columns, rows = _metric_tuples(n)
+    return lambda: orjson.dumps(encode_columnar(uuid.UUID(int=1), columns, rows, packing="float32"))
+
+
+# client side: parse the rows payload into timestamps + per-field lists
+@benchmark("client_parse_rows", "client parse of the row-object payload")
+def _client_parse_rows(n: int) -> Callable[[], Any]:
+    columns, rows = _metric_tuples(n)
+    payload = rows_response(columns, rows).body
+
+    def run():
+        records = json.loads(payload)
+        ts = [datetime.fromisoformat(r["recorded_at"]) for r in records]
+        fields = {f: [r[f] for r in records] for f in columns[1:]}
+        return ts, fields
+    return run
+
+
+@benchmark("client_parse_columnar_f32", "client parse of the columnar float32 payload")
+def _client_parse_columnar_f32(n: int) -> Callable[[], Any]:
+    columns, rows = _metric_tuples(n)
+    payload = orjson.dumps(encode_columnar(uuid.UUID(int=1), columns, rows, packing="float32"))
+
+    def run():
+        data = json.loads(payload)
+        ts = list(accumulate(data["dt"], initial=data["t0"]))[1:]
+        fields = {f: _unpack_float32(v) for f, v in data["fields"].items()}
+        return ts, fields
+    return run
+
+
+def run_benchmark(setup: Callable[[int], Callable[[], Any]], rows: int, repeat: int, warmup: int) -> dict:
+    fn = setup(rows)
+    out = None
+    for _ in range(max(warmup, 1)):
+        out = fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    mean = sum(timings) / len(timings)
+    return {
+        "rows": rows,
+        "repeat": repeat,
+        "payload_bytes": len(out) if isinstance(out, (bytes, bytearray)) else None,
+        "mean_ms": round(mean, 3),
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "p99_ms": percentile(timings, 99),
+        "throughput_rps": round(1000 / mean, 2) if mean else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--benchmark", action="append", choices=sorted(BENCHMARKS))
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    scenarios = {}
+    for name in args.benchmark or list(BENCHMARKS):
+        setup, description = BENCHMARKS[name]
+        scenarios[name] = run_benchmark(setup, args.rows, args.repeat, args.warmup)
+        s = scenarios[name]
+        print(f"{name:<32} p50={s['p50_ms']}ms p95={s['p95_ms']}ms  ({description})", file=sys.stderr)
+
+    report = {
+        "kind": "microbench",
+        "commit": _git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "scenarios": scenarios,
+    }
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
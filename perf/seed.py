@@ -0,0 +1,359 @@
+"""
+Seeds a local PostgreSQL database with realistic marketplace volumes.
+
+All inserts are set-based (generate_series) so millions of metric samples load in
+seconds rather than hours. Seeded machines are tagged with
+health_indicators.perf_seed = true, which is what --reset uses to clean up.
+
+    python -m perf.seed --scale medium --create-schema
+    python -m perf.seed --reset
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.config import settings
+
+DEFAULT_MANIFEST = Path(__file__).parent / "seed-manifest.json"
+
+SCALES: dict[str, dict[str, int]] = {
+    "small": {"providers": 20, "buyers": 200, "machines": 200, "samples_per_machine": 1_000, "bookings": 5_000},
+    "medium": {"providers": 100, "buyers": 2_000, "machines": 2_000, "samples_per_machine": 1_000, "bookings": 50_000},
+    "large": {"providers": 500, "buyers": 10_000, "machines": 10_000, "samples_per_machine": 1_000, "bookings": 500_000},
+}
+
+# machines owned by the dev user, so ingest/latest can run with DEV_BEARER_TOKEN
+DEV_MACHINES = 200
+
+# machines per INSERT when generating metric samples (keeps transactions bounded)
+SAMPLE_BATCH_MACHINES = 100
+
+_SEED_TAG = '{"perf_seed": true}'
+
+
+def _create_schema(engine: Engine) -> None:
+    # import every model so Base.metadata knows all tables (metric_samples is not in the SQL schema)
+    from app.database import Base
+    import app.users.models  # noqa: F401
+    import app.machines.models  # noqa: F401
+    import app.listings.models  # noqa: F401
+    import app.bookings.models  # noqa: F401
+    import app.invoices.models  # noqa: F401
+    import app.payments.models  # noqa: F401
+    import app.benchmarks.models  # noqa: F401
+    import app.metrics.models  # noqa: F401
+    import app.payouts.models  # noqa: F401
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pgcrypto"))
+    Base.metadata.create_all(engine, checkfirst=True)
+
+
+def reset(conn: Connection) -> None:
+    seeded = f"SELECT hardware_id FROM machines WHERE health_indicators @> '{_SEED_TAG}'"
+    conn.execute(text(f"DELETE FROM payments WHERE hardware_id IN ({seeded})"))
+    conn.execute(text(
+        f"DELETE FROM invoices WHERE booking_id IN "
+        f"(SELECT booking_id FROM bookings WHERE hardware_id IN ({seeded}))"
+    ))
+    conn.execute(text(f"DELETE FROM bookings WHERE hardware_id IN ({seeded})"))
+    conn.execute(text(f"DELETE FROM listings WHERE hardware_id IN ({seeded})"))
+    conn.execute(text(f"DELETE FROM metric_samples WHERE hardware_id IN ({seeded})"))
+    conn.execute(text(f"DELETE FROM benchmarks WHERE hardware_id IN ({seeded})"))
+    conn.execute(text(f"DELETE FROM machines WHERE health_indicators @> '{_SEED_TAG}'"))
+    conn.execute(text("DELETE FROM users WHERE email LIKE 'perf-%@perf.local'"))
+
+
+def seed_users(conn: Connection, providers: int, buyers: int) -> None:
+    conn.execute(
+        text(
+            "INSERT INTO users (email, organization_name, is_billing_account) "
+            "SELECT 'perf-provider-' || g || '@perf.local', 'Perf Provider ' || g, TRUE "
+            "FROM generate_series(1, :n) g ON CONFLICT (email) DO NOTHING"
+        ),
+        {"n": providers},
+    )
+    conn.execute(
+        text(
+            "INSERT INTO users (email) "
+            "SELECT 'perf-buyer-' || g || '@perf.local' "
+            "FROM generate_series(1, :n) g ON CONFLICT (email) DO NOTHING"
+        ),
+        {"n": buyers},
+    )
+    conn.execute(
+        text("INSERT INTO users (email) VALUES (:email) ON CONFLICT (email) DO NOTHING"),
+        {"email": settings.DEV_USER_EMAIL},
+    )
+
+
+def seed_machines(conn: Connection, machines: int) -> None:
+    conn.execute(
+        text(
+            """
+            WITH p AS (
+                SELECT array_agg(customer_id ORDER BY email) AS ids
+                FROM users WHERE email LIKE 'perf-provider-%@perf.local'
+            ),
+            dev AS (SELECT customer_id FROM users WHERE email = :dev_email)
+            INSERT INTO machines (
+                customer_id, gpu_model, cpu_model, ram_gb, disk_type, disk_size_gb,
+                network_bandwidth, os, provider_agent_status, health_indicators
+            )
+            SELECT
+                CASE WHEN g <= :dev_machines THEN dev.customer_id
+                     ELSE p.ids[1 + (g % array_length(p.ids, 1))] END,
+                (ARRAY['RTX 4090', 'RTX 3090', 'A100 80GB', 'H100 SXM', 'L40S'])[1 + (g % 5)],
+                (ARRAY['EPYC 7763', 'Xeon 8380', 'Ryzen 9 7950X', 'Threadripper 7980X'])[1 + (g % 4)],
+                (ARRAY[32, 64, 128, 256, 512])[1 + (g % 5)],
+                (ARRAY['nvme', 'ssd', 'hdd'])[1 + (g % 3)],
+                (ARRAY[512, 1024, 2048, 4096])[1 + (g % 4)],
+                (ARRAY['1 Gbps', '10 Gbps', '25 Gbps'])[1 + (g % 3)],
+                'Ubuntu 22.04',
+                CASE WHEN random() < 0.8 THEN 'online' ELSE 'offline' END,
+                jsonb_build_object(
+                    'perf_seed', true,
+                    'gpu_temp_c', 40 + (random() * 45)::int,
+                    'ecc_errors', CASE WHEN random() < 0.05 THEN (random() * 10)::int ELSE 0 END
+                )
+            FROM generate_series(1, :n) g CROSS JOIN p CROSS JOIN dev
+            """
+        ),
+        {"n": machines, "dev_machines": min(DEV_MACHINES, machines), "dev_email": settings.DEV_USER_EMAIL},
+    )
+
+
+def seed_listings(conn: Connection) -> None:
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO listings (hardware_id, price_hour, price_day, price_week, currency, status, updated_at)
+            SELECT
+                m.hardware_id,
+                round((0.5 + random() * 4.5)::numeric, 2),
+                round((10 + random() * 90)::numeric, 2),
+                round((60 + random() * 540)::numeric, 2),
+                'EUR',
+                CASE WHEN random() < 0.9 THEN 'active' ELSE 'paused' END,
+                now() - random() * interval '90 days'
+            FROM machines m
+            WHERE m.health_indicators @> '{_SEED_TAG}'
+            """
+        )
+    )
+
+
+def seed_metric_samples(engine: Engine, samples_per_machine: int, end: datetime) -> None:
+    with engine.connect() as conn:
+        total = conn.execute(
+            text(f"SELECT count(*) FROM machines WHERE health_indicators @> '{_SEED_TAG}'")
+        ).scalar_one()
+
+    # one transaction per machine batch: bounded WAL/lock footprint; an interrupted run
+    # keeps the committed batches and is not resumed, run --reset before seeding again
+    for offset in range(0, total, SAMPLE_BATCH_MACHINES):
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    f"""
+                    INSERT INTO metric_samples (
+                        id, hardware_id, recorded_at, gpu_util, cpu_util, mem_used_gb, net_rx_mb, net_tx_mb
+                    )
+                    SELECT
+                        gen_random_uuid(),
+                        m.hardware_id,
+                        :end - s * interval '1 minute',
+                        random() * 100,
+                        random() * 100,
+                        random() * m.ram_gb,
+                        random() * 500,
+                        random() * 500
+                    FROM (
+                        SELECT hardware_id, ram_gb FROM machines
+                        WHERE health_indicators @> '{_SEED_TAG}'
+                        ORDER BY hardware_id OFFSET :offset LIMIT :limit
+                    ) m
+                    CROSS JOIN generate_series(1, :samples) s
+                    """
+                ),
+                {"end": end, "offset": offset, "limit": SAMPLE_BATCH_MACHINES, "samples": samples_per_machine},
+            )
+
+
+def seed_bookings(conn: Connection, bookings: int) -> None:
+    conn.execute(
+        text(
+            f"""
+            WITH l AS (
+                SELECT array_agg(l.listing_id ORDER BY l.listing_id) AS lids,
+                       array_agg(l.hardware_id ORDER BY l.listing_id) AS hids
+                FROM listings l JOIN machines m ON m.hardware_id = l.hardware_id
+                WHERE m.health_indicators @> '{_SEED_TAG}'
+            ),
+            b AS (
+                SELECT array_agg(customer_id ORDER BY email) AS ids
+                FROM users WHERE email LIKE 'perf-buyer-%@perf.local'
+            ),
+            g AS (
+                SELECT g,
+                       now() - interval '60 days' + random() * interval '90 days' AS start_ts,
+                       (1 + random() * 71) * interval '1 hour' AS duration
+                FROM generate_series(1, :n) g
+            )
+            INSERT INTO bookings (listing_id, hardware_id, buyer_id, start_timestamp, end_timestamp, booking_status)
+            SELECT
+                l.lids[1 + (g.g % array_length(l.lids, 1))],
+                l.hids[1 + (g.g % array_length(l.hids, 1))],
+                b.ids[1 + (g.g % array_length(b.ids, 1))],
+                g.start_ts,
+                g.start_ts + g.duration,
+                CASE
+                    WHEN g.start_ts + g.duration < now() THEN 'completed'
+                    WHEN g.start_ts < now() THEN 'active'
+                    ELSE 'pending'
+                END
+            FROM g CROSS JOIN l CROSS JOIN b
+            """
+        ),
+        {"n": bookings},
+    )
+
+    # one invoice and one payment per seeded booking, priced from the listing's hourly rate
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO invoices (
+                booking_id, payer_id, provider_id, amount_total, currency, status, issued_at, paid_at, invoice_number
+            )
+            SELECT
+                bk.booking_id, bk.buyer_id, m.customer_id,
+                round((extract(epoch FROM bk.end_timestamp - bk.start_timestamp) / 3600 * l.price_hour)::numeric, 2),
+                l.currency,
+                CASE WHEN bk.booking_status = 'pending' THEN 'issued' ELSE 'paid' END,
+                bk.created_at,
+                CASE WHEN bk.booking_status = 'pending' THEN NULL ELSE bk.start_timestamp END,
+                'PERF-' || bk.booking_id
+            FROM bookings bk
+            JOIN listings l ON l.listing_id = bk.listing_id
+            JOIN machines m ON m.hardware_id = bk.hardware_id
+            WHERE m.health_indicators @> '{_SEED_TAG}'
+              AND NOT EXISTS (SELECT 1 FROM invoices i WHERE i.booking_id = bk.booking_id)
+            """
+        )
+    )
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO payments (
+                booking_id, hardware_id, payer_id, provider_id, amount_total, currency,
+                payment_status, timestamp, invoice_number
+            )
+            SELECT
+                i.booking_id, bk.hardware_id, i.payer_id, i.provider_id, i.amount_total, i.currency,
+                CASE WHEN i.status = 'paid' THEN 'paid' ELSE 'incomplete' END,
+                coalesce(i.paid_at, i.issued_at),
+                i.invoice_number
+            FROM invoices i
+            JOIN bookings bk ON bk.booking_id = i.booking_id
+            JOIN machines m ON m.hardware_id = bk.hardware_id
+            WHERE m.health_indicators @> '{_SEED_TAG}'
+              AND NOT EXISTS (SELECT 1 FROM payments p WHERE p.booking_id = i.booking_id)
+            """
+        )
+    )
+
+
+# Ids the load driver needs; written next to this module by default
+def build_manifest(conn: Connection) -> dict:
+    dev_id = conn.execute(
+        text("SELECT customer_id FROM users WHERE email = :email"),
+        {"email": settings.DEV_USER_EMAIL},
+    ).scalar_one()
+    dev_machines = conn.execute(
+        text(
+            f"SELECT hardware_id FROM machines "
+            f"WHERE customer_id = :dev AND health_indicators @> '{_SEED_TAG}' "
+            f"ORDER BY hardware_id LIMIT 500"
+        ),
+        {"dev": dev_id},
+    ).scalars().all()
+    listings = conn.execute(
+        text(
+            f"SELECT l.listing_id, l.hardware_id FROM listings l "
+            f"JOIN machines m ON m.hardware_id = l.hardware_id "
+            f"WHERE m.health_indicators @> '{_SEED_TAG}' AND l.status = 'active' "
+            f"ORDER BY l.listing_id LIMIT 1000"
+        )
+    ).all()
+    return {
+        "dev_customer_id": str(dev_id),
+        "dev_machine_ids": [str(m) for m in dev_machines],
+        "listings": [{"listing_id": str(lid), "hardware_id": str(hid)} for lid, hid in listings],
+    }
+
+
+def _timed(label: str, fn, *args) -> None:
+    started = time.perf_counter()
+    fn(*args)
+    print(f"{label:<16} {time.perf_counter() - started:8.2f}s")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--providers", type=int)
+    parser.add_argument("--buyers", type=int)
+    parser.add_argument("--machines", type=int)
+    parser.add_argument("--samples-per-machine", type=int)
+    parser.add_argument("--bookings", type=int)
+    parser.add_argument("--seed", type=float, default=0.42, help="PostgreSQL setseed() value in [-1, 1]")
+    parser.add_argument("--create-schema", action="store_true", help="create missing tables from the ORM models")
+    parser.add_argument("--reset", action="store_true", help="delete previously seeded data and exit")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    args = parser.parse_args(argv)
+
+    volumes = dict(SCALES[args.scale])
+    for key in volumes:
+        override = getattr(args, key)
+        if override is not None:
+            volumes[key] = override
+
+    engine = create_engine(args.database_url)
+    if args.create_schema:
+        _create_schema(engine)
+
+    if args.reset:
+        with engine.begin() as conn:
+            _timed("reset", reset, conn)
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("SELECT setseed(:s)"), {"s": args.seed})
+        _timed("users", seed_users, conn, volumes["providers"], volumes["buyers"])
+        _timed("machines", seed_machines, conn, volumes["machines"])
+        _timed("listings", seed_listings, conn)
+
+    _timed("metric_samples", seed_metric_samples, engine, volumes["samples_per_machine"], datetime.now(timezone.utc))
+
+    with engine.begin() as conn:
+        conn.execute(text("SELECT setseed(:s)"), {"s": args.seed})
+        _timed("bookings", seed_bookings, conn, volumes["bookings"])
+        conn.execute(text("ANALYZE"))
+        manifest = build_manifest(conn)
+
+    manifest["volumes"] = volumes
+    args.manifest.write_text(json.dumps(manifest, indent=2))
+    print(f"manifest written to {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
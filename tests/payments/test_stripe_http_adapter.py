@@ -0,0 +1,134 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.payments.ports.async_payment_port import PaymentProcessorUnavailable
+from app.payments.ports.circuit_breaker import CircuitBreaker
+from app.payments.ports.stripe_http_adapter import AsyncStripeAdapter
+from app.payments.service import PaymentsService
+from perf import fake_processor
+
+
+@pytest.fixture(autouse=True)
+def fresh_processor():
+    for store in (fake_processor._sessions, fake_processor._intents, fake_processor._refunds, fake_processor._idempotency):
+        store.clear()
+    fake_processor._config.update(failure_rate=0.0, latency_ms=0.0)
+    fake_processor._stats.update(requests=0, injected_failures=0, idempotent_replays=0)
+    yield
+
+
+def make_adapter(breaker=None, max_retries=2):
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_processor.app))
+    return AsyncStripeAdapter(
+        api_key="sk_test_fake",
+        client=client,
+        breaker=breaker or CircuitBreaker(failure_threshold=5, reset_timeout=30.0),
+        base_url="http://fake-processor",
+        max_retries=max_retries,
+        backoff_base=0.0,
+    )
+
+
+def checkout(adapter, booking_id="b1", idempotency_key=None):
+    return adapter.create_checkout_session(
+        booking_id=booking_id,
+        user_id="u1",
+        amount=Decimal("12.50"),
+        currency="EUR",
+        success_url="http://localhost/success",
+        cancel_url="http://localhost/cancel",
+        idempotency_key=idempotency_key,
+    )
+
+
+# the first call fails with an injected 503, the second one gets through
+def fail_once(monkeypatch):
+    draws = iter([0.0, 0.99])
+    monkeypatch.setattr(fake_processor, "random", SimpleNamespace(random=lambda: next(draws)))
+    fake_processor._config["failure_rate"] = 0.5
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_failures(monkeypatch):
+    fail_once(monkeypatch)
+    adapter = make_adapter()
+
+    session = await checkout(adapter, idempotency_key="checkout-b1-0")
+
+    assert session["session_id"] in fake_processor._sessions
+    assert fake_processor._stats["requests"] == 2
+    assert fake_processor._stats["injected_failures"] == 1
+    assert adapter.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_fails_fast():
+    fake_processor._config["failure_rate"] = 1.0
+    adapter = make_adapter(CircuitBreaker(failure_threshold=2, reset_timeout=30.0), max_retries=1)
+
+    for _ in range(2):
+        with pytest.raises(PaymentProcessorUnavailable):
+            await checkout(adapter)
+    assert adapter.breaker.state == CircuitBreaker.OPEN
+    requests = fake_processor._stats["requests"]
+
+    with pytest.raises(PaymentProcessorUnavailable, match="circuit open"):
+        await checkout(adapter)
+    assert fake_processor._stats["requests"] == requests
+
+
+@pytest.mark.asyncio
+async def test_same_idempotency_key_replays_the_session():
+    adapter = make_adapter()
+
+    first = await checkout(adapter, idempotency_key="checkout-b1-0")
+    replay = await checkout(adapter, idempotency_key="checkout-b1-0")
+    other = await checkout(adapter, idempotency_key="checkout-b1-1")
+
+    assert replay["session_id"] == first["session_id"]
+    assert other["session_id"] != first["session_id"]
+    assert fake_processor._stats["idempotent_replays"] == 1
+
+
+class _Repo:
+    def __init__(self):
+        self.payments = []
+
+    def count_for_booking(self, db, booking_id):
+        return sum(1 for p in self.payments if p["booking_id"] == booking_id)
+
+    def create_for_processor_ref(self, db, values):
+        if not any(p["processor_ref"] == values["processor_ref"] for p in self.payments):
+            self.payments.append(values)
+        return values
+
+
+@pytest.mark.asyncio
+async def test_new_checkout_attempt_gets_a_new_session():
+    repo = _Repo()
+    invoices = SimpleNamespace(get_for_booking=lambda booking_id: None)
+    service = PaymentsService(db=None, repo=repo, port=None, invoices_service=invoices, async_port=make_adapter())
+    booking_id = uuid4()
+
+    async def attempt():
+        return await service.create_checkout_session_async(
+            booking_id=booking_id,
+            hardware_id=uuid4(),
+            payer_id=uuid4(),
+            provider_id=None,
+            amount=Decimal("12.50"),
+            currency="EUR",
+            success_url="http://localhost/success",
+            cancel_url="http://localhost/cancel",
+        )
+
+    first = await attempt()
+    # the buyer comes back after the first session expired
+    second = await attempt()
+
+    assert second["session_id"] != first["session_id"]
+    assert [p["processor_ref"] for p in repo.payments] == [first["session_id"], second["session_id"]]